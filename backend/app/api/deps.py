@@ -15,6 +15,9 @@ from app.schemas.token import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/oauth")
 
+# Response header of list endpoints carrying the cursor of the next page.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 # Define a mock user for local development
 mock_dev_user = User(
     id="dev_user_id",  # Or generate a UUID: str(uuid.uuid4())
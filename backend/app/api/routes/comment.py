@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from odmantic import AIOEngine
 
 from app.api import deps
+from app.api.deps import NEXT_CURSOR_HEADER
 from app.crud import crud_comment, crud_question
+from app.crud.pagination import InvalidCursorError
 from app.models.comment import Comment
 from app.models.question import Question
 from app.models.user import User
@@ -37,6 +39,36 @@ async def create_comment(
     return CommentResponse.from_model(new_comment)
 
 
+@router.get("/", response_model=list[CommentResponse])
+async def get_comments(
+    question_id: str,
+    response: Response,
+    limit: int = 100,
+    cursor: str | None = None,
+    engine: AIOEngine = Depends(deps.engine_generator),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    Retrieve the non-deleted comments of a question, oldest first. Pass the
+    `X-Next-Cursor` header of a page as `cursor` to get the next one.
+    """
+    try:
+        comments, next_cursor = await crud_comment.get_page(
+            engine,
+            Comment.question_id == question_id,
+            Comment.is_deleted == False,  # noqa: E712
+            sort_field="created_at",
+            descending=False,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [CommentResponse.from_model(comment) for comment in comments]
+
+
 @router.put("/update", response_model=CommentResponse)
 async def update_comment(
     request_params: CommentUpdateRequest,
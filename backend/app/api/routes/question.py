@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from odmantic import AIOEngine
 
 from app.api import deps
+from app.api.deps import NEXT_CURSOR_HEADER
 from app.crud import (
     crud_question,  # Assuming you'll create/have crud_question similar to crud_comment
 )
+from app.crud.pagination import InvalidCursorError
 from app.models.question import Question
 from app.models.user import User
 from app.schemas.question import (  # QuestionDelete # We'll use ID from path for delete
@@ -36,21 +38,30 @@ async def create_question(
 
 @router.get("/", response_model=list[QuestionResponse])
 async def get_all_questions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     engine: AIOEngine = Depends(deps.engine_generator),
     current_user: User = Depends(deps.get_current_user),
 ):
     """
-    Retrieve all non-deleted questions with pagination.
+    Retrieve all non-deleted questions, newest first. Pass the `X-Next-Cursor`
+    header of a page as `cursor` to get the next one; `skip` is ignored then.
     """
-    questions = await crud_question.get_many(
-        engine,
-        Question.is_deleted == False,
-        skip=skip,
-        limit=limit,
-        sort=Question.created_at.desc(),
-    )
+    try:
+        questions, next_cursor = await crud_question.get_page(
+            engine,
+            Question.is_deleted == False,
+            sort_field="created_at",
+            limit=limit,
+            cursor=cursor,
+            skip=0 if cursor else skip,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [QuestionResponse.from_model(question) for question in questions]
 
 
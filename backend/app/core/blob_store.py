@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from app.core.config import settings
+from app.models.announcement import Announcement
+from app.utils.hashing import sha256_file
+
+
+class BlobStore:
+    """
+    Content-addressed file store keyed by SHA-256.
+
+    Blobs are sharded into two directory levels (`ab/cd/abcd....pdf`) and
+    written through a temporary file in the target directory followed by an
+    atomic rename, so readers never observe a partially written blob and
+    identical content is stored exactly once.
+    """
+
+    def __init__(self, root: Path, suffix: str = ""):
+        self.root = root
+        self.suffix = suffix
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{self.suffix}"
+
+    def exists(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def put_file(self, src: Path, move: bool = False) -> str:
+        """
+        Adds a file to the store and returns its digest.
+
+        Args:
+            src: The file to add.
+            move: If True, `src` is removed once its content is stored.
+        """
+        digest = sha256_file(src)
+        target = self.path_for(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp, open(src, "rb") as f:
+                    shutil.copyfileobj(f, tmp)
+                    tmp.flush()
+                    os.fsync(tmp.fileno())
+                os.replace(tmp_name, target)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        if move:
+            src.unlink(missing_ok=True)
+        return digest
+
+    def digest_for_path(self, path: Path) -> str:
+        """
+        Returns the digest of a file, taking it from the path for blobs in this
+        store instead of re-hashing the content.
+        """
+        digest = path.name.removesuffix(self.suffix)
+        if len(digest) == 64 and self.path_for(digest) == path:
+            return digest
+        return sha256_file(path)
+
+    def verify(self, digest: str) -> bool:
+        """Checks that the stored blob still matches its digest."""
+        path = self.path_for(digest)
+        return path.exists() and sha256_file(path) == digest
+
+
+pdf_blob_store = BlobStore(settings.MYHOME_BLOB_DIR, suffix=".pdf")
+
+
+def get_announcement_pdf_path(announcement: Announcement) -> Path:
+    """
+    Returns the local path of an announcement's PDF, preferring the
+    content-addressed store over the legacy `MYHOME_DATA_DIR/<filename>` layout.
+    """
+    if announcement.pdf_hash:
+        return pdf_blob_store.path_for(announcement.pdf_hash)
+    return settings.MYHOME_DATA_DIR / announcement.filename
@@ -0,0 +1,79 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from app.core.config import settings
+
+
+class BrowserPool:
+    """
+    Keeps one long-lived headless Chromium instance and hands out pages from a
+    bounded pool of browser contexts.
+
+    Usage:
+        async with BrowserPool(size=4) as pool:
+            async with pool.page() as page:
+                await page.goto(url)
+    """
+
+    def __init__(self, size: int | None = None, headless: bool = True):
+        self.size = size or settings.MYHOME_BROWSER_POOL_SIZE
+        self.headless = headless
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._contexts: asyncio.Queue[BrowserContext] | None = None
+
+    async def start(self) -> "BrowserPool":
+        if self._browser is not None:
+            return self
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._contexts = asyncio.Queue(maxsize=self.size)
+        for _ in range(self.size):
+            context = await self._browser.new_context(
+                accept_downloads=True, viewport={"width": 1920, "height": 1080}
+            )
+            self._contexts.put_nowait(context)
+        return self
+
+    async def close(self) -> None:
+        if self._contexts is not None:
+            while not self._contexts.empty():
+                context = self._contexts.get_nowait()
+                await context.close()
+            self._contexts = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrows a context from the pool and yields a fresh page in it."""
+        if self._contexts is None:
+            raise RuntimeError("BrowserPool is not started.")
+
+        context = await self._contexts.get()
+        page = await context.new_page()
+        try:
+            yield page
+        finally:
+            await page.close()
+            self._contexts.put_nowait(context)
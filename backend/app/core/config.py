@@ -60,6 +60,7 @@ class Settings(BaseSettings):
     # Celery Configuration
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND_URL: str = "redis://localhost:6379/0"
+    REDIS_URL: str = "redis://localhost:6379/0"
 
     # Define the static schedule here
     BEAT_SCHEDULE: dict = {
@@ -70,11 +71,120 @@ class Settings(BaseSettings):
         # },
     }
 
+    # Shared async HTTP client
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_PER_HOST_CONCURRENCY: int = 8
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_RETRY_BACKOFF: float = 0.5
+    HTTP_TIMEOUT: float = 30.0
+
     MYHOME_BASE_URL: str = "http://apis.data.go.kr/1613000/HWSPR02"
     MYHOME_ENDPOINT: str = "/rsdtRcritNtcList"
     MYHOME_DATA_DIR: Path = DATA_DIR / "myhome"
+    MYHOME_BLOB_DIR: Path = DATA_DIR / "blobs" / "pdf"
+    MYHOME_BRTC_CODES: list[str] = ["41"]  # 41: 경기도
+    MYHOME_NUM_OF_ROWS: int = 200
+    MYHOME_DOWNLOAD_CONCURRENCY: int = 4
+    MYHOME_BROWSER_POOL_SIZE: int = 4
+    # Incremental sync re-lists announcements this many days older than the
+    # region watermark to catch status changes (접수중 -> 마감).
+    MYHOME_SYNC_LOOKBACK_DAYS: int = 60
 
     OPENAI_MAX_RETRIES: int = 3
 
+    # Extraction fan-out: concurrent calls per provider. Request rates are
+    # limited by LLM_RATE_LIMITS.
+    EXTRACTION_PROVIDER_CONCURRENCY: dict[str, int] = {"gemini": 4, "openai": 4}
+    EXTRACTION_DEFAULT_CONCURRENCY: int = 2
+
+    # Distributed LLM rate limits, keyed by provider or "provider/model" (the
+    # latter takes precedence). rpm: requests/minute, tpm: tokens/minute.
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_RATE_LIMITS: dict[str, dict[str, int]] = {
+        "gemini": {"rpm": 150, "tpm": 2_000_000},
+        "openai": {"rpm": 500, "tpm": 800_000},
+    }
+    # Tokens reserved before a call; corrected with the reported usage after it.
+    LLM_RATE_LIMIT_ESTIMATED_TOKENS: int = 30_000
+    LLM_RATE_LIMIT_MAX_WAIT: float = 600.0
+
+    # Page rasterization for image-based providers
+    PDF_RENDER_DPI: int = 150
+    PDF_RENDER_FORMAT: Literal["jpeg", "webp", "png"] = "jpeg"
+    PDF_RENDER_QUALITY: int = 85
+    PDF_RENDER_WORKERS: int = 4
+    PDF_RENDER_CACHE_DIR: Path = DATA_DIR / "page_cache"
+
+    # Layout analysis (DocLayout-YOLO on CPU). The model is loaded once per
+    # worker process (at startup with LAYOUT_PRELOAD) and run over
+    # LAYOUT_BATCH_SIZE pages at a time; blocks are cached per PDF and page.
+    LAYOUT_BATCH_SIZE: int = 8
+    LAYOUT_THREADS: int = 4
+    LAYOUT_IMAGE_SIZE: int = 1024
+    LAYOUT_CONFIDENCE: float = 0.2
+    LAYOUT_RENDER_DPI: int = 144
+    LAYOUT_PRELOAD: bool = False
+    LAYOUT_CACHE_DIR: Path = DATA_DIR / "layout_cache"
+
+    # Relevance-based page pruning before LLM extraction
+    PAGE_PRUNING_ENABLED: bool = False
+    PAGE_PRUNING_KEEP_RATIO: float = 0.5
+    PAGE_PRUNING_MIN_PAGES: int = 6
+
+    # Chunked (map-reduce) extraction: documents with more pages than
+    # CHUNKED_EXTRACTION_MIN_PAGES are extracted in concurrent page windows.
+    CHUNKED_EXTRACTION_MIN_PAGES: int | None = 30
+    CHUNKED_EXTRACTION_WINDOW_PAGES: int = 8
+    CHUNKED_EXTRACTION_OVERLAP_PAGES: int = 1
+
+    # Constrain extraction output to its JSON schema with the provider's native
+    # structured output mode instead of relying on the prompt alone.
+    LLM_STRUCTURED_OUTPUT_ENABLED: bool = True
+
+    # Repair of malformed LLM output, made with the provider that produced it.
+    # Providers without an entry in LLM_REPAIR_MODELS use the extraction model.
+    LLM_REPAIR_MODELS: dict[str, str] = {
+        "gemini": "gemini-2.5-flash",
+        "openai": "gpt-4.1-mini",
+    }
+    LLM_REPAIR_MAX_ATTEMPTS: int = 2
+    # Characters sent on each side of a JSON syntax error
+    LLM_REPAIR_CONTEXT_CHARS: int = 300
+    # Token budget for all repairs of one analysis result
+    LLM_REPAIR_MAX_TOKENS: int = 20_000
+
+    # Reuse Gemini File API uploads of the same PDF across requests. Handles
+    # are dropped this many seconds before the file expires on the server.
+    GEMINI_FILE_API_ENABLED: bool = True
+    GEMINI_FILE_API_TTL_MARGIN: float = 3600.0
+    # Explicit Gemini context caches for the static system prompts
+    GEMINI_PROMPT_CACHE_ENABLED: bool = True
+    GEMINI_PROMPT_CACHE_TTL: float = 3600.0
+
+    # Batch API backfills: limits of one submitted batch input file
+    LLM_BATCH_MAX_REQUESTS: int = 50_000
+    LLM_BATCH_MAX_BYTES: int = 190_000_000
+
+    # Original categories/conditions of the announcement detail, pre-serialized
+    # in Redis and a per-process LRU. Local entries live ANNOUNCEMENT_CACHE_LOCAL_TTL
+    # seconds, bounding staleness in other processes after a new extraction.
+    ANNOUNCEMENT_CACHE_ENABLED: bool = True
+    ANNOUNCEMENT_CACHE_TTL: int = 24 * 3600
+    ANNOUNCEMENT_CACHE_LOCAL_SIZE: int = 1024
+    ANNOUNCEMENT_CACHE_LOCAL_TTL: float = 30.0
+
+    # Announcement views are counted in Redis and added to view_count in MongoDB
+    # by the API process every VIEW_COUNT_FLUSH_INTERVAL seconds. Views taken by
+    # a flush that has not finished within VIEW_COUNT_FLUSH_LEASE seconds (e.g.
+    # the process died) are applied by the next flush.
+    VIEW_COUNT_FLUSH_INTERVAL: float = 30.0
+    VIEW_COUNT_FLUSH_LEASE: int = 300
+
+    # Persistent LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: Path = DATA_DIR / "llm_cache.sqlite3"
+    LLM_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
 
 settings = Settings()  # type: ignore
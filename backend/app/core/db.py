@@ -3,9 +3,35 @@ from odmantic import AIOEngine
 from pymongo.driver_info import DriverInfo
 
 from app.core.config import settings
+from app.models.announcement import Announcement
+from app.models.block import Block
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.condition import Condition
+from app.models.llm_analysis_result import LLMAnalysisResult
+from app.models.llm_batch_job import LLMBatchJob
+from app.models.question import Question
+from app.models.sync_state import SyncState
+from app.models.token import Token
+from app.models.user import User
 
 DRIVER_INFO = DriverInfo(name="happyhome")
 
+# Models whose declared indexes `init_db` creates.
+MODELS = [
+    Announcement,
+    Block,
+    Category,
+    Comment,
+    Condition,
+    LLMAnalysisResult,
+    LLMBatchJob,
+    Question,
+    SyncState,
+    Token,
+    User,
+]
+
 
 class _MongoClientSingleton:
     _instance = None
@@ -14,7 +40,7 @@ class _MongoClientSingleton:
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(_MongoClientSingleton, cls).__new__(cls)
+            cls._instance = super().__new__(cls)
             cls._instance.mongo_client = motor_asyncio.AsyncIOMotorClient(
                 settings.MONGO_DATABASE_URI, driver=DRIVER_INFO
             )
@@ -44,5 +70,22 @@ async def ping():
     await get_mongodb_client().command("ping")
 
 
-async def init_db():
-    _MongoClientSingleton()
+async def init_db(engine: AIOEngine | None = None) -> None:
+    """Creates the indexes declared on the models, replacing changed ones."""
+    engine = engine or get_mongodb_engine()
+    await engine.configure_database(MODELS, update_existing_indexes=True)
+
+
+_transaction_support: dict[int, bool] = {}
+
+
+async def supports_transactions(engine: AIOEngine) -> bool:
+    """
+    Whether the deployment supports multi-document transactions, i.e. it is a
+    replica set or sharded cluster rather than a standalone server.
+    """
+    key = id(engine.client)
+    if key not in _transaction_support:
+        hello = await engine.client.admin.command("hello")
+        _transaction_support[key] = "setName" in hello or hello.get("msg") == "isdbgrid"
+    return _transaction_support[key]
@@ -0,0 +1,135 @@
+import asyncio
+import importlib.util
+import logging
+import random
+import ssl
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _http2_available() -> bool:
+    # httpx only negotiates HTTP/2 when the optional `h2` package is installed.
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncHTTPClient:
+    """
+    Shared async HTTP client with keep-alive connection pooling, HTTP/2 where
+    available, retry with exponential backoff on 5xx/timeouts and a per-host
+    concurrency limit.
+
+    The underlying httpx.AsyncClient is bound to the running event loop and is
+    re-created when used from a new loop (e.g. a new Celery task); the previous
+    one is closed then, and `aclose` closes it at the end of a task.
+    """
+
+    def __init__(
+        self,
+        verify: bool | ssl.SSLContext = True,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        per_host_limit: int | None = None,
+        max_retries: int | None = None,
+        backoff: float | None = None,
+        timeout: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.verify = verify
+        self.transport = transport
+        self.max_connections = max_connections or settings.HTTP_MAX_CONNECTIONS
+        self.max_keepalive_connections = (
+            max_keepalive_connections or settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+        )
+        self.per_host_limit = per_host_limit or settings.HTTP_PER_HOST_CONCURRENCY
+        self.max_retries = (
+            max_retries if max_retries is not None else settings.HTTP_MAX_RETRIES
+        )
+        self.backoff = backoff if backoff is not None else settings.HTTP_RETRY_BACKOFF
+        self.timeout = timeout or settings.HTTP_TIMEOUT
+
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """Returns the client of the running loop, closing one left by another loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            stale, self._client = self._client, None
+            try:
+                await stale.aclose()
+            except Exception as e:
+                # Its connections belong to the old (possibly closed) loop.
+                logging.debug(f"Failed to close HTTP client of a previous loop: {e!r}")
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=_http2_available(),
+                verify=self.verify,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+                transport=self.transport,
+            )
+            self._loop = loop
+            self._host_semaphores = {}
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request, retrying on timeouts, transport errors and retryable
+        status codes.
+
+        Raises:
+            httpx.HTTPError: If the last attempt still fails.
+        """
+        client = await self.get_client()
+        semaphore = self._host_semaphore(url)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, **kwargs)
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response
+                logging.warning(
+                    f"{method} {url} returned {response.status_code} "
+                    f"(attempt {attempt + 1}/{self.max_retries + 1})"
+                )
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if attempt == self.max_retries:
+                    raise
+                logging.warning(
+                    f"{method} {url} failed: {e!r} "
+                    f"(attempt {attempt + 1}/{self.max_retries + 1})"
+                )
+
+            delay = self.backoff * (2**attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+        raise RuntimeError("unreachable")
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
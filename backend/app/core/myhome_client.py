@@ -5,9 +5,11 @@ from pathlib import Path
 from urllib.parse import quote_plus, urlencode
 from urllib.request import Request, urlopen
 
-from playwright.async_api import async_playwright
+from playwright.async_api import Page
 
+from app.core.browser_pool import BrowserPool
 from app.core.config import settings
+from app.core.http_client import AsyncHTTPClient
 from app.schemas.announcement import AnnouncementCreate
 
 
@@ -16,75 +18,88 @@ class MyHomeClient:
     ENDPOINT: str = settings.MYHOME_ENDPOINT
     SERVICE_KEY: str | None = os.getenv("MYHOME_API_KEY")
     DOWNLOAD_DIR: Path = settings.MYHOME_DATA_DIR
+    _http_client: AsyncHTTPClient | None = None
 
-    def __init__(self):
+    def __init__(self, base_url: str | None = None, service_key: str | None = None):
+        if base_url is not None:
+            self.BASE_URL = base_url
+        if service_key is not None:
+            self.SERVICE_KEY = service_key
         if not self.SERVICE_KEY:
             raise ValueError("API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
 
         self.context = ssl.create_default_context()
         self.context.check_hostname = False
         self.context.verify_mode = ssl.CERT_NONE
+        if MyHomeClient._http_client is None:
+            # Shared by every MyHomeClient so keep-alive connections are reused.
+            MyHomeClient._http_client = AsyncHTTPClient(verify=self.context)
 
         if not self.DOWNLOAD_DIR.exists():
             self.DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+    @classmethod
+    async def aclose(cls) -> None:
+        """Closes the shared HTTP connections, e.g. at the end of a task."""
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+
     async def download_pdf_with_playwright(
-        self, announcement: AnnouncementCreate, download_path: Path
+        self,
+        announcement: AnnouncementCreate,
+        download_path: Path,
+        browser_pool: BrowserPool | None = None,
     ) -> str | None:
         if announcement.pcUrl is None:
             return
 
-        browser = None
-        playwright = None
         try:
-            playwright = await async_playwright().start()
-            browser = await playwright.chromium.launch(headless=True)
-            context = await browser.new_context(
-                accept_downloads=True, viewport={"width": 1920, "height": 1080}
-            )
-
-            page = await context.new_page()
-            await page.goto(announcement.pcUrl, wait_until="networkidle")
-
-            # "공고문" th 태그를 찾고 그 옆의 td > a 태그 클릭
-            notice_row = page.get_by_text("공고문").first
-            if notice_row:
-                # 다운로드 대기를 위한 Promise 생성
-                async with page.expect_download() as download_info:
-                    # a 태그 클릭
-                    download_link = page.locator('td:right-of(:text("공고문")) a').first
-                    if download_link:
-                        await download_link.click()
-
-                        # 다운로드 완료 대기
-                        download = await download_info.value
-
-                        # 파일 저장 (공고 ID를 파일명에 포함)
-                        if not download_path.exists():
-                            await download.save_as(download_path)
-                            print(f"PDF download completed: {download_path}")
-                            return str(download_path)
-                        else:
-                            print(f"File already exists: {download_path}")
-                            return
-            return
-
+            if browser_pool is None:
+                # Standalone call: spin up a single-page pool for this download only.
+                async with BrowserPool(size=1) as pool:
+                    async with pool.page() as page:
+                        return await self._download_pdf_from_page(
+                            page, announcement, download_path
+                        )
+
+            async with browser_pool.page() as page:
+                return await self._download_pdf_from_page(
+                    page, announcement, download_path
+                )
         except Exception as e:
             print(f"Error occurred during PDF download: {e}")
             return
-        finally:
-            if browser:
-                await browser.close()
-            if playwright:
-                await playwright.stop()
 
-    def get_housing_list(self, page_no: int = 1, num_of_rows: int = 200) -> dict:
-        """Get a list of housing announcements."""
+    async def _download_pdf_from_page(
+        self, page: Page, announcement: AnnouncementCreate, download_path: Path
+    ) -> str | None:
+        await page.goto(announcement.pcUrl, wait_until="networkidle")
+
+        # "공고문" th 태그를 찾고 그 옆의 td > a 태그 클릭
+        notice_row = page.get_by_text("공고문").first
+        if notice_row:
+            # 다운로드 대기를 위한 Promise 생성
+            async with page.expect_download() as download_info:
+                # a 태그 클릭
+                download_link = page.locator('td:right-of(:text("공고문")) a').first
+                if download_link:
+                    await download_link.click()
+
+                    # 다운로드 완료 대기
+                    download = await download_info.value
+
+                    # 파일 저장
+                    await download.save_as(download_path)
+                    print(f"PDF download completed: {download_path}")
+                    return str(download_path)
+        return
+
+    def _housing_list_url(self, page_no: int, num_of_rows: int, brtc_code: str) -> str:
         params = {
             "serviceKey": self.SERVICE_KEY,
             "pageNo": str(page_no),
             "numOfRows": str(num_of_rows),
-            "brtcCode": "41",  # 경기도 지역 코드
+            "brtcCode": brtc_code,  # 지역 코드 (41: 경기도)
         }
 
         print("\n=== API Request Parameters ===")
@@ -99,18 +114,62 @@ class MyHomeClient:
         url = f"{self.BASE_URL}{self.ENDPOINT}?{query_string}"
 
         print(f"Request URL: {url}")
+        return url
+
+    @staticmethod
+    def _parse_housing_list(response_data: str) -> dict:
+        print(f"Response content: {response_data[:500]}")
+        result = json.loads(response_data)
+
+        # item 개수 출력
+        if "response" in result and "body" in result["response"]:
+            items = result["response"]["body"].get("item", [])
+            if not isinstance(items, list):
+                items = [items]
+            print(f"\nNumber of items received in the response: {len(items)}")
+
+        return result
+
+    def get_housing_list(
+        self, page_no: int = 1, num_of_rows: int = 200, brtc_code: str = "41"
+    ) -> dict:
+        """Get a list of housing announcements."""
+        url = self._housing_list_url(page_no, num_of_rows, brtc_code)
 
         request = Request(url)
         with urlopen(request, context=self.context) as response:
-            response_data = response.read().decode("utf-8")
-            print(f"Response content: {response_data[:500]}")
-            result = json.loads(response_data)
-
-            # item 개수 출력
-            if "response" in result and "body" in result["response"]:
-                items = result["response"]["body"].get("item", [])
-                if not isinstance(items, list):
-                    items = [items]
-                print(f"\nNumber of items received in the response: {len(items)}")
-
-            return result
+            return self._parse_housing_list(response.read().decode("utf-8"))
+
+    async def aget_housing_list(
+        self, page_no: int = 1, num_of_rows: int = 200, brtc_code: str = "41"
+    ) -> dict:
+        """Async variant of `get_housing_list` over the shared pooled HTTP client."""
+        url = self._housing_list_url(page_no, num_of_rows, brtc_code)
+
+        response = await self._http_client.get(url)
+        return self._parse_housing_list(response.content.decode("utf-8"))
+
+    @staticmethod
+    def extract_items(result: dict) -> tuple[list[dict], int]:
+        """
+        Extracts the announcement items and the total item count from a
+        housing list response.
+
+        Raises:
+            ValueError: If the API reported an error or the response is malformed.
+        """
+        if "response" not in result or "header" not in result["response"]:
+            raise ValueError("API 응답 형식이 올바르지 않습니다.")
+
+        header = result["response"]["header"]
+        if header["resultCode"] != "00":
+            raise ValueError(
+                f"API 호출 실패: {header.get('resultMsg', '알 수 없는 오류')}"
+            )
+
+        body = result["response"].get("body", {})
+        items = body.get("item", [])
+        if not isinstance(items, list):
+            items = [items]
+        total_count = int(body.get("totalCount") or len(items))
+        return items, total_count
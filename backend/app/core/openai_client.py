@@ -1,6 +1,6 @@
 import os
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from app.core.config import settings
 
@@ -8,10 +8,11 @@ from app.core.config import settings
 class OpenAIClientSingleton:
     _instance = None
     _client = None
+    _async_client = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(OpenAIClientSingleton, cls).__new__(cls)
+            cls._instance = super().__new__(cls)
             # Initialize the OpenAI client only once
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
@@ -19,6 +20,9 @@ class OpenAIClientSingleton:
             cls._client = OpenAI(
                 api_key=api_key, max_retries=settings.OPENAI_MAX_RETRIES
             )
+            cls._async_client = AsyncOpenAI(
+                api_key=api_key, max_retries=settings.OPENAI_MAX_RETRIES
+            )
         return cls._instance
 
     @property
@@ -29,12 +33,23 @@ class OpenAIClientSingleton:
             raise RuntimeError("OpenAI client not initialized.")
         return self._client
 
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            raise RuntimeError("OpenAI async client not initialized.")
+        return self._async_client
+
 
 # Function to get the singleton instance's client
 def get_openai_client() -> OpenAI:
     return OpenAIClientSingleton().client
 
 
+def get_async_openai_client() -> AsyncOpenAI:
+    return OpenAIClientSingleton().async_client
+
+
 # Optional: Keep the old variable name for compatibility if needed,
 # but ideally, refactor usage to call get_openai_client()
 openai_client = get_openai_client()
+async_openai_client = get_async_openai_client()
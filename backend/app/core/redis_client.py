@@ -0,0 +1,45 @@
+import asyncio
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+
+
+class RedisClientSingleton:
+    _instance = None
+    _client = None
+    _async_client = None
+    _async_loop = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            # Connections are opened lazily on first use.
+            cls._client = Redis.from_url(settings.REDIS_URL)
+        return cls._instance
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            raise RuntimeError("Redis client not initialized.")
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncRedis:
+        # asyncio connections are bound to the loop that opened them, so the
+        # client is re-created when used from a new loop (e.g. a new task).
+        loop = asyncio.get_running_loop()
+        cls = type(self)
+        if cls._async_client is None or cls._async_loop is not loop:
+            cls._async_client = AsyncRedis.from_url(settings.REDIS_URL)
+            cls._async_loop = loop
+        return cls._async_client
+
+
+def get_redis_client() -> Redis:
+    return RedisClientSingleton().client
+
+
+def get_async_redis_client() -> AsyncRedis:
+    return RedisClientSingleton().async_client
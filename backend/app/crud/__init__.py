@@ -1,9 +1,12 @@
 from app.crud.announcement import crud_announcement
+from app.crud.block import crud_block
 from app.crud.category import crud_category
 from app.crud.comment import crud_comment
 from app.crud.condition import crud_condition
 from app.crud.llm_analysis_result import crud_llm_analysis_result
+from app.crud.llm_batch_job import crud_llm_batch_job
 from app.crud.question import crud_question
+from app.crud.sync_state import crud_sync_state
 from app.crud.token import crud_token
 from app.crud.user import crud_user
 
@@ -13,7 +16,10 @@ __all__ = [
     "crud_category",
     "crud_condition",
     "crud_llm_analysis_result",
+    "crud_llm_batch_job",
     "crud_announcement",
     "crud_question",
     "crud_comment",
+    "crud_sync_state",
+    "crud_block",
 ]
@@ -1,8 +1,19 @@
-from datetime import datetime
+from datetime import datetime, timezone
+
+from odmantic import AIOEngine
 
 from app.crud.base import CRUDBase
+from app.enums import AnnouncementType
 from app.models.announcement import Announcement
-from app.schemas.announcement import AnnouncementCreate, AnnouncementUpdate
+from app.schemas.announcement import (
+    AnnouncementCreate,
+    AnnouncementUpdate,
+    hash_raw_data,
+)
+
+# Fields that belong to us rather than to the MyHome listing and must survive a
+# re-sync of the source data.
+_LOCAL_FIELDS = frozenset({"id", "filename", "pdf_hash", "view_count", "created_at"})
 
 
 class CRUDAnnouncement(CRUDBase[Announcement, AnnouncementCreate, AnnouncementUpdate]):
@@ -12,9 +23,11 @@ class CRUDAnnouncement(CRUDBase[Announcement, AnnouncementCreate, AnnouncementUp
                 return None
             return datetime.strptime(date_str, "%Y%m%d").date()
 
+        raw_data = obj_in.model_dump()
         return Announcement(
             id=obj_in.pblancId,
-            raw_data=obj_in.model_dump(),
+            raw_data=raw_data,
+            raw_data_hash=hash_raw_data(raw_data),
             house_serial_number=obj_in.houseSn,
             status_name=obj_in.sttusNm,
             announcement_name=obj_in.pblancNm,
@@ -37,8 +50,68 @@ class CRUDAnnouncement(CRUDBase[Announcement, AnnouncementCreate, AnnouncementUp
             begin_date=_str_to_date(obj_in.beginDe),
             end_date=_str_to_date(obj_in.endDe),
             filename=obj_in.filename,
+            pdf_hash=obj_in.pdf_hash,
             type=obj_in.type,
         )
 
+    async def get_many_by_ids(
+        self, engine: AIOEngine, *, ids: list[str]
+    ) -> list[Announcement]:
+        """Retrieves multiple announcements by their IDs with a single `$in` query."""
+        if not ids:
+            return []
+        return await engine.find(self.model, self.model.id.in_(ids))
+
+    async def get_raw_data_hashes(
+        self, engine: AIOEngine, *, ids: list[str]
+    ) -> dict[str, str]:
+        """
+        Resolves which of the given IDs are already stored, together with the
+        hash of their source data, in a single `$in` round trip.
+
+        Returns:
+            A mapping of announcement ID to raw data hash for the known IDs.
+        """
+        if not ids:
+            return {}
+        collection = engine.get_collection(self.model)
+        cursor = collection.find(
+            {"_id": {"$in": ids}}, projection={"raw_data_hash": 1, "raw_data": 1}
+        )
+        hashes = {}
+        async for doc in cursor:
+            # Documents stored before change detection have no hash yet.
+            hashes[doc["_id"]] = doc.get("raw_data_hash") or hash_raw_data(
+                doc.get("raw_data", {})
+            )
+        return hashes
+
+    async def get_types(self, engine: AIOEngine) -> dict[str, AnnouncementType]:
+        """
+        Maps the ID of every stored announcement to its type. Only the two
+        fields are read, so this stays cheap for the whole collection.
+        """
+        collection = engine.get_collection(self.model)
+        return {
+            doc["_id"]: AnnouncementType(doc["type"])
+            async for doc in collection.find({}, projection={"type": 1})
+        }
+
+    async def sync_from_source(
+        self, engine: AIOEngine, db_obj: Announcement, obj_in: AnnouncementCreate
+    ) -> Announcement:
+        """Overwrites the source-derived fields of a stored announcement."""
+        obj_in = obj_in.model_copy(
+            update={"filename": db_obj.filename, "pdf_hash": db_obj.pdf_hash}
+        )
+        source_obj = self._prepare_model_for_create(obj_in)
+        update_data = {
+            field: getattr(source_obj, field)
+            for field in source_obj.model_fields
+            if field not in _LOCAL_FIELDS
+        }
+        update_data["updated_at"] = datetime.now(timezone.utc)
+        return await self.update(engine, db_obj, update_data)
+
 
 crud_announcement = CRUDAnnouncement(Announcement)
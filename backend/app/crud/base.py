@@ -2,14 +2,37 @@ from typing import Any, Dict, Generic, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from odmantic import AIOEngine, Model
-from odmantic.query import QueryExpression
+from odmantic.query import QueryExpression, SortExpression
+from odmantic.session import AIOSession, AIOTransaction
 from pydantic import BaseModel
+from pymongo.errors import BulkWriteError
+
+from app.crud.pagination import decode_cursor, encode_cursor, keyset_query
 
 ModelType = TypeVar("ModelType", bound=Model)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+class BulkCreateError(Exception):
+    """
+    Some documents of a bulk insert failed; the others were inserted.
+
+    Attributes:
+        created: The inserted documents.
+        errors: Per failed document: its `index` in the input, and the
+            server's error `code` and `message`.
+    """
+
+    def __init__(self, created: list[Model], errors: list[dict]):
+        self.created = created
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} of {len(created) + len(errors)} documents failed to "
+            f"insert, first: {errors[0]['message']}"
+        )
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: type[ModelType]):
         """
@@ -39,6 +62,66 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             self.model, *queries, skip=skip, limit=limit, sort=sort
         )
 
+    def build_page_query(
+        self,
+        *queries: QueryExpression | dict | bool,
+        sort_field: str,
+        descending: bool = True,
+        cursor: str | None = None,
+    ) -> tuple[list[QueryExpression | dict | bool], tuple[SortExpression, ...]]:
+        """Returns the queries and sort of the page after `cursor` (see `get_page`)."""
+        field = getattr(self.model, sort_field)
+        primary = getattr(self.model, self.model.__primary_field__)
+        queries = list(queries)
+        if cursor is not None:
+            value, id = decode_cursor(cursor, sort_field)
+            queries.append(keyset_query(+field, value, id, descending))
+        if descending:
+            return queries, (field.desc(), primary.desc())
+        return queries, (field.asc(), primary.asc())
+
+    async def get_page(
+        self,
+        engine: AIOEngine,
+        *queries: QueryExpression | dict | bool,
+        sort_field: str,
+        descending: bool = True,
+        limit: int = 100,
+        cursor: str | None = None,
+        skip: int = 0,
+    ) -> tuple[list[ModelType], str | None]:
+        """
+        Keyset pagination over (`sort_field`, primary key): the page after
+        `cursor` is found through the sort index instead of skipping every
+        document before it, so deep pages cost the same as the first one.
+
+        Returns:
+            The page, and the cursor of the next page or None after the last.
+        """
+        queries, sort = self.build_page_query(
+            *queries, sort_field=sort_field, descending=descending, cursor=cursor
+        )
+        docs = await engine.find(
+            self.model, *queries, skip=skip, limit=limit + 1, sort=sort
+        )
+        if len(docs) <= limit:
+            return docs, None
+        last = docs[limit - 1]
+        next_cursor = encode_cursor(
+            sort_field,
+            getattr(last, sort_field),
+            getattr(last, self.model.__primary_field__),
+        )
+        return docs[:limit], next_cursor
+
+    async def count(
+        self, engine: AIOEngine, *queries: QueryExpression | dict | bool
+    ) -> int:
+        """Counts the matching documents; from collection metadata if unfiltered."""
+        if not queries:
+            return await engine.get_collection(self.model).estimated_document_count()
+        return await engine.count(self.model, *queries)
+
     def _prepare_model_for_create(self, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         return self.model(**obj_in_data)
@@ -47,11 +130,60 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj = self._prepare_model_for_create(obj_in)
         return await engine.save(db_obj)
 
+    def build(self, obj_in: CreateSchemaType) -> ModelType:
+        """Builds the document of `obj_in` without saving it, e.g. to reference
+        its ID before a bulk insert."""
+        return self._prepare_model_for_create(obj_in)
+
     async def create_many(
-        self, engine: AIOEngine, objs_in: list[CreateSchemaType]
+        self,
+        engine: AIOEngine,
+        objs_in: list[CreateSchemaType],
+        session: AIOSession | AIOTransaction | None = None,
     ) -> list[ModelType]:
-        db_objs = [self._prepare_model_for_create(obj_in) for obj_in in objs_in]
-        return await engine.save_all(db_objs)
+        """Inserts the documents with one unordered bulk write; see `insert_many`."""
+        return await self.insert_many(
+            engine,
+            [self._prepare_model_for_create(obj_in) for obj_in in objs_in],
+            session,
+        )
+
+    async def insert_many(
+        self,
+        engine: AIOEngine,
+        db_objs: list[ModelType],
+        session: AIOSession | AIOTransaction | None = None,
+    ) -> list[ModelType]:
+        """
+        Inserts new documents with one unordered bulk write, so a failing
+        document (e.g. a duplicate key) does not stop the others.
+
+        Raises:
+            BulkCreateError: If any document failed, with the inserted
+                documents and the error of each failed one.
+        """
+        if not db_objs:
+            return []
+        collection = engine.get_collection(self.model)
+        try:
+            await collection.insert_many(
+                [db_obj.model_dump_doc() for db_obj in db_objs],
+                ordered=False,
+                session=session.get_driver_session() if session is not None else None,
+            )
+        except BulkWriteError as e:
+            errors = [
+                {
+                    "index": error["index"],
+                    "code": error["code"],
+                    "message": error["errmsg"],
+                }
+                for error in e.details["writeErrors"]
+            ]
+            failed = {error["index"] for error in errors}
+            created = [db_obj for i, db_obj in enumerate(db_objs) if i not in failed]
+            raise BulkCreateError(created, errors) from e
+        return db_objs
 
     async def update(
         self,
@@ -0,0 +1,37 @@
+from odmantic import AIOEngine
+
+from app.crud.base import CRUDBase
+from app.models.block import Block
+from app.schemas.block import BlockBase, BlockCreate, BlockUpdate
+
+
+class CRUDBlock(CRUDBase[Block, BlockCreate, BlockUpdate]):
+    async def get_by_announcement(
+        self,
+        engine: AIOEngine,
+        *,
+        announcement_id: str,
+        pages: list[int] | None = None,
+    ) -> list[Block]:
+        """Returns the layout blocks of the announcement (optionally only of
+        `pages`) in page order."""
+        queries = [self.model.announcement_id == announcement_id]
+        if pages is not None:
+            queries.append(self.model.page.in_(pages))
+        return await self.get_many(engine, *queries, limit=None, sort=self.model.page)
+
+    async def replace_for_announcement(
+        self, engine: AIOEngine, *, announcement_id: str, blocks: list[BlockBase]
+    ) -> list[Block]:
+        """Replaces the stored layout of the announcement with `blocks`."""
+        await self.delete_many(engine, self.model.announcement_id == announcement_id)
+        return await self.create_many(
+            engine,
+            [
+                BlockCreate(**block.model_dump(), announcement_id=announcement_id)
+                for block in blocks
+            ],
+        )
+
+
+crud_block = CRUDBlock(Block)
@@ -2,12 +2,12 @@ from typing import Any
 
 from odmantic import AIOEngine
 
-from app.crud.base import CRUDBase
+from app.crud.user_overlay import CRUDUserOverlay
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
 
-class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
+class CRUDCategory(CRUDUserOverlay[Category, CategoryCreate, CategoryUpdate]):
     async def get_many_by_ids(
         self, engine: AIOEngine, *, ids: list[str]
     ) -> list[Category]:
@@ -2,12 +2,12 @@ from typing import Any
 
 from odmantic import AIOEngine
 
-from app.crud.base import CRUDBase
+from app.crud.user_overlay import CRUDUserOverlay
 from app.models.condition import Condition
 from app.schemas.condition import ConditionCreate, ConditionUpdate
 
 
-class CRUDCondition(CRUDBase[Condition, ConditionCreate, ConditionUpdate]):
+class CRUDCondition(CRUDUserOverlay[Condition, ConditionCreate, ConditionUpdate]):
     async def delete(self, engine: AIOEngine, *args: Any) -> int:
         raise NotImplementedError("Delete operation is not implemented for conditions.")
 
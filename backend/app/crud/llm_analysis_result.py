@@ -1,3 +1,7 @@
+from collections import defaultdict
+
+from odmantic import AIOEngine
+
 from app.crud.base import CRUDBase
 from app.models.llm_analysis_result import LLMAnalysisResult
 from app.schemas.llm_analysis_result import (
@@ -9,7 +13,72 @@ from app.schemas.llm_analysis_result import (
 class CRUDAnnouncementAnalysis(
     CRUDBase[LLMAnalysisResult, LLMAnalysisResultCreate, LLMAnalysisResultUpdate]
 ):
-    pass
+    async def get_analyzed_models(
+        self, engine: AIOEngine, *, models: list[str]
+    ) -> dict[str, set[str]]:
+        """
+        Maps announcement IDs to the subset of `models` that already have an
+        analysis result, reading only the two fields needed.
+        """
+        collection = engine.get_collection(self.model)
+        cursor = collection.find(
+            {"model": {"$in": models}},
+            projection={"announcement_id": 1, "model": 1, "_id": 0},
+        )
+        analyzed = defaultdict(set)
+        async for doc in cursor:
+            analyzed[doc["announcement_id"]].add(doc["model"])
+        return analyzed
+
+    async def get_repair_rates(self, engine: AIOEngine) -> list[dict]:
+        """
+        Per model and output mode: the number of results, how many of them
+        needed repairs, the conditions repaired, and the repair calls and
+        tokens spent on them.
+        """
+        collection = engine.get_collection(self.model)
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {
+                        "model": "$model",
+                        "structured_output": {"$ifNull": ["$structured_output", False]},
+                    },
+                    "results": {"$sum": 1},
+                    "repaired_results": {
+                        "$sum": {
+                            "$cond": [
+                                {"$gt": [{"$ifNull": ["$repair_count", 0]}, 0]},
+                                1,
+                                0,
+                            ]
+                        }
+                    },
+                    "repairs": {"$sum": {"$ifNull": ["$repair_count", 0]}},
+                    "repair_calls": {
+                        "$sum": {"$size": {"$ifNull": ["$repair_attempts", []]}}
+                    },
+                    "repair_tokens": {
+                        "$sum": {"$sum": "$repair_attempts.total_tokens"}
+                    },
+                }
+            },
+            {"$sort": {"_id.model": 1, "_id.structured_output": 1}},
+        ]
+        rates = []
+        async for doc in collection.aggregate(pipeline):
+            rates.append(
+                {
+                    **doc["_id"],
+                    "results": doc["results"],
+                    "repaired_results": doc["repaired_results"],
+                    "repairs": doc["repairs"],
+                    "repair_calls": doc["repair_calls"],
+                    "repair_tokens": doc["repair_tokens"],
+                    "repair_rate": doc["repaired_results"] / doc["results"],
+                }
+            )
+        return rates
 
 
 crud_llm_analysis_result = CRUDAnnouncementAnalysis(LLMAnalysisResult)
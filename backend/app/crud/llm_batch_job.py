@@ -0,0 +1,29 @@
+from odmantic import AIOEngine
+
+from app.crud.base import CRUDBase
+from app.models.llm_batch_job import LLMBatchJob
+from app.schemas.llm_batch_job import LLMBatchJobCreate, LLMBatchJobUpdate
+
+
+class CRUDLLMBatchJob(CRUDBase[LLMBatchJob, LLMBatchJobCreate, LLMBatchJobUpdate]):
+    async def get_running(self, engine: AIOEngine) -> list[LLMBatchJob]:
+        return await self.get_many(engine, self.model.status == "running", limit=None)
+
+    async def get_pending_pairs(self, engine: AIOEngine) -> set[tuple[str, str]]:
+        """
+        Returns the (announcement_id, model) pairs of running batches, so they
+        are not submitted again while the provider is still processing them.
+        """
+        collection = engine.get_collection(self.model)
+        cursor = collection.find(
+            {"status": "running"},
+            projection={"model": 1, "requests.announcement_id": 1, "_id": 0},
+        )
+        pending = set()
+        async for doc in cursor:
+            for request in doc["requests"]:
+                pending.add((request["announcement_id"], doc["model"]))
+        return pending
+
+
+crud_llm_batch_job = CRUDLLMBatchJob(LLMBatchJob)
@@ -0,0 +1,51 @@
+import base64
+import binascii
+from datetime import timezone
+from typing import Any
+
+from bson import json_util
+
+_JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS.with_options(
+    tz_aware=True, tzinfo=timezone.utc
+)
+
+
+class InvalidCursorError(ValueError):
+    """A cursor that is malformed or was issued for another sort order."""
+
+
+def encode_cursor(sort_key: str, value: Any, id: Any) -> str:
+    """Opaque cursor pointing after the document with (`value`, `id`)."""
+    data = json_util.dumps([sort_key, value, id], json_options=_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple[Any, Any]:
+    """Returns the (sort value, ID) of a cursor issued for `sort_key`."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort_key, value, id = json_util.loads(data, json_options=_JSON_OPTIONS)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor.") from e
+    if cursor_sort_key != sort_key:
+        raise InvalidCursorError("Cursor was issued for another sort order.")
+    return value, id
+
+
+def keyset_query(field: str, value: Any, id: Any, descending: bool) -> dict:
+    """
+    Query for the documents after (`value`, `id`) in the order of
+    (`field`, `_id`), both ascending or both descending. MongoDB sorts missing
+    and null values before all others, i.e. first ascending and last
+    descending.
+    """
+    op = "$lt" if descending else "$gt"
+    same_value = {field: value, "_id": {op: id}}
+    if value is None:
+        if descending:
+            return same_value
+        return {"$or": [same_value, {field: {"$ne": None}}]}
+    after = [{field: {op: value}}, same_value]
+    if descending:
+        after.append({field: None})
+    return {"$or": after}
@@ -0,0 +1,61 @@
+from odmantic import AIOEngine
+
+from app.crud.base import CRUDBase
+from app.models.sync_state import SyncState
+from app.schemas.announcement import AnnouncementCreate
+from app.schemas.sync_state import SyncStateCreate, SyncStateUpdate
+
+
+class CRUDSyncState(CRUDBase[SyncState, SyncStateCreate, SyncStateUpdate]):
+    async def get_watermarks(
+        self, engine: AIOEngine, *, brtc_codes: list[str]
+    ) -> dict[str, SyncState]:
+        """Returns the stored sync state of each region, keyed by brtcCode."""
+        if not brtc_codes:
+            return {}
+        states = await engine.find(self.model, self.model.id.in_(brtc_codes))
+        return {state.id: state for state in states}
+
+    async def advance_watermark(
+        self,
+        engine: AIOEngine,
+        *,
+        brtc_code: str,
+        announcements: list[AnnouncementCreate],
+    ) -> SyncState | None:
+        """
+        Moves the region watermark forward to the newest (rcritPblancDe, pblancId)
+        among the given announcements. The watermark never moves backwards.
+        """
+        if not announcements:
+            return await self.get(engine, self.model.id == brtc_code)
+
+        newest = max(announcements, key=lambda a: (a.rcritPblancDe, a.pblancId))
+        state = await self.get(engine, self.model.id == brtc_code)
+        if state is None:
+            return await self.create(
+                engine,
+                SyncStateCreate(
+                    id=brtc_code,
+                    last_application_date=newest.rcritPblancDe,
+                    last_announcement_id=newest.pblancId,
+                ),
+            )
+
+        if (newest.rcritPblancDe, newest.pblancId) <= (
+            state.last_application_date or "",
+            state.last_announcement_id or "",
+        ):
+            return state
+
+        return await self.update(
+            engine,
+            state,
+            SyncStateUpdate(
+                last_application_date=newest.rcritPblancDe,
+                last_announcement_id=newest.pblancId,
+            ),
+        )
+
+
+crud_sync_state = CRUDSyncState(SyncState)
@@ -0,0 +1,116 @@
+from odmantic import AIOEngine
+
+from app.crud.base import CreateSchemaType, CRUDBase, ModelType, UpdateSchemaType
+
+
+def user_overlay_pipeline(announcement_id: str, user_id: str) -> list[dict]:
+    """
+    Aggregation pipeline merging a user's versions over the original documents
+    of an announcement, reading only the originals and that user's documents:
+
+    - an original is replaced by the user's version of it (`original_id`), or
+      hidden if that version is deleted;
+    - the user's own documents (without `original_id`) follow, unless deleted;
+    - user versions of originals that no longer exist are left out.
+    """
+    is_original = {"$eq": [{"$ifNull": ["$user_id", None]}, None]}
+    return [
+        {
+            "$match": {
+                "announcement_id": announcement_id,
+                "user_id": {"$in": [None, user_id]},
+            }
+        },
+        {
+            "$group": {
+                "_id": {"$ifNull": ["$original_id", "$_id"]},
+                "original": {"$max": {"$cond": [is_original, "$$ROOT", None]}},
+                "user_version": {"$max": {"$cond": [is_original, None, "$$ROOT"]}},
+            }
+        },
+        {
+            "$match": {
+                "$expr": {
+                    "$and": [
+                        {
+                            "$or": [
+                                {"$ne": ["$original", None]},
+                                {
+                                    "$eq": [
+                                        {
+                                            "$ifNull": [
+                                                "$user_version.original_id",
+                                                None,
+                                            ]
+                                        },
+                                        None,
+                                    ]
+                                },
+                            ]
+                        },
+                        {
+                            "$or": [
+                                {"$eq": ["$user_version", None]},
+                                {"$ne": ["$user_version.is_deleted", True]},
+                            ]
+                        },
+                    ]
+                }
+            }
+        },
+        {
+            "$addFields": {
+                "user_only": {"$eq": ["$original", None]},
+                "created_at": {
+                    "$ifNull": ["$original.created_at", "$user_version.created_at"]
+                },
+            }
+        },
+        {"$sort": {"user_only": 1, "created_at": 1, "_id": 1}},
+        {"$replaceRoot": {"newRoot": {"$ifNull": ["$user_version", "$original"]}}},
+    ]
+
+
+class CRUDUserOverlay(CRUDBase[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """CRUD for documents that users annotate with their own versions."""
+
+    async def get_originals(
+        self, engine: AIOEngine, *, announcement_id: str
+    ) -> list[ModelType]:
+        """Returns the original (`user_id is None`) documents of an announcement."""
+        return await self.get_many(
+            engine,
+            self.model.announcement_id == announcement_id,
+            self.model.user_id == None,  # noqa: E711
+            limit=None,
+            sort=(self.model.created_at, self.model.id),
+        )
+
+    async def get_user_documents(
+        self, engine: AIOEngine, *, announcement_id: str, user_id: str
+    ) -> list[ModelType]:
+        """Returns a user's versions and own documents of an announcement."""
+        return await self.get_many(
+            engine,
+            self.model.announcement_id == announcement_id,
+            self.model.user_id == user_id,
+            limit=None,
+            sort=(self.model.created_at, self.model.id),
+        )
+
+    async def get_for_user(
+        self, engine: AIOEngine, *, announcement_id: str, user_id: str
+    ) -> list[ModelType]:
+        """
+        Returns the announcement's documents as the user sees them: originals
+        with the user's versions merged over them, then the user's own
+        documents (see `user_overlay_pipeline`). The merge runs in the
+        database, so its cost does not grow with other users' annotations.
+        """
+        collection = engine.get_collection(self.model)
+        return [
+            self.model.model_validate_doc(doc)
+            async for doc in collection.aggregate(
+                user_overlay_pipeline(announcement_id, user_id)
+            )
+        ]
@@ -1,6 +1,10 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from pathlib import Path
 
+from pydantic import BaseModel
+
 
 class LLMProviderStrategy(ABC):
     """
@@ -15,6 +19,8 @@ class LLMProviderStrategy(ABC):
         system_prompt: str,
         user_prompt: str,
         model_name: str,
+        page_numbers: list[int] | None = None,
+        response_schema: type[BaseModel] | None = None,
     ) -> tuple[str, dict] | None:
         """
         Generates content from a PDF file using the specific LLM provider.
@@ -24,6 +30,11 @@ class LLMProviderStrategy(ABC):
             system_prompt: The system prompt for the LLM.
             user_prompt: The user prompt for the LLM.
             model_name: The specific model name for the provider.
+            page_numbers: Optional 1-based pages to send instead of the whole
+                document. Each page is labelled with its original number.
+            response_schema: Optional Pydantic model with an object root. If
+                given, the provider's native structured output mode constrains
+                the response to its JSON schema.
 
         Returns:
             A tuple containing:
@@ -31,3 +42,65 @@ class LLMProviderStrategy(ABC):
                 - The raw API response dictionary (dict) or None if an error occurs.
         """
         pass
+
+    async def agenerate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        """
+        Async variant of `generate_from_pdf`. If `on_chunk` is given, the
+        response is streamed and each text delta is passed to it as it arrives.
+
+        Providers without a native async client fall back to running
+        `generate_from_pdf` in a worker thread and report the whole text as a
+        single chunk.
+
+        Returns:
+            The same as `generate_from_pdf`.
+        """
+        result = await asyncio.to_thread(
+            self.generate_from_pdf,
+            pdf_path=pdf_path,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model_name=model_name,
+            page_numbers=page_numbers,
+            response_schema=response_schema,
+        )
+        if on_chunk is not None and result is not None and result[0] is not None:
+            on_chunk(result[0])
+        return result
+
+    @abstractmethod
+    def generate_text(
+        self, system_prompt: str, user_prompt: str, model_name: str
+    ) -> tuple[str, dict] | None:
+        """
+        Generates content from text prompts only, e.g. to repair malformed
+        output of an earlier call.
+
+        Returns:
+            The same as `generate_from_pdf`.
+        """
+        pass
+
+    @abstractmethod
+    def text_from_raw_response(self, raw_response: dict) -> str | None:
+        """
+        Recovers the text content from a stored raw API response, so saved
+        results can be re-parsed without calling the API again.
+
+        Args:
+            raw_response: The raw API response dictionary returned by
+                `generate_from_pdf`.
+
+        Returns:
+            The text content, or None if the response contains no text.
+        """
+        pass
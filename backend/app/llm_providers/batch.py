@@ -0,0 +1,118 @@
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Literal, NamedTuple
+
+from pydantic import BaseModel
+
+
+class BatchRequest(NamedTuple):
+    custom_id: str
+    pdf_path: Path
+    system_prompt: str
+    user_prompt: str
+    model_name: str
+    page_numbers: list[int] | None = None
+    response_schema: type[BaseModel] | None = None
+
+
+class BatchStatus(NamedTuple):
+    state: Literal["running", "completed", "failed"]
+    detail: str | None = None
+
+
+class LLMBatchClient(ABC):
+    """
+    Submits requests to a provider's asynchronous batch endpoint, which trades
+    latency (results within 24 hours) for higher throughput and lower cost.
+    """
+
+    @abstractmethod
+    def request_line(self, request: BatchRequest) -> dict:
+        """Builds the JSONL line of one request."""
+        pass
+
+    @abstractmethod
+    def submit(self, model_name: str, lines: list[dict], display_name: str) -> str:
+        """
+        Uploads the JSONL lines and starts a batch job.
+
+        Returns:
+            The provider's batch ID.
+        """
+        pass
+
+    @abstractmethod
+    def status(self, batch_id: str) -> BatchStatus:
+        pass
+
+    @abstractmethod
+    def results(self, batch_id: str) -> dict[str, dict | None]:
+        """
+        Downloads the results of a completed batch.
+
+        Returns:
+            The raw response of each request by custom ID, in the same form as
+            `LLMProviderStrategy.generate_from_pdf` returns it; None for
+            requests that failed.
+        """
+        pass
+
+
+def to_jsonl(lines: list[dict]) -> bytes:
+    return b"".join(
+        json.dumps(line, ensure_ascii=False).encode("utf-8") + b"\n" for line in lines
+    )
+
+
+class Batch(NamedTuple):
+    lines: list[dict]
+    items: list
+
+
+class BatchBuilder:
+    """
+    Packs JSONL lines into batches within the provider's input file limits,
+    so a batch can be submitted as soon as it is full instead of after every
+    line has been built.
+
+    Lines are added in groups (e.g. the page windows of one announcement)
+    that are never split across batches; a group exceeding the limits on its
+    own gets a batch of its own. Each group carries `items`, e.g. the request
+    metadata to record alongside the batch.
+    """
+
+    def __init__(self, max_requests: int, max_bytes: int):
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self._lines: list[dict] = []
+        self._items: list = []
+        self._size = 0
+
+    def add(self, lines: list[dict], items: list) -> Batch | None:
+        """
+        Adds a group of lines.
+
+        Returns:
+            The batch built so far if the group does not fit in it; the group
+            then starts the next batch.
+        """
+        size = len(to_jsonl(lines))
+        full = None
+        if self._lines and (
+            len(self._lines) + len(lines) > self.max_requests
+            or self._size + size > self.max_bytes
+        ):
+            full = self.flush()
+        self._lines.extend(lines)
+        self._items.extend(items)
+        self._size += size
+        return full
+
+    def flush(self) -> Batch | None:
+        """Returns the pending batch, if any, and starts a new one."""
+        if not self._lines:
+            return None
+        batch = Batch(self._lines, self._items)
+        self._lines, self._items, self._size = [], [], 0
+        return batch
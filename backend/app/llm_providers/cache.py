@@ -0,0 +1,297 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from app.core.blob_store import pdf_blob_store
+from app.core.config import settings
+from app.llm_providers.base_provider import LLMProviderStrategy
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent LLM response cache backed by SQLite.
+
+    Entries are keyed on (PDF content hash, prompt hash, model identifier) and
+    evicted least-recently-used first once the stored payload exceeds
+    `max_bytes`. A SQLite file is safe to share between worker processes.
+
+    The total payload size is kept in `llm_response_stats` by triggers, so a
+    write does not have to sum the whole table to decide whether to evict.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response (
+                    key TEXT PRIMARY KEY,
+                    pdf_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    raw_response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_response_accessed_at "
+                "ON llm_response (accessed_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_response_pdf_hash_model "
+                "ON llm_response (pdf_hash, model)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_size INTEGER NOT NULL
+                )
+                """
+            )
+            # Seeds the total of a cache file created before the stats table.
+            conn.execute(
+                "INSERT OR IGNORE INTO llm_response_stats (id, total_size) "
+                "SELECT 1, COALESCE(SUM(size), 0) FROM llm_response"
+            )
+            conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS tr_llm_response_insert
+                AFTER INSERT ON llm_response BEGIN
+                    UPDATE llm_response_stats SET total_size = total_size + new.size;
+                END;
+                CREATE TRIGGER IF NOT EXISTS tr_llm_response_update
+                AFTER UPDATE OF size ON llm_response BEGIN
+                    UPDATE llm_response_stats
+                    SET total_size = total_size - old.size + new.size;
+                END;
+                CREATE TRIGGER IF NOT EXISTS tr_llm_response_delete
+                AFTER DELETE ON llm_response BEGIN
+                    UPDATE llm_response_stats SET total_size = total_size - old.size;
+                END;
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection in a transaction, closed on exit."""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def make_key(
+        pdf_hash: str,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        page_numbers: list[int] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> str:
+        prompt_hash = _sha256(f"{_sha256(system_prompt)}:{_sha256(user_prompt)}")
+        key = f"{pdf_hash}:{prompt_hash}:{model}"
+        if page_numbers is not None:
+            key += ":" + ",".join(map(str, page_numbers))
+        if response_schema is not None:
+            schema = json.dumps(response_schema.model_json_schema(), sort_keys=True)
+            key += ":" + _sha256(schema)
+        return _sha256(key)
+
+    def get(self, key: str) -> tuple[str, dict] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content, raw_response FROM llm_response WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE llm_response SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        content, raw_response = row
+        return content, json.loads(raw_response)
+
+    def set(
+        self, key: str, pdf_hash: str, model: str, content: str, raw_response: dict
+    ) -> None:
+        raw_json = json.dumps(raw_response, ensure_ascii=False, default=str)
+        size = len(content.encode("utf-8")) + len(raw_json.encode("utf-8"))
+        with self._connect() as conn:
+            # An upsert rather than INSERT OR REPLACE: the rows deleted by
+            # REPLACE do not fire the delete trigger.
+            conn.execute(
+                "INSERT INTO llm_response "
+                "(key, pdf_hash, model, content, raw_response, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "pdf_hash = excluded.pdf_hash, model = excluded.model, "
+                "content = excluded.content, raw_response = excluded.raw_response, "
+                "size = excluded.size, accessed_at = excluded.accessed_at",
+                (key, pdf_hash, model, content, raw_json, size, time.time()),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute(
+            "SELECT total_size FROM llm_response_stats WHERE id = 1"
+        ).fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+
+        stale_keys = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM llm_response ORDER BY accessed_at ASC"
+        ):
+            stale_keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM llm_response WHERE key = ?", stale_keys)
+        logging.info(f"Evicted {len(stale_keys)} LLM cache entries")
+
+    def invalidate(self, pdf_hash: str | None = None, model: str | None = None) -> int:
+        """
+        Removes the entries matching the given PDF hash and/or model identifier.
+        With no arguments, the whole cache is cleared.
+
+        Returns:
+            The number of removed entries.
+        """
+        clauses, params = [], []
+        if pdf_hash is not None:
+            clauses.append("pdf_hash = ?")
+            params.append(pdf_hash)
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM llm_response{where}", params).rowcount
+
+
+_llm_response_cache: LLMResponseCache | None = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache(
+            settings.LLM_CACHE_PATH, settings.LLM_CACHE_MAX_BYTES
+        )
+    return _llm_response_cache
+
+
+class CachedLLMProvider(LLMProviderStrategy):
+    """
+    LLMProviderStrategy decorator that serves repeated requests for the same
+    PDF content, prompts and model from the persistent response cache.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProviderStrategy,
+        provider_name: str,
+        cache: LLMResponseCache,
+    ):
+        self.provider = provider
+        self.provider_name = provider_name
+        self.cache = cache
+
+    def generate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        model = f"{self.provider_name}/{model_name}"
+        pdf_hash = pdf_blob_store.digest_for_path(pdf_path)
+        key = self.cache.make_key(
+            pdf_hash, system_prompt, user_prompt, model, page_numbers, response_schema
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            logging.info(f"LLM cache hit for {pdf_path} (model: {model})")
+            return cached
+
+        result = self.provider.generate_from_pdf(
+            pdf_path=pdf_path,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model_name=model_name,
+            page_numbers=page_numbers,
+            response_schema=response_schema,
+        )
+        if result is not None and result[0] is not None:
+            content, raw_response = result
+            self.cache.set(key, pdf_hash, model, content, raw_response)
+        return result
+
+    async def agenerate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        model = f"{self.provider_name}/{model_name}"
+        pdf_hash = await asyncio.to_thread(pdf_blob_store.digest_for_path, pdf_path)
+        key = self.cache.make_key(
+            pdf_hash, system_prompt, user_prompt, model, page_numbers, response_schema
+        )
+
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            logging.info(f"LLM cache hit for {pdf_path} (model: {model})")
+            if on_chunk is not None:
+                on_chunk(cached[0])
+            return cached
+
+        result = await self.provider.agenerate_from_pdf(
+            pdf_path=pdf_path,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model_name=model_name,
+            page_numbers=page_numbers,
+            response_schema=response_schema,
+            on_chunk=on_chunk,
+        )
+        if result is not None and result[0] is not None:
+            content, raw_response = result
+            await asyncio.to_thread(
+                self.cache.set, key, pdf_hash, model, content, raw_response
+            )
+        return result
+
+    def generate_text(
+        self, system_prompt: str, user_prompt: str, model_name: str
+    ) -> tuple[str, dict] | None:
+        # Text-only calls are small, one-off repairs; they are not cached.
+        return self.provider.generate_text(system_prompt, user_prompt, model_name)
+
+    def text_from_raw_response(self, raw_response: dict) -> str | None:
+        return self.provider.text_from_raw_response(raw_response)
@@ -1,12 +1,21 @@
+from app.core.config import settings
 from app.llm_providers.base_provider import LLMProviderStrategy
-from app.llm_providers.gemini_provider import GeminiProvider
-from app.llm_providers.openai_provider import OpenAIProvider
+from app.llm_providers.batch import LLMBatchClient
+from app.llm_providers.cache import CachedLLMProvider, get_llm_response_cache
+from app.llm_providers.gemini_provider import GeminiBatchClient, GeminiProvider
+from app.llm_providers.openai_provider import OpenAIBatchClient, OpenAIProvider
+from app.llm_providers.rate_limiter import RateLimitedLLMProvider
 
 _PROVIDER_REGISTRY = {
     "gemini": GeminiProvider,
     "openai": OpenAIProvider,
 }
 
+_BATCH_CLIENT_REGISTRY = {
+    "gemini": GeminiBatchClient,
+    "openai": OpenAIBatchClient,
+}
+
 
 def get_llm_provider(provider_name: str) -> LLMProviderStrategy:
     """
@@ -16,15 +25,40 @@ def get_llm_provider(provider_name: str) -> LLMProviderStrategy:
         provider_name: The name of the provider (e.g., "gemini", "openai").
 
     Returns:
-        An instance of the requested LLMProviderStrategy.
+        An instance of the requested LLMProviderStrategy, wrapped with the
+        shared rate limiter when `LLM_RATE_LIMIT_ENABLED` is set and with the
+        persistent response cache when `LLM_CACHE_ENABLED` is set. The cache
+        sits outermost so cache hits do not use up rate limit budget.
 
     Raises:
         ValueError: If the provider_name is not supported.
     """
     provider_class = _PROVIDER_REGISTRY.get(provider_name.lower())
     if provider_class:
-        return provider_class()
+        provider = provider_class()
+        if settings.LLM_RATE_LIMIT_ENABLED:
+            provider = RateLimitedLLMProvider(provider, provider_name.lower())
+        if settings.LLM_CACHE_ENABLED:
+            provider = CachedLLMProvider(
+                provider, provider_name.lower(), get_llm_response_cache()
+            )
+        return provider
     else:
         raise ValueError(
             f"Unsupported LLM provider: '{provider_name}'. Supported providers are: {list(_PROVIDER_REGISTRY.keys())}"
         )
+
+
+def get_batch_client(provider_name: str) -> LLMBatchClient:
+    """
+    Factory function to get the batch API client of an LLM provider.
+
+    Raises:
+        ValueError: If the provider_name is not supported.
+    """
+    client_class = _BATCH_CLIENT_REGISTRY.get(provider_name.lower())
+    if client_class is None:
+        raise ValueError(
+            f"Unsupported LLM provider: '{provider_name}'. Supported providers are: {list(_BATCH_CLIENT_REGISTRY.keys())}"
+        )
+    return client_class()
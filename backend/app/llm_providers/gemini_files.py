@@ -0,0 +1,125 @@
+import hashlib
+import io
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+from google.genai import types
+from google.genai.files import Files
+from redis import Redis
+
+from app.core.config import settings
+from app.core.gemini_client import gemini_client
+from app.core.redis_client import get_redis_client
+from app.llm_providers.handle_store import HandleStore
+
+KEY_PREFIX = "gemini_file"
+
+# Files that are still being processed right after the upload are polled
+# until they become usable.
+_PROCESSING_POLL_INTERVAL = 1.0
+_PROCESSING_TIMEOUT = 60.0
+
+
+class FileHandle(NamedTuple):
+    name: str
+    uri: str
+    mime_type: str
+
+    def part(self) -> types.Part:
+        return types.Part.from_uri(file_uri=self.uri, mime_type=self.mime_type)
+
+
+class GeminiFileCache:
+    """
+    Uploads files to the Gemini File API once per content key and reuses the
+    handle until shortly before it expires, so repeated requests for the same
+    PDF (other models, prompts or re-runs) reference it instead of inlining
+    the bytes.
+
+    Handles are shared between workers through Redis, with an in-process
+    fallback when Redis is unavailable.
+    """
+
+    def __init__(
+        self,
+        files: Files,
+        redis: Redis | None = None,
+        ttl_margin: float | None = None,
+    ):
+        self.files = files
+        self.store = HandleStore(KEY_PREFIX, redis)
+        self.ttl_margin = (
+            ttl_margin
+            if ttl_margin is not None
+            else settings.GEMINI_FILE_API_TTL_MARGIN
+        )
+
+    def get(self, digest: str) -> FileHandle | None:
+        value = self.store.get(digest)
+        return FileHandle(**value) if value else None
+
+    def invalidate(self, digest: str) -> None:
+        self.store.delete(digest)
+
+    def get_or_upload(
+        self,
+        source: Path | bytes,
+        digest: str | None = None,
+        mime_type: str = "application/pdf",
+    ) -> FileHandle:
+        """
+        Returns the handle of the uploaded content, uploading it first if no
+        live handle is cached.
+
+        Args:
+            source: A file path (streamed from disk) or the content bytes.
+            digest: Key identifying the content; its SHA-256 if not given.
+            mime_type: MIME type of the content.
+        """
+        if digest is None:
+            digest = hashlib.sha256(
+                source if isinstance(source, bytes) else source.read_bytes()
+            ).hexdigest()
+        handle = self.get(digest)
+        if handle is not None:
+            return handle
+
+        file = self.files.upload(
+            file=io.BytesIO(source) if isinstance(source, bytes) else source,
+            config=types.UploadFileConfig(mime_type=mime_type, display_name=digest),
+        )
+        file = self._wait_until_active(file)
+        handle = FileHandle(name=file.name, uri=file.uri, mime_type=file.mime_type)
+        self.store.set(digest, handle._asdict(), self._ttl(file))
+        logging.info(f"Uploaded {digest} to the Gemini File API as {file.name}")
+        return handle
+
+    def _wait_until_active(self, file: types.File) -> types.File:
+        deadline = time.monotonic() + _PROCESSING_TIMEOUT
+        while file.state == types.FileState.PROCESSING:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Gemini file {file.name} is still processing")
+            time.sleep(_PROCESSING_POLL_INTERVAL)
+            file = self.files.get(name=file.name)
+        if file.state == types.FileState.FAILED:
+            raise RuntimeError(f"Gemini failed to process file {file.name}")
+        return file
+
+    def _ttl(self, file: types.File) -> float:
+        if file.expiration_time is None:
+            return 0
+        remaining = (file.expiration_time - datetime.now(timezone.utc)).total_seconds()
+        return remaining - self.ttl_margin
+
+
+_gemini_file_cache: GeminiFileCache | None = None
+
+
+def get_gemini_file_cache() -> GeminiFileCache:
+    global _gemini_file_cache
+    if _gemini_file_cache is None:
+        _gemini_file_cache = GeminiFileCache(gemini_client.files, get_redis_client())
+    return _gemini_file_cache
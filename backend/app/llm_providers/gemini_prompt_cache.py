@@ -0,0 +1,89 @@
+import hashlib
+import logging
+
+from google.genai import errors, types
+from google.genai.caches import Caches
+from redis import Redis
+
+from app.core.config import settings
+from app.core.gemini_client import gemini_client
+from app.core.redis_client import get_redis_client
+from app.llm_providers.handle_store import HandleStore
+
+KEY_PREFIX = "gemini_prompt_cache"
+
+# Stop using a context cache this long before it expires on the server.
+_EXPIRY_MARGIN = 60.0
+
+
+class GeminiPromptCache:
+    """
+    Explicit Gemini context caches for static system prompts, one per
+    (model, prompt), so the long extraction instructions are billed at the
+    cached-token rate instead of being processed again on every call.
+
+    Prompts the API refuses to cache (e.g. below the model's minimum cached
+    token count) are remembered and sent uncached.
+    """
+
+    def __init__(
+        self, caches: Caches, redis: Redis | None = None, ttl: float | None = None
+    ):
+        self.caches = caches
+        self.store = HandleStore(KEY_PREFIX, redis)
+        self.ttl = ttl if ttl is not None else settings.GEMINI_PROMPT_CACHE_TTL
+        self._uncacheable: set[str] = set()
+
+    @staticmethod
+    def _key(model_name: str, system_prompt: str) -> str:
+        return hashlib.sha256(f"{model_name}:{system_prompt}".encode()).hexdigest()
+
+    def get_or_create(self, model_name: str, system_prompt: str) -> str | None:
+        """
+        Returns:
+            The cached content name to pass as `cached_content`, or None to
+            send the system prompt as usual.
+        """
+        key = self._key(model_name, system_prompt)
+        if key in self._uncacheable:
+            return None
+        handle = self.store.get(key)
+        if handle is not None:
+            return handle["name"]
+
+        try:
+            cached_content = self.caches.create(
+                model=model_name,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_prompt,
+                    ttl=f"{int(self.ttl)}s",
+                    display_name=key[:32],
+                ),
+            )
+        except errors.ClientError as e:
+            if e.code == 400:
+                # Too short to cache, or caching unsupported by the model
+                self._uncacheable.add(key)
+            logging.info(f"System prompt not cached for {model_name}: {e}")
+            return None
+
+        self.store.set(key, {"name": cached_content.name}, self.ttl - _EXPIRY_MARGIN)
+        logging.info(
+            f"Created Gemini context cache {cached_content.name} for {model_name}"
+        )
+        return cached_content.name
+
+    def invalidate(self, model_name: str, system_prompt: str) -> None:
+        self.store.delete(self._key(model_name, system_prompt))
+
+
+_gemini_prompt_cache: GeminiPromptCache | None = None
+
+
+def get_gemini_prompt_cache() -> GeminiPromptCache:
+    global _gemini_prompt_cache
+    if _gemini_prompt_cache is None:
+        _gemini_prompt_cache = GeminiPromptCache(
+            gemini_client.caches, get_redis_client()
+        )
+    return _gemini_prompt_cache
@@ -1,10 +1,132 @@
+import asyncio
+import io
+import json
 import logging
+from collections.abc import Callable
 from pathlib import Path
 
-from google.genai import types
+from google.genai import Client, errors, types
+from pydantic import BaseModel
 
+from app.core.blob_store import pdf_blob_store
+from app.core.config import settings
 from app.core.gemini_client import gemini_client
 from app.llm_providers.base_provider import LLMProviderStrategy
+from app.llm_providers.batch import BatchRequest, BatchStatus, LLMBatchClient, to_jsonl
+from app.llm_providers.gemini_files import GeminiFileCache, get_gemini_file_cache
+from app.llm_providers.gemini_prompt_cache import get_gemini_prompt_cache
+from app.pdf_analysis.utils import split_pdf_pages
+
+
+def _generate_content_config(
+    system_prompt: str,
+    response_schema: type[BaseModel] | None = None,
+    cached_content: str | None = None,
+) -> types.GenerateContentConfig:
+    # A context cache already holds the system instruction.
+    prompt = (
+        {"cached_content": cached_content}
+        if cached_content is not None
+        else {"system_instruction": system_prompt}
+    )
+    if response_schema is None:
+        return types.GenerateContentConfig(**prompt, temperature=0)
+    return types.GenerateContentConfig(
+        **prompt,
+        temperature=0,
+        response_mime_type="application/json",
+        response_schema=response_schema,
+    )
+
+
+def _pdf_part(
+    source: Path | bytes,
+    digest: str,
+    file_cache: GeminiFileCache | None,
+    uploaded: list[str],
+) -> types.Part:
+    """
+    A reference to the uploaded PDF if the File API cache is in use, otherwise
+    (or if the upload fails) the inlined bytes. Digests of referenced uploads
+    are appended to `uploaded`.
+    """
+    if file_cache is not None:
+        try:
+            handle = file_cache.get_or_upload(source, digest)
+            uploaded.append(digest)
+            return handle.part()
+        except Exception as e:
+            logging.warning(f"Gemini file upload failed, sending inline: {e}")
+    data = source if isinstance(source, bytes) else source.read_bytes()
+    return types.Part.from_bytes(data=data, mime_type="application/pdf")
+
+
+def _pdf_contents(
+    pdf_path: Path,
+    user_prompt: str,
+    page_numbers: list[int] | None = None,
+    file_cache: GeminiFileCache | None = None,
+) -> tuple[list, list[str]]:
+    """
+    Returns:
+        The request contents and the digests of the File API uploads they
+        reference.
+    """
+    # The static prompt goes before the document so requests share a prefix.
+    uploaded: list[str] = []
+    digest = pdf_blob_store.digest_for_path(pdf_path)
+    if page_numbers is None:
+        return [
+            user_prompt,
+            _pdf_part(pdf_path, digest, file_cache, uploaded),
+        ], uploaded
+
+    # Send each selected page as its own PDF, labelled with its original number.
+    # Split pages are not byte-identical between runs, so their uploads are
+    # keyed by the source document and page.
+    contents = [user_prompt]
+    for page_number, page_bytes in split_pdf_pages(pdf_path, page_numbers):
+        contents.append(f"page_number: {page_number}")
+        contents.append(
+            _pdf_part(page_bytes, f"{digest}-p{page_number}", file_cache, uploaded)
+        )
+    return contents, uploaded
+
+
+def _file_cache() -> GeminiFileCache | None:
+    return get_gemini_file_cache() if settings.GEMINI_FILE_API_ENABLED else None
+
+
+def _cached_prompt(model_name: str, system_prompt: str) -> str | None:
+    if not settings.GEMINI_PROMPT_CACHE_ENABLED:
+        return None
+    try:
+        return get_gemini_prompt_cache().get_or_create(model_name, system_prompt)
+    except Exception as e:
+        logging.warning(f"Gemini context cache unavailable: {e}")
+        return None
+
+
+def _is_missing_file_error(e: Exception) -> bool:
+    # Expired or deleted files and caches are reported as not found or, for
+    # resources of the same project, as permission denied.
+    return isinstance(e, errors.ClientError) and e.code in (403, 404)
+
+
+def _refresh_handles(
+    file_cache: GeminiFileCache | None,
+    uploaded: list[str],
+    model_name: str,
+    cached_content: str | None,
+    system_prompt: str,
+) -> None:
+    logging.warning(
+        f"Gemini handles are gone, creating them again: {uploaded}, {cached_content}"
+    )
+    for digest in uploaded:
+        file_cache.invalidate(digest)
+    if cached_content is not None:
+        get_gemini_prompt_cache().invalidate(model_name, system_prompt)
 
 
 class GeminiProvider(LLMProviderStrategy):
@@ -18,6 +140,8 @@ class GeminiProvider(LLMProviderStrategy):
         system_prompt: str,
         user_prompt: str,
         model_name: str,  # This is the actual_model_name, e.g., "gemini-1.5-pro-latest"
+        page_numbers: list[int] | None = None,
+        response_schema: type[BaseModel] | None = None,
     ) -> tuple[str, dict] | None:
         """
         Generates content from a PDF using Gemini API.
@@ -27,30 +151,239 @@ class GeminiProvider(LLMProviderStrategy):
             system_prompt: The system prompt for Gemini.
             user_prompt: The user prompt for Gemini.
             model_name: The specific Gemini model name (e.g., "gemini-1.5-pro-latest").
+            page_numbers: Optional 1-based pages to send instead of the whole PDF.
+            response_schema: Optional Pydantic model the JSON response must follow.
 
         Returns:
             A tuple (content_text, raw_response_dict) or (None, error_dict).
         """
+        file_cache = _file_cache()
+        for attempt in range(2):
+            contents, uploaded = _pdf_contents(
+                pdf_path, user_prompt, page_numbers, file_cache
+            )
+            cached_content = _cached_prompt(model_name, system_prompt)
+            try:
+                response = gemini_client.models.generate_content(
+                    model=model_name,
+                    config=_generate_content_config(
+                        system_prompt, response_schema, cached_content
+                    ),
+                    contents=contents,
+                )
+                break
+            except Exception as e:
+                if (
+                    attempt == 0
+                    and (uploaded or cached_content)
+                    and _is_missing_file_error(e)
+                ):
+                    _refresh_handles(
+                        file_cache, uploaded, model_name, cached_content, system_prompt
+                    )
+                    continue
+                logging.error(
+                    f"Failed during Gemini API call for {pdf_path}: {e}", exc_info=True
+                )
+                return None
+
+        content = response.text
+        return content, response.to_json_dict()
+
+    async def agenerate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        """
+        Generates content from a PDF using the async Gemini API, streaming the
+        response when `on_chunk` is given.
+        """
+        file_cache = _file_cache()
+        for attempt in range(2):
+            contents, uploaded = await asyncio.to_thread(
+                _pdf_contents, pdf_path, user_prompt, page_numbers, file_cache
+            )
+            cached_content = await asyncio.to_thread(
+                _cached_prompt, model_name, system_prompt
+            )
+            config = _generate_content_config(
+                system_prompt, response_schema, cached_content
+            )
+            texts = []
+            last_chunk = None
+            try:
+                if on_chunk is None:
+                    response = await gemini_client.aio.models.generate_content(
+                        model=model_name, config=config, contents=contents
+                    )
+                    return response.text, response.to_json_dict()
+
+                stream = await gemini_client.aio.models.generate_content_stream(
+                    model=model_name, config=config, contents=contents
+                )
+                async for chunk in stream:
+                    if chunk.text:
+                        texts.append(chunk.text)
+                        on_chunk(chunk.text)
+                    last_chunk = chunk
+                break
+            except Exception as e:
+                # Only retry if nothing was passed to `on_chunk` yet.
+                if (
+                    attempt == 0
+                    and (uploaded or cached_content)
+                    and not texts
+                    and _is_missing_file_error(e)
+                ):
+                    await asyncio.to_thread(
+                        _refresh_handles,
+                        file_cache,
+                        uploaded,
+                        model_name,
+                        cached_content,
+                        system_prompt,
+                    )
+                    continue
+                logging.error(
+                    f"Failed during Gemini API call for {pdf_path}: {e}", exc_info=True
+                )
+                return None
+
+        if last_chunk is None:
+            return None, {}
+        content = "".join(texts) or None
+        return content, _merge_stream_response(last_chunk, content)
+
+    def generate_text(
+        self, system_prompt: str, user_prompt: str, model_name: str
+    ) -> tuple[str, dict] | None:
         try:
             response = gemini_client.models.generate_content(
                 model=model_name,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    temperature=0,
-                ),
-                contents=[
-                    types.Part.from_bytes(
-                        data=pdf_path.read_bytes(),
-                        mime_type="application/pdf",
-                    ),
-                    user_prompt,
-                ],
+                config=_generate_content_config(system_prompt),
+                contents=[user_prompt],
             )
         except Exception as e:
-            logging.error(
-                f"Failed during Gemini API call for {pdf_path}: {e}", exc_info=True
-            )
+            logging.error(f"Failed during Gemini API call: {e}", exc_info=True)
             return None
+        return response.text, response.to_json_dict()
 
-        content = response.text
-        return content, response.to_json_dict()
+    def text_from_raw_response(self, raw_response: dict) -> str | None:
+        response = types.GenerateContentResponse.model_validate(raw_response)
+        return response.text
+
+
+def _merge_stream_response(
+    last_chunk: types.GenerateContentResponse, content: str | None
+) -> dict:
+    """
+    Builds a raw response equivalent to a non-streamed call: the last chunk
+    carries the finish reason and usage metadata, the text is the joined deltas.
+    """
+    raw_response = last_chunk.to_json_dict()
+    candidates = raw_response.get("candidates") or [{}]
+    candidates[0]["content"] = {
+        "role": "model",
+        "parts": [{"text": content}] if content else [],
+    }
+    raw_response["candidates"] = candidates
+    return raw_response
+
+
+_BATCH_COMPLETED_STATES = (
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+)
+_BATCH_FAILED_STATES = (
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+)
+
+
+class GeminiBatchClient(LLMBatchClient):
+    """LLMBatchClient for the Gemini Batch API with a JSONL input file."""
+
+    def __init__(
+        self, client: Client | None = None, file_cache: GeminiFileCache | None = None
+    ):
+        self.client = client or gemini_client
+        # PDFs are referenced through the File API to keep the input file small.
+        if file_cache is None:
+            file_cache = (
+                get_gemini_file_cache()
+                if client is None
+                else GeminiFileCache(client.files)
+            )
+        self.file_cache = file_cache
+
+    def request_line(self, request: BatchRequest) -> dict:
+        contents, _ = _pdf_contents(
+            request.pdf_path,
+            request.user_prompt,
+            request.page_numbers,
+            self.file_cache,
+        )
+        parts = [
+            {"text": content} if isinstance(content, str) else content.to_json_dict()
+            for content in contents
+        ]
+        generation_config: dict = {"temperature": 0}
+        if request.response_schema is not None:
+            generation_config["response_mime_type"] = "application/json"
+            generation_config["response_json_schema"] = (
+                request.response_schema.model_json_schema()
+            )
+        return {
+            "key": request.custom_id,
+            "request": {
+                "contents": [{"role": "user", "parts": parts}],
+                "system_instruction": {"parts": [{"text": request.system_prompt}]},
+                "generation_config": generation_config,
+            },
+        }
+
+    def submit(self, model_name: str, lines: list[dict], display_name: str) -> str:
+        input_file = self.client.files.upload(
+            file=io.BytesIO(to_jsonl(lines)),
+            config=types.UploadFileConfig(mime_type="jsonl", display_name=display_name),
+        )
+        job = self.client.batches.create(
+            model=model_name,
+            src=input_file.name,
+            config=types.CreateBatchJobConfig(display_name=display_name),
+        )
+        return job.name
+
+    def status(self, batch_id: str) -> BatchStatus:
+        job = self.client.batches.get(name=batch_id)
+        if job.state in _BATCH_COMPLETED_STATES:
+            return BatchStatus("completed", job.state.value)
+        if job.state in _BATCH_FAILED_STATES:
+            return BatchStatus("failed", job.error.message if job.error else None)
+        return BatchStatus("running", job.state.value if job.state else None)
+
+    def results(self, batch_id: str) -> dict[str, dict | None]:
+        job = self.client.batches.get(name=batch_id)
+        if job.dest is None or job.dest.file_name is None:
+            return {}
+        data = self.client.files.download(file=job.dest.file_name)
+        results: dict[str, dict | None] = {}
+        for line in data.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response")
+            # Normalized to the raw response form of `generate_from_pdf`.
+            results[item["key"]] = (
+                types.GenerateContentResponse.model_validate(response).to_json_dict()
+                if response is not None and "error" not in item
+                else None
+            )
+        return results
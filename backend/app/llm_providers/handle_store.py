@@ -0,0 +1,57 @@
+import json
+import logging
+import threading
+import time
+
+from redis import Redis, RedisError
+
+
+class HandleStore:
+    """
+    Short-lived handles to provider-side resources (uploaded files, context
+    caches), shared between workers through Redis with an in-process fallback
+    when Redis is unavailable. Entries expire after the TTL they were set with.
+    """
+
+    def __init__(self, prefix: str, redis: Redis | None = None):
+        self.prefix = prefix
+        self.redis = redis
+        self._local: dict[str, tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str) -> dict | None:
+        if self.redis is not None:
+            try:
+                value = self.redis.get(self._key(key))
+                return json.loads(value) if value else None
+            except RedisError as e:
+                logging.warning(f"{self.prefix} store unavailable: {e}")
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        if ttl < 1:
+            return
+        if self.redis is not None:
+            try:
+                self.redis.set(self._key(key), json.dumps(value), ex=int(ttl))
+                return
+            except RedisError as e:
+                logging.warning(f"{self.prefix} store unavailable: {e}")
+        with self._lock:
+            self._local[key] = (value, time.time() + ttl)
+
+    def delete(self, key: str) -> None:
+        if self.redis is not None:
+            try:
+                self.redis.delete(self._key(key))
+            except RedisError as e:
+                logging.warning(f"{self.prefix} store unavailable: {e}")
+        with self._lock:
+            self._local.pop(key, None)
@@ -1,11 +1,58 @@
+import asyncio
+import hashlib
+import io
+import json
 import logging
+from collections.abc import Callable
 from pathlib import Path
 
+from openai import OpenAI
+from openai.lib._parsing._responses import type_to_text_format_param
 from openai.types.responses import Response
+from pydantic import BaseModel
 
-from app.core.openai_client import openai_client
+from app.core.openai_client import async_openai_client, openai_client
 from app.llm_providers.base_provider import LLMProviderStrategy
-from app.pdf_analysis.utils import pdf_to_base64_image_strings
+from app.llm_providers.batch import BatchRequest, BatchStatus, LLMBatchClient, to_jsonl
+from app.pdf_analysis.rendering import PageRenderer
+
+
+def _image_contents(
+    pdf_path: Path, page_numbers: list[int] | None = None
+) -> list[dict]:
+    contents = []
+    for page_num, data_url in PageRenderer().iter_data_urls(pdf_path, page_numbers):
+        contents.append({"type": "input_text", "text": f"page_number: {page_num}"})
+        contents.append({"type": "input_image", "image_url": data_url})
+    return contents
+
+
+def _text_format(response_schema: type[BaseModel] | None) -> dict:
+    """
+    Request options for schema-constrained output, built by the SDK helper
+    behind `responses.parse(text_format=...)` so batch requests get the same
+    strict JSON schema. The root of the schema must be an object.
+    """
+    if response_schema is None:
+        return {}
+    return {"text": {"format": type_to_text_format_param(response_schema)}}
+
+
+def _prompt_cache_key(system_prompt: str) -> str:
+    """
+    Requests with the same key are routed to the same prompt cache. The static
+    developer and user prompts come first in the input, so requests sharing a
+    system prompt share the cached prefix.
+    """
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:32]
+
+
+def _response_input(system_prompt: str, user_prompt: str, contents: list) -> list:
+    return [
+        {"role": "developer", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+        {"role": "user", "content": contents},
+    ]
 
 
 class OpenAIProvider(LLMProviderStrategy):
@@ -20,6 +67,8 @@ class OpenAIProvider(LLMProviderStrategy):
         system_prompt: str,
         user_prompt: str,
         model_name: str,  # This is the actual_model_name, e.g., "gpt-4o"
+        page_numbers: list[int] | None = None,
+        response_schema: type[BaseModel] | None = None,
     ) -> tuple[str, dict] | None:
         """
         Generates content from a PDF using OpenAI API.
@@ -30,37 +79,26 @@ class OpenAIProvider(LLMProviderStrategy):
             system_prompt: The system prompt for OpenAI.
             user_prompt: The user prompt for OpenAI.
             model_name: The specific OpenAI model name (e.g., "gpt-4o").
+            page_numbers: Optional 1-based pages to send instead of every page.
+            response_schema: Optional Pydantic model the JSON response must follow.
 
         Returns:
             A tuple (content_text, raw_response_dict) or (None, error_dict).
         """
         try:
-            img_base64_list = pdf_to_base64_image_strings(pdf_path)
+            contents = _image_contents(pdf_path, page_numbers)
         except Exception as e:
             logging.error(f"Failed to convert PDF to images: {pdf_path} - {e}")
             return None
 
-        contents = []
-        for i, img_base64 in enumerate(img_base64_list):
-            page_num = i + 1
-            contents.append({"type": "input_text", "text": f"page_number: {page_num}"})
-            contents.append(
-                {
-                    "type": "input_image",
-                    "image_url": f"data:image/jpeg;base64,{img_base64}",
-                }
-            )
-
         try:
             response: Response = openai_client.responses.create(
                 model=model_name,
                 temperature=0.0,
                 top_p=1,
-                input=[
-                    {"role": "developer", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                    {"role": "user", "content": contents},
-                ],
+                input=_response_input(system_prompt, user_prompt, contents),
+                prompt_cache_key=_prompt_cache_key(system_prompt),
+                **_text_format(response_schema),
             )
             raw_response_dict = response.model_dump()
         except Exception as e:
@@ -72,3 +110,151 @@ class OpenAIProvider(LLMProviderStrategy):
 
         content = response.output_text
         return content, raw_response_dict
+
+    async def agenerate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        """
+        Generates content from a PDF using the async OpenAI API, streaming the
+        response when `on_chunk` is given.
+        """
+        try:
+            contents = await asyncio.to_thread(_image_contents, pdf_path, page_numbers)
+        except Exception as e:
+            logging.error(f"Failed to convert PDF to images: {pdf_path} - {e}")
+            return None
+
+        request = {
+            "model": model_name,
+            "temperature": 0.0,
+            "top_p": 1,
+            "input": _response_input(system_prompt, user_prompt, contents),
+            "prompt_cache_key": _prompt_cache_key(system_prompt),
+            **_text_format(response_schema),
+        }
+        try:
+            if on_chunk is None:
+                response: Response = await async_openai_client.responses.create(
+                    **request
+                )
+            else:
+                response = None
+                stream = await async_openai_client.responses.create(
+                    **request, stream=True
+                )
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        on_chunk(event.delta)
+                    elif event.type == "response.completed":
+                        response = event.response
+                if response is None:
+                    raise RuntimeError("Stream ended without a completed response.")
+            raw_response_dict = response.model_dump()
+        except Exception as e:
+            logging.error(
+                f"Failed during OpenAI API call for {pdf_path}: {e}",
+                exc_info=True,
+            )
+            return None
+
+        return response.output_text, raw_response_dict
+
+    def generate_text(
+        self, system_prompt: str, user_prompt: str, model_name: str
+    ) -> tuple[str, dict] | None:
+        try:
+            response: Response = openai_client.responses.create(
+                model=model_name,
+                temperature=0.0,
+                top_p=1,
+                input=[
+                    {"role": "developer", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                prompt_cache_key=_prompt_cache_key(system_prompt),
+            )
+        except Exception as e:
+            logging.error(f"Failed during OpenAI API call: {e}", exc_info=True)
+            return None
+        return response.output_text, response.model_dump()
+
+    def text_from_raw_response(self, raw_response: dict) -> str | None:
+        texts = [
+            part["text"]
+            for item in raw_response.get("output") or []
+            if item.get("type") == "message"
+            for part in item.get("content") or []
+            if part.get("type") == "output_text"
+        ]
+        return "".join(texts) if texts else None
+
+
+class OpenAIBatchClient(LLMBatchClient):
+    """LLMBatchClient for the OpenAI Batch API on the Responses endpoint."""
+
+    def __init__(self, client: OpenAI | None = None):
+        self.client = client or openai_client
+
+    def request_line(self, request: BatchRequest) -> dict:
+        contents = _image_contents(request.pdf_path, request.page_numbers)
+        return {
+            "custom_id": request.custom_id,
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": {
+                "model": request.model_name,
+                "temperature": 0.0,
+                "top_p": 1,
+                "input": _response_input(
+                    request.system_prompt, request.user_prompt, contents
+                ),
+                "prompt_cache_key": _prompt_cache_key(request.system_prompt),
+                **_text_format(request.response_schema),
+            },
+        }
+
+    def submit(self, model_name: str, lines: list[dict], display_name: str) -> str:
+        input_file = self.client.files.create(
+            file=(f"{display_name}.jsonl", io.BytesIO(to_jsonl(lines))),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+            metadata={"display_name": display_name},
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> BatchStatus:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status == "failed":
+            errors = batch.errors.data if batch.errors and batch.errors.data else []
+            return BatchStatus("failed", "; ".join(e.message or "" for e in errors))
+        # Expired and cancelled batches keep the results finished until then.
+        if batch.status in ("completed", "expired", "cancelled"):
+            return BatchStatus("completed", batch.status)
+        return BatchStatus("running", batch.status)
+
+    def results(self, batch_id: str) -> dict[str, dict | None]:
+        batch = self.client.batches.retrieve(batch_id)
+        results: dict[str, dict | None] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                results[item["custom_id"]] = (
+                    response.get("body") if response.get("status_code") == 200 else None
+                )
+        return results
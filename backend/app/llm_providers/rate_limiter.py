@@ -0,0 +1,330 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import BaseModel
+from redis import Redis, RedisError
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis_client, get_redis_client
+from app.llm_providers.base_provider import LLMProviderStrategy
+from app.llm_providers.usage import extract_token_usage
+
+KEY_PREFIX = "llm_rate_limit"
+
+# Refills both buckets for the elapsed time (Redis server clock, so every worker
+# agrees) and takes one request plus `cost` tokens if both buckets allow it.
+# Returns {wait_seconds, requests_left, tokens_left} as strings, since Lua
+# numbers are truncated to integers on the way out.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local dry_run = ARGV[4] == '1'
+
+local function refill(key, capacity)
+    local state = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, level + (now - ts) * capacity / 60)
+end
+
+local requests = refill(KEYS[1], rpm)
+local tokens = refill(KEYS[2], tpm)
+
+-- A request larger than the whole bucket is let through once it is full.
+local needed = math.min(cost, tpm)
+local wait = 0
+if requests < 1 then
+    wait = math.max(wait, (1 - requests) * 60 / rpm)
+end
+if tokens < needed then
+    wait = math.max(wait, (needed - tokens) * 60 / tpm)
+end
+
+if not dry_run then
+    if wait == 0 then
+        requests = requests - 1
+        tokens = tokens - cost
+    end
+    redis.call('HSET', KEYS[1], 'level', requests, 'ts', now)
+    redis.call('HSET', KEYS[2], 'level', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], 120)
+    redis.call('EXPIRE', KEYS[2], 120)
+end
+return {tostring(wait), tostring(requests), tostring(tokens)}
+"""
+
+# Corrects the token bucket once the real usage is known. A positive delta
+# consumes more tokens (the bucket may go into debt), a negative one refunds.
+_ADJUST_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tpm = tonumber(ARGV[1])
+local delta = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'level', 'ts')
+local level = tonumber(state[1]) or tpm
+local ts = tonumber(state[2]) or now
+level = math.min(tpm, level + (now - ts) * tpm / 60 - delta)
+redis.call('HSET', KEYS[1], 'level', level, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(level)
+"""
+
+
+class TokenBucketRateLimiter:
+    """
+    Requests/minute and tokens/minute token buckets kept in Redis, so every
+    Celery worker draws from the same provider quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        tpm: int,
+        redis: Redis | None = None,
+        async_redis: AsyncRedis | None = None,
+        max_wait: float | None = None,
+    ):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait or settings.LLM_RATE_LIMIT_MAX_WAIT
+        self.keys = [f"{KEY_PREFIX}:{name}:requests", f"{KEY_PREFIX}:{name}:tokens"]
+        self._redis = redis
+        self._async_redis = async_redis
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis_client()
+        return self._redis
+
+    @property
+    def async_redis(self) -> AsyncRedis:
+        return self._async_redis or get_async_redis_client()
+
+    def _args(self, tokens: int, dry_run: bool = False) -> list:
+        return [self.rpm, self.tpm, tokens, "1" if dry_run else "0"]
+
+    def _check_deadline(self, waited: float, wait: float) -> None:
+        if waited + wait > self.max_wait:
+            raise TimeoutError(
+                f"Rate limit for {self.name} not available within {self.max_wait}s"
+            )
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Blocks until one request and `tokens` tokens are available.
+
+        Returns:
+            The number of seconds spent waiting.
+
+        Raises:
+            TimeoutError: If the budget does not free up within `max_wait`.
+        """
+        script = self.redis.register_script(_ACQUIRE_SCRIPT)
+        waited = 0.0
+        while True:
+            wait, _, _ = script(keys=self.keys, args=self._args(tokens))
+            wait = float(wait)
+            if wait == 0:
+                return waited
+            self._check_deadline(waited, wait)
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self, tokens: int) -> float:
+        """Async variant of `acquire`."""
+        script = self.async_redis.register_script(_ACQUIRE_SCRIPT)
+        waited = 0.0
+        while True:
+            wait, _, _ = await script(keys=self.keys, args=self._args(tokens))
+            wait = float(wait)
+            if wait == 0:
+                return waited
+            self._check_deadline(waited, wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def reconcile(self, reserved: int, used: int) -> None:
+        """Charges the difference between the reserved and the reported tokens."""
+        if used and used != reserved:
+            script = self.redis.register_script(_ADJUST_SCRIPT)
+            script(keys=self.keys[1:], args=[self.tpm, used - reserved])
+
+    async def areconcile(self, reserved: int, used: int) -> None:
+        if used and used != reserved:
+            script = self.async_redis.register_script(_ADJUST_SCRIPT)
+            await script(keys=self.keys[1:], args=[self.tpm, used - reserved])
+
+    def budget(self) -> dict[str, float]:
+        """Current remaining requests and tokens, without consuming any."""
+        script = self.redis.register_script(_ACQUIRE_SCRIPT)
+        _, requests, tokens = script(keys=self.keys, args=self._args(0, dry_run=True))
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "requests_left": float(requests),
+            "tokens_left": float(tokens),
+        }
+
+
+_rate_limiters: dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(
+    provider_name: str, model_name: str
+) -> TokenBucketRateLimiter | None:
+    """
+    Returns the shared limiter for a provider model, or None if neither the
+    model nor its provider has limits configured in `LLM_RATE_LIMITS`.
+    """
+    name = f"{provider_name}/{model_name}"
+    if name not in _rate_limiters:
+        limits = settings.LLM_RATE_LIMITS.get(name) or settings.LLM_RATE_LIMITS.get(
+            provider_name
+        )
+        if not limits:
+            return None
+        _rate_limiters[name] = TokenBucketRateLimiter(
+            name, rpm=limits["rpm"], tpm=limits["tpm"]
+        )
+    return _rate_limiters[name]
+
+
+def get_rate_limit_budgets() -> dict[str, dict[str, float]]:
+    """
+    Reports the remaining budget of every provider model that has been rate
+    limited recently (bucket state expires two minutes after the last call).
+    """
+    redis = get_redis_client()
+    budgets = {}
+    for key in redis.scan_iter(match=f"{KEY_PREFIX}:*:requests"):
+        name = key.decode().removeprefix(f"{KEY_PREFIX}:").removesuffix(":requests")
+        provider_name, _, model_name = name.partition("/")
+        limiter = get_rate_limiter(provider_name, model_name)
+        if limiter is not None:
+            budgets[name] = limiter.budget()
+    return budgets
+
+
+class RateLimitedLLMProvider(LLMProviderStrategy):
+    """
+    LLMProviderStrategy decorator that waits for the shared per-model budget
+    before each call and charges the reported token usage afterwards.
+
+    Redis errors do not fail the call: the request goes through unthrottled.
+    """
+
+    def __init__(self, provider: LLMProviderStrategy, provider_name: str):
+        self.provider = provider
+        self.provider_name = provider_name
+        self.estimated_tokens = settings.LLM_RATE_LIMIT_ESTIMATED_TOKENS
+
+    def generate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        limiter = get_rate_limiter(self.provider_name, model_name)
+        if limiter is not None:
+            try:
+                waited = limiter.acquire(self.estimated_tokens)
+                if waited:
+                    logging.info(f"Waited {waited:.1f}s for {limiter.name} budget")
+            except RedisError as e:
+                logging.warning(f"Rate limiter unavailable, not throttling: {e}")
+                limiter = None
+
+        result = self.provider.generate_from_pdf(
+            pdf_path=pdf_path,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model_name=model_name,
+            page_numbers=page_numbers,
+            response_schema=response_schema,
+        )
+
+        if limiter is not None and result is not None:
+            used = extract_token_usage(result[1])["total_tokens"]
+            try:
+                limiter.reconcile(self.estimated_tokens, used)
+            except RedisError as e:
+                logging.warning(f"Failed to record token usage for {limiter.name}: {e}")
+        return result
+
+    async def agenerate_from_pdf(
+        self,
+        pdf_path: Path,
+        system_prompt: str,
+        user_prompt: str,
+        model_name: str,
+        page_numbers: list[int] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        response_schema: type[BaseModel] | None = None,
+    ) -> tuple[str, dict] | None:
+        limiter = get_rate_limiter(self.provider_name, model_name)
+        if limiter is not None:
+            try:
+                waited = await limiter.aacquire(self.estimated_tokens)
+                if waited:
+                    logging.info(f"Waited {waited:.1f}s for {limiter.name} budget")
+            except RedisError as e:
+                logging.warning(f"Rate limiter unavailable, not throttling: {e}")
+                limiter = None
+
+        result = await self.provider.agenerate_from_pdf(
+            pdf_path=pdf_path,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model_name=model_name,
+            page_numbers=page_numbers,
+            response_schema=response_schema,
+            on_chunk=on_chunk,
+        )
+
+        if limiter is not None and result is not None:
+            used = extract_token_usage(result[1])["total_tokens"]
+            try:
+                await limiter.areconcile(self.estimated_tokens, used)
+            except RedisError as e:
+                logging.warning(f"Failed to record token usage for {limiter.name}: {e}")
+        return result
+
+    def generate_text(
+        self, system_prompt: str, user_prompt: str, model_name: str
+    ) -> tuple[str, dict] | None:
+        limiter = get_rate_limiter(self.provider_name, model_name)
+        # Roughly one token per character for Korean text; an overestimate
+        # for the rest, corrected by `reconcile`.
+        estimated_tokens = len(system_prompt) + len(user_prompt)
+        if limiter is not None:
+            try:
+                limiter.acquire(estimated_tokens)
+            except RedisError as e:
+                logging.warning(f"Rate limiter unavailable, not throttling: {e}")
+                limiter = None
+
+        result = self.provider.generate_text(system_prompt, user_prompt, model_name)
+
+        if limiter is not None and result is not None:
+            used = extract_token_usage(result[1])["total_tokens"]
+            try:
+                limiter.reconcile(estimated_tokens, used)
+            except RedisError as e:
+                logging.warning(f"Failed to record token usage for {limiter.name}: {e}")
+        return result
+
+    def text_from_raw_response(self, raw_response: dict) -> str | None:
+        return self.provider.text_from_raw_response(raw_response)
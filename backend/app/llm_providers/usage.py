@@ -0,0 +1,63 @@
+def extract_token_usage(raw_response: dict | None) -> dict[str, int]:
+    """
+    Reads token usage from a raw Gemini or OpenAI response dictionary.
+
+    Returns:
+        A dict with input_tokens, output_tokens, total_tokens and cached_tokens
+        (the part of input_tokens served from a prompt cache); 0 when the
+        response carries no usage information.
+    """
+    raw_response = raw_response or {}
+
+    # Gemini: GenerateContentResponse.usage_metadata
+    gemini_usage = raw_response.get("usage_metadata")
+    if gemini_usage:
+        input_tokens = gemini_usage.get("prompt_token_count") or 0
+        output_tokens = (gemini_usage.get("candidates_token_count") or 0) + (
+            gemini_usage.get("thoughts_token_count") or 0
+        )
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": gemini_usage.get("total_token_count")
+            or input_tokens + output_tokens,
+            "cached_tokens": gemini_usage.get("cached_content_token_count") or 0,
+        }
+
+    # OpenAI: Response.usage
+    openai_usage = raw_response.get("usage")
+    if openai_usage:
+        input_tokens = openai_usage.get("input_tokens") or 0
+        output_tokens = openai_usage.get("output_tokens") or 0
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": openai_usage.get("total_tokens")
+            or input_tokens + output_tokens,
+            "cached_tokens": (openai_usage.get("input_tokens_details") or {}).get(
+                "cached_tokens"
+            )
+            or 0,
+        }
+
+    return {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "cached_tokens": 0,
+    }
+
+
+def extract_result_token_usage(raw_response: dict | None) -> dict[str, int]:
+    """
+    Like `extract_token_usage`, summed over the per-window responses of a
+    chunked extraction result.
+    """
+    chunks = (raw_response or {}).get("chunks")
+    if chunks is None:
+        return extract_token_usage(raw_response)
+    total = extract_token_usage(None)
+    for chunk in chunks:
+        for name, count in extract_token_usage(chunk["raw_response"]).items():
+            total[name] += count
+    return total
@@ -1,10 +1,17 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
+from app.api.deps import NEXT_CURSOR_HEADER
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db import get_mongodb_engine, init_db
+from app.services.view_counter import view_counter
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -12,8 +19,25 @@ def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{tag}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    engine = get_mongodb_engine()
+    await init_db(engine)
+    # Write-behind flush of announcement views (see ViewCounter).
+    flusher = asyncio.create_task(view_counter.run(engine))
+    yield
+    flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await flusher
+    try:
+        await view_counter.flush(engine)
+    except Exception as e:
+        logging.warning(f"Failed to flush announcement views on shutdown: {e}")
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
 )
@@ -44,6 +68,7 @@ if settings.all_cors_origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 
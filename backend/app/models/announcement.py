@@ -1,19 +1,20 @@
 from datetime import datetime, timezone
 
-from odmantic import Field, Model
+from odmantic import Field, Index, Model
 
 from app.enums import AnnouncementType
 
 
 class Announcement(Model):
-    id: str = Field(index=True, unique=True, primary_field=True)  # pblancId
+    id: str = Field(primary_field=True)  # pblancId
     raw_data: dict
+    raw_data_hash: str | None = None  # sha256 of the MyHome API fields
     house_serial_number: int  # houseSn
     status_name: str  # sttusNm
     announcement_name: str  # pblancNm
     supply_institution_name: str  # suplyInsttNm
-    house_type_name: str  # houseTyNm
-    supply_type_name: str  # suplyTyNm
+    house_type_name: str = Field(index=True)  # houseTyNm
+    supply_type_name: str = Field(index=True)  # suplyTyNm
     application_date: datetime  # rcritPblancDe
     winners_presentation_date: datetime  # przwnerPresnatnDe
     url: str  # url
@@ -27,10 +28,34 @@ class Announcement(Model):
     total_supply_count: int | None  # sumSuplyCo
     rent_guarantee: int | None  # rentGtn
     monthly_rent_charge: int | None  # mtRntchrg
-    begin_date: datetime | None  # beginDe
+    begin_date: datetime | None = Field(index=True)  # beginDe
     end_date: datetime | None  # endDe
     filename: str | None = None
+    pdf_hash: str | None = Field(default=None, index=True)  # sha256 of the PDF
     type: AnnouncementType
     view_count: int = Field(default=0)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    # https://art049.github.io/odmantic/modeling/
+    model_config = {
+        # Listings (AnnouncementListRequest) sort by application_date, end_date
+        # or view_count and then the ID, as the keyset pagination does. Each
+        # sort also has a province- and a district-filtered variant (equality
+        # before sort), so a region filter never needs a blocking sort; a
+        # filter on both uses the district one. The other filters use the
+        # single-field indexes.
+        "indexes": lambda: [
+            index
+            for sort_field in (
+                Announcement.application_date,
+                Announcement.end_date,
+                Announcement.view_count,
+            )
+            for index in (
+                Index(sort_field, Announcement.id),
+                Index(Announcement.province_name, sort_field, Announcement.id),
+                Index(Announcement.district_name, sort_field, Announcement.id),
+            )
+        ]
+    }
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from odmantic import Field, Index, Model
+
+from app.enums import BlockType
+
+
+class Block(Model):
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_field=True)
+    announcement_id: str
+    page: int
+    bbox: list[float]  # [x1, y1, x2, y2] normalized coordinates [0, 1]
+    type: BlockType
+    confidence: float
+    model: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    # https://art049.github.io/odmantic/modeling/
+    model_config = {"indexes": lambda: [Index(Block.announcement_id, Block.page)]}
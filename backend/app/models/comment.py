@@ -1,13 +1,11 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from odmantic import Field, Model
+from odmantic import Field, Index, Model
 
 
 class Comment(Model):
-    id: str = Field(
-        default_factory=lambda: str(uuid4()), index=True, primary_field=True
-    )
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_field=True)
     question_id: str
     user_id: str
     content: str = Field(..., min_length=1, max_length=1000)
@@ -15,3 +13,8 @@ class Comment(Model):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     upvotes: int = 0
     is_deleted: bool = Field(default=False, index=True)
+
+    model_config = {
+        # Keyset pagination of a question's comments (oldest first).
+        "indexes": lambda: [Index(Comment.question_id, Comment.created_at, Comment.id)]
+    }
@@ -1,13 +1,11 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from odmantic import Field, Model
+from odmantic import Field, Index, Model
 
 
 class Condition(Model):
-    id: str = Field(
-        default_factory=lambda: str(uuid4()), index=True, primary_field=True
-    )
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_field=True)
     original_id: str | None = Field(default=None, index=True)
     llm_output_id: str | None = Field(default=None, index=True)
     announcement_id: str = Field(index=True)
@@ -22,3 +20,9 @@ class Condition(Model):
     is_deleted: bool = Field(default=False, index=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    # https://art049.github.io/odmantic/modeling/
+    model_config = {
+        # Serves the per-user overlay of an announcement (originals + one user).
+        "indexes": lambda: [Index(Condition.announcement_id, Condition.user_id)]
+    }
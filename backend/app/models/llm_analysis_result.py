@@ -9,6 +9,12 @@ class LLMAnalysisResult(Model):
     announcement_id: str = Field(index=True)
     model: str
     raw_response: dict
+    # Whether the provider's schema-constrained output mode was used, and how
+    # many malformed conditions in the response needed a repair call.
+    structured_output: bool = False
+    repair_count: int = 0
+    # Per repair call: model, kind, error, latency (s), token usage, outcome
+    repair_attempts: list[dict] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     # https://art049.github.io/odmantic/modeling/
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from odmantic import Field, Model
+
+
+class LLMBatchJob(Model):
+    """A batch of extraction requests submitted to a provider's batch API."""
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_field=True)
+    provider: str
+    model: str  # model identifier, e.g. "openai/gpt-4.1"
+    batch_id: str = Field(index=True)  # the provider's batch ID
+    status: str = Field(default="running", index=True)  # running/completed/failed
+    detail: str | None = None
+    structured_output: bool = False
+    # Per request: custom_id, announcement_id, pages (None for the whole PDF)
+    requests: list[dict]
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    completed_at: datetime | None = None
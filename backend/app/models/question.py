@@ -1,13 +1,11 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from odmantic import Field, Model
+from odmantic import Field, Index, Model
 
 
 class Question(Model):
-    id: str = Field(
-        default_factory=lambda: str(uuid4()), index=True, primary_field=True
-    )
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_field=True)
     title: str = Field(..., min_length=1, max_length=150)
     content: str = Field(..., min_length=1)
     user_id: str
@@ -16,3 +14,10 @@ class Question(Model):
     upvotes: int = 0
     views: int = 0  # expandable panel?
     is_deleted: bool = Field(default=False, index=True)
+
+    model_config = {
+        # Keyset pagination of the question listing (newest first).
+        "indexes": lambda: [
+            Index(Question.is_deleted, Question.created_at, Question.id)
+        ]
+    }
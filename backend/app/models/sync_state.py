@@ -0,0 +1,10 @@
+from datetime import datetime, timezone
+
+from odmantic import Field, Model
+
+
+class SyncState(Model):
+    id: str = Field(primary_field=True)  # brtcCode
+    last_application_date: str | None = None  # rcritPblancDe (YYYYMMDD)
+    last_announcement_id: str | None = None  # pblancId
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
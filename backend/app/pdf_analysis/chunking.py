@@ -0,0 +1,103 @@
+import re
+from collections.abc import Iterable
+
+from app.enums import BlockType
+from app.schemas.block import BlockBase
+
+_WHITESPACE = re.compile(r"\s+")
+
+# A title block starting in the top part of a page is taken as the start of a
+# new section.
+SECTION_TITLE_MAX_Y = 0.3
+
+
+def section_start_pages(blocks: Iterable[BlockBase]) -> list[int]:
+    """Pages on which a section starts, according to the layout TITLE blocks."""
+    return sorted(
+        {
+            block.page
+            for block in blocks
+            if block.type == BlockType.TITLE and block.bbox[1] <= SECTION_TITLE_MAX_Y
+        }
+    )
+
+
+def make_page_windows(
+    page_numbers: list[int],
+    window_size: int,
+    overlap: int = 0,
+    section_starts: list[int] | None = None,
+) -> list[list[int]]:
+    """
+    Splits the pages into windows of at most `window_size` pages.
+
+    Without `section_starts`, windows are fixed-size and consecutive windows
+    share `overlap` pages so conditions spanning a boundary are seen whole.
+    With `section_starts`, windows are packed greedily from whole sections and
+    only a section longer than `window_size` is cut (with overlap).
+    """
+    if not page_numbers:
+        return []
+    step = max(1, window_size - overlap)
+
+    def _fixed(pages: list[int]) -> list[list[int]]:
+        windows = []
+        for start in range(0, len(pages), step):
+            windows.append(pages[start : start + window_size])
+            if start + window_size >= len(pages):
+                break
+        return windows
+
+    if not section_starts:
+        return _fixed(page_numbers)
+
+    starts = set(section_starts)
+    sections: list[list[int]] = []
+    for page_number in page_numbers:
+        if not sections or page_number in starts:
+            sections.append([])
+        sections[-1].append(page_number)
+
+    windows: list[list[int]] = []
+    current: list[int] = []
+    for section in sections:
+        if len(section) > window_size:
+            if current:
+                windows.append(current)
+                current = []
+            windows.extend(_fixed(section))
+        elif len(current) + len(section) > window_size:
+            windows.append(current)
+            current = list(section)
+        else:
+            current.extend(section)
+    if current:
+        windows.append(current)
+    return windows
+
+
+def _condition_key(condition: dict) -> tuple[str, int]:
+    return _WHITESPACE.sub("", condition["content"] or ""), condition["page"]
+
+
+def merge_category_maps(
+    category_maps: Iterable[dict[str, list[dict]]],
+) -> dict[str, list[dict]]:
+    """
+    Merges per-window category -> conditions maps in window order, dropping
+    conditions with the same content on the same page (e.g. from overlapping
+    windows) within a category.
+    """
+    merged: dict[str, list[dict]] = {}
+    seen: dict[str, set[tuple[str, int]]] = {}
+    for category_map in category_maps:
+        for category, conditions in category_map.items():
+            merged.setdefault(category, [])
+            seen.setdefault(category, set())
+            for condition in conditions:
+                key = _condition_key(condition)
+                if key in seen[category]:
+                    continue
+                seen[category].add(key)
+                merged[category].append(condition)
+    return merged
@@ -1,13 +1,16 @@
+from collections.abc import Callable
 from typing import Any
 
 from app.models.announcement import Announcement
 from app.pdf_analysis.strategies.base import PDFInformationExtractionStrategy
+from app.schemas.block import BlockBase
 
 
 def extract_information(
     announcement: Announcement,
     strategy: PDFInformationExtractionStrategy,
     model_identifier: str = "gemini/gemini-2.5-pro-preview-05-06",
+    blocks: list[BlockBase] | None = None,
 ) -> Any:
     """
     Analyzes a PDF using a specified strategy.
@@ -16,10 +19,30 @@ def extract_information(
         pdf_path: Path to the PDF file.
         strategy: The analysis strategy instance to use.
         model: The OpenAI model to use for analysis (passed to the strategy).
+        blocks: The stored layout blocks of the announcement, if any.
 
     Returns:
         An AnalysisOutput object containing the status and result/error.
     """
     return strategy.analyze(
-        announcement=announcement, model_identifier=model_identifier
+        announcement=announcement, model_identifier=model_identifier, blocks=blocks
+    )
+
+
+async def aextract_information(
+    announcement: Announcement,
+    strategy: PDFInformationExtractionStrategy,
+    model_identifier: str = "gemini/gemini-2.5-pro-preview-05-06",
+    on_chunk: Callable[[str], None] | None = None,
+    blocks: list[BlockBase] | None = None,
+) -> Any:
+    """
+    Async variant of `extract_information`; `on_chunk` receives streamed text
+    deltas of the LLM response.
+    """
+    return await strategy.aanalyze(
+        announcement=announcement,
+        model_identifier=model_identifier,
+        on_chunk=on_chunk,
+        blocks=blocks,
     )
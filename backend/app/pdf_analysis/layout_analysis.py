@@ -0,0 +1,152 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import fitz
+import torch
+from doclayout_yolo import YOLOv10
+from PIL import Image
+
+from app.core.blob_store import pdf_blob_store
+from app.core.config import settings
+from app.pdf_analysis.layout_parsers import (
+    LAYOUT_MODEL_FILENAME,
+    get_layout_model_path,
+    parse_layout_result,
+)
+from app.pdf_analysis.rendering import PageRenderer, RenderSettings
+from app.schemas.block import BlockBase
+
+
+class LayoutAnalyzer:
+    """
+    Detects layout blocks on PDF pages with a resident DocLayout-YOLO model,
+    running CPU inference over `batch_size` pages at a time.
+
+    Blocks are cached on disk per (PDF content hash, page) and detection
+    settings, so the layout of a document is computed only once.
+    """
+
+    def __init__(
+        self,
+        model: YOLOv10,
+        cache_dir: Path | None = None,
+        batch_size: int | None = None,
+        image_size: int | None = None,
+        confidence: float | None = None,
+        renderer: PageRenderer | None = None,
+    ):
+        self.model = model
+        self.model_name = model._get_name()
+        self.cache_dir = cache_dir or settings.LAYOUT_CACHE_DIR
+        self.batch_size = batch_size or settings.LAYOUT_BATCH_SIZE
+        self.image_size = image_size or settings.LAYOUT_IMAGE_SIZE
+        self.confidence = (
+            confidence if confidence is not None else settings.LAYOUT_CONFIDENCE
+        )
+        self.renderer = renderer or PageRenderer(
+            render=RenderSettings(
+                dpi=settings.LAYOUT_RENDER_DPI, image_format="png", quality=0
+            )
+        )
+        # Cached blocks are only valid for the settings they were detected with.
+        self._settings_key = hashlib.sha256(
+            f"{LAYOUT_MODEL_FILENAME}:{self.image_size}:{self.confidence}:"
+            f"{self.renderer.render.dpi}".encode()
+        ).hexdigest()[:12]
+        # One inference at a time; torch already uses all configured threads.
+        self._lock = threading.Lock()
+
+    def _cache_path(self, pdf_hash: str, page_number: int) -> Path:
+        return (
+            self.cache_dir
+            / pdf_hash[:2]
+            / pdf_hash
+            / f"{page_number:04d}-{self._settings_key}.json"
+        )
+
+    def _read_cache(self, path: Path) -> list[BlockBase] | None:
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logging.warning(f"Ignoring corrupt layout cache {path}: {e}")
+            return None
+        return [BlockBase.model_validate(block) for block in data]
+
+    def _write_cache(self, path: Path, blocks: list[BlockBase]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump([block.model_dump(mode="json") for block in blocks], f)
+        os.replace(tmp_path, path)
+
+    def analyze(
+        self, pdf_path: Path, page_numbers: Iterable[int] | None = None
+    ) -> list[BlockBase]:
+        """
+        Returns the layout blocks of the requested 1-based pages, or of every
+        page if `page_numbers` is None, in page order.
+        """
+        pdf_hash = pdf_blob_store.digest_for_path(pdf_path)
+        if page_numbers is None:
+            with fitz.open(pdf_path) as doc:
+                page_numbers = range(1, doc.page_count + 1)
+        page_numbers = list(page_numbers)
+
+        blocks_by_page: dict[int, list[BlockBase]] = {}
+        missing = []
+        for page_number in page_numbers:
+            cached = self._read_cache(self._cache_path(pdf_hash, page_number))
+            if cached is None:
+                missing.append(page_number)
+            else:
+                blocks_by_page[page_number] = cached
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            images = [
+                Image.open(io.BytesIO(data)).convert("RGB")
+                for _, data in self.renderer.iter_pages(pdf_path, batch)
+            ]
+            with self._lock:
+                results = self.model.predict(
+                    images,
+                    imgsz=self.image_size,
+                    conf=self.confidence,
+                    device="cpu",
+                    verbose=False,
+                )
+            for page_number, det_res in zip(batch, results, strict=True):
+                blocks = parse_layout_result(det_res, page_number, self.model_name)
+                self._write_cache(self._cache_path(pdf_hash, page_number), blocks)
+                blocks_by_page[page_number] = blocks
+
+        if missing:
+            logging.info(f"Detected layout of {len(missing)} pages of {pdf_path}")
+        return [block for n in page_numbers for block in blocks_by_page[n]]
+
+
+_layout_analyzer: LayoutAnalyzer | None = None
+_layout_analyzer_lock = threading.Lock()
+
+
+def get_layout_analyzer() -> LayoutAnalyzer:
+    """Returns the layout analyzer of this process, loading the model once."""
+    global _layout_analyzer
+    with _layout_analyzer_lock:
+        if _layout_analyzer is None:
+            torch.set_num_threads(settings.LAYOUT_THREADS)
+            _layout_analyzer = LayoutAnalyzer(YOLOv10(get_layout_model_path()))
+            logging.info(
+                f"Loaded layout model with {settings.LAYOUT_THREADS} threads, "
+                f"batch size {settings.LAYOUT_BATCH_SIZE}"
+            )
+    return _layout_analyzer
@@ -4,21 +4,19 @@ from huggingface_hub import hf_hub_download
 from app.enums import BlockType
 from app.schemas.block import BlockBase
 
+LAYOUT_MODEL_REPO_ID = "juliozhao/DocLayout-YOLO-DocStructBench"
+LAYOUT_MODEL_FILENAME = "doclayout_yolo_docstructbench_imgsz1024.pt"
+
 
 def get_layout_model_path() -> str:
     """Downloads and returns the path to the layout model weights."""
-    return hf_hub_download(
-        repo_id="juliozhao/DocLayout-YOLO-DocStructBench",
-        filename="doclayout_yolo_docstructbench_imgsz1024.pt",
-    )
+    return hf_hub_download(repo_id=LAYOUT_MODEL_REPO_ID, filename=LAYOUT_MODEL_FILENAME)
 
 
-def parse_layout_from_image(image, page_num: int, model: YOLOv10) -> list[BlockBase]:
-    """Parses layout blocks from an image using a pre-initialized YOLOv10 model."""
-    det_res = model.predict(image)
-    boxes = det_res[0].boxes
+def parse_layout_result(det_res, page_num: int, model_name: str) -> list[BlockBase]:
+    """Converts the detections of one page image to layout blocks."""
     blocks = []
-    for box in boxes:
+    for box in det_res.boxes:
         bbox = box.xyxyn[0].tolist()
         confidence = box.conf[0].item()
         type_id = int(box.cls[0].item())
@@ -27,7 +25,13 @@ def parse_layout_from_image(image, page_num: int, model: YOLOv10) -> list[BlockB
             page=page_num,
             bbox=bbox,
             confidence=confidence,
-            model=model._get_name(),
+            model=model_name,
         )
         blocks.append(block)
     return blocks
+
+
+def parse_layout_from_image(image, page_num: int, model: YOLOv10) -> list[BlockBase]:
+    """Parses layout blocks from an image using a pre-initialized YOLOv10 model."""
+    det_res = model.predict(image)
+    return parse_layout_result(det_res[0], page_num, model._get_name())
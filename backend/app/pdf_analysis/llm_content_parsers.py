@@ -1,94 +1,221 @@
 import json
 import logging
-from typing import TypeVar
+import threading
+import time
+from typing import Any, TypeVar
 
 from pydantic import BaseModel, TypeAdapter, ValidationError
 
-from app.core.openai_client import openai_client
+from app.core.config import settings
+from app.llm_providers.base_provider import LLMProviderStrategy
+from app.llm_providers.usage import extract_token_usage
 
 T = TypeVar("T", bound=BaseModel)
 
+REPAIR_SYSTEM_PROMPT = (
+    "You fix malformed JSON produced by another model. Change as little as "
+    "possible, keep all text values unchanged, and output only the corrected "
+    "JSON text without code fences or explanations."
+)
+
+SYNTAX_REPAIR_PROMPT = """\
+This excerpt of a larger JSON document has a syntax error ({error}) at character \
+{offset} of the excerpt. Return only the corrected excerpt. It is put back in \
+place of the original, so keep brackets that belong to the surrounding document \
+unbalanced as they are.
+
+{excerpt}"""
+
+VALIDATION_REPAIR_PROMPT = """\
+This JSON value does not match its expected schema:
+{errors}
+
+Return only the corrected JSON value.
+
+{value}"""
+
+
+class RepairBudget:
+    """
+    Token budget shared by all repair calls made for one LLM result, with a
+    record of every attempt (tokens, latency, outcome). Safe to share between
+    threads.
+    """
+
+    def __init__(self, max_tokens: int | None = None):
+        self.max_tokens = (
+            max_tokens if max_tokens is not None else settings.LLM_REPAIR_MAX_TOKENS
+        )
+        self.spent_tokens = 0
+        self.attempts: list[dict] = []
+        self._lock = threading.Lock()
+
+    def allows(self, estimated_tokens: int) -> bool:
+        return self.spent_tokens + estimated_tokens <= self.max_tokens
+
+    def record(self, attempt: dict) -> None:
+        with self._lock:
+            self.spent_tokens += attempt["total_tokens"]
+            self.attempts.append(attempt)
+
+
+def _strip_code_fence(content: str) -> str:
+    cleaned = content.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[len("```json") :]
+    elif cleaned.startswith("```"):
+        cleaned = cleaned[len("```") :]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[: -len("```")]
+    return cleaned.strip()
+
+
+def _get_path(data: Any, path: tuple) -> Any:
+    for key in path:
+        data = data[key]
+    return data
+
+
+def _error_object_path(data: Any, loc: tuple) -> tuple:
+    """Path of the innermost JSON object that contains the error location."""
+    path = loc[:-1]
+    while path:
+        try:
+            if isinstance(_get_path(data, path), dict):
+                return path
+        except (KeyError, IndexError, TypeError):
+            pass
+        path = path[:-1]
+    return ()
+
+
+def _syntax_repair(text: str, error: json.JSONDecodeError) -> tuple[str, int, int]:
+    """Prompt for the window around a JSON syntax error and its span in `text`."""
+    context = settings.LLM_REPAIR_CONTEXT_CHARS
+    start = max(0, error.pos - context)
+    end = min(len(text), error.pos + context)
+    prompt = SYNTAX_REPAIR_PROMPT.format(
+        error=error.msg, offset=error.pos - start, excerpt=text[start:end]
+    )
+    return prompt, start, end
+
+
+def _validation_repair(data: Any, error: ValidationError) -> tuple[str, tuple]:
+    """Prompt for the JSON object holding the first validation error."""
+    errors = error.errors()
+    path = _error_object_path(data, tuple(errors[0]["loc"]))
+    messages = [
+        f"- {'.'.join(map(str, e['loc'][len(path) :])) or '(value)'}: {e['msg']}"
+        for e in errors
+        if tuple(e["loc"][: len(path)]) == path
+    ]
+    prompt = VALIDATION_REPAIR_PROMPT.format(
+        errors="\n".join(messages),
+        value=json.dumps(_get_path(data, path), ensure_ascii=False),
+    )
+    return prompt, path
+
 
 def parse_and_validate_llm_response(
     content: str,
     validation_model: type[BaseModel] | type[list[BaseModel]],
-    model: str = "gpt-4.1-mini",
-    max_retries: int = 3,
+    provider: LLMProviderStrategy | None = None,
+    model_name: str | None = None,
+    max_retries: int | None = None,
+    budget: RepairBudget | None = None,
 ) -> BaseModel | list[BaseModel]:
     """
-    Parses the content from an OpenAI response, validates it against a Pydantic model
-    (or a list of Pydantic models) using TypeAdapter, and attempts to fix errors
-    by re-prompting the LLM up to max_retries times.
-    Returns the Pydantic model instance (or list of instances).
-    """
-    last_error = None
-    previous_response_id = None
+    Parses LLM output and validates it against a Pydantic model (or a list of
+    models) using TypeAdapter. Errors are repaired with `provider`, sending
+    only the neighbourhood of a syntax error or the JSON object that fails
+    validation, and splicing the corrected part back in.
 
-    # Prepare a TypeAdapter once
-    adapter = TypeAdapter(validation_model)
-
-    for attempt in range(1, max_retries + 1):
-        try:
-            # Extract and clean the raw JSON text
-            cleaned = content.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[len("```json") :]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[: -len("```")]
-            cleaned = cleaned.strip()
+    Args:
+        content: The LLM output.
+        validation_model: The expected type.
+        provider: The provider to repair with; without one, errors are raised
+            immediately.
+        model_name: The model used for repair calls.
+        max_retries: Maximum repair calls. Defaults to `LLM_REPAIR_MAX_ATTEMPTS`.
+        budget: Token budget that repair calls count against and are recorded
+            in; repairs stop early once it would be exceeded.
 
-            # 1) Load into Python primitives
-            raw_data = json.loads(cleaned)
+    Returns:
+        The validated instance (or list of instances).
 
-            # 2) Validate & convert with TypeAdapter
-            validated_instance = adapter.validate_python(raw_data)
+    Raises:
+        RuntimeError: If the content is still invalid when repairs run out.
+    """
+    if max_retries is None:
+        max_retries = settings.LLM_REPAIR_MAX_ATTEMPTS
+    if budget is None:
+        budget = RepairBudget()
+    adapter = TypeAdapter(validation_model)
+    text = _strip_code_fence(content)
+    last_attempt = None
+    repair_calls = 0
 
-            logging.info(f"Parsed & validated on attempt {attempt}")
+    for attempt in range(max_retries + 1):
+        data = None
+        try:
+            data = json.loads(text)
+            validated_instance = adapter.validate_python(data)
+            if last_attempt is not None:
+                last_attempt["succeeded"] = True
             return validated_instance
-
-        except (json.JSONDecodeError, ValidationError) as e:
+        except json.JSONDecodeError as e:
             last_error = e
-            logging.warning(f"Attempt {attempt}/{max_retries} failed: {e}")
-            if attempt == max_retries:
-                logging.error("Exceeded max retries parsing/validation.")
-                break
-
-            # Ask LLM to fix its JSON output
-            fix_prompt = (
-                "The previous parsing resulted in an error: {e}. "
-                "Please review and output only a corrected JSON object."
-            )
-            try:
-                response = openai_client.responses.create(
-                    model=model,
-                    temperature=0.0,
-                    top_p=1,
-                    previous_response_id=previous_response_id,
-                    input=[
-                        {"role": "user", "content": fix_prompt},
-                        {"role": "user", "content": content},
-                    ],
-                )
-                previous_response_id = response.id
-                content = response.output_text
-                if not content:
-                    raise RuntimeError(
-                        f"LLM correction attempt {attempt} returned no content."
-                    )
-
-            except Exception as api_err:
-                last_error = api_err
-                logging.error(f"API error during correction attempt: {api_err}")
-                if attempt == max_retries:
-                    logging.error("Exceeded max retries due to API errors.")
-                # continue to next attempt
-
-        except Exception as e:
+            prompt, start, end = _syntax_repair(text, e)
+            kind = "syntax"
+        except ValidationError as e:
             last_error = e
-            logging.error(f"Unexpected error on attempt {attempt}: {e}", exc_info=True)
-            if attempt == max_retries:
-                logging.error("Exceeded max retries due to unexpected error.")
+            prompt, path = _validation_repair(data, e)
+            kind = "validation"
+
+        logging.warning(f"Attempt {attempt + 1}/{max_retries + 1} failed: {last_error}")
+        if provider is None or attempt == max_retries:
+            break
+        # Prompt characters approximate the input tokens of the repair call.
+        if not budget.allows(len(REPAIR_SYSTEM_PROMPT) + len(prompt)):
+            logging.error(
+                f"Repair budget exhausted ({budget.spent_tokens}/{budget.max_tokens} tokens)"
+            )
+            break
+
+        repair_calls += 1
+        started = time.monotonic()
+        result = provider.generate_text(REPAIR_SYSTEM_PROMPT, prompt, model_name)
+        latency = time.monotonic() - started
+        repaired, raw_response = result if result is not None else (None, None)
+        last_attempt = {
+            "model": model_name,
+            "kind": kind,
+            "error": str(last_error)[:500],
+            "latency": round(latency, 3),
+            **extract_token_usage(raw_response),
+            "succeeded": False,
+        }
+        budget.record(last_attempt)
+        if not repaired:
+            logging.error(f"Repair attempt {attempt + 1} returned no content.")
+            continue
+
+        repaired = _strip_code_fence(repaired)
+        if kind == "syntax":
+            text = text[:start] + repaired + text[end:]
+            continue
+        try:
+            value = json.loads(repaired)
+        except json.JSONDecodeError as e:
+            logging.warning(f"Repair attempt {attempt + 1} returned invalid JSON: {e}")
+            continue
+        if path:
+            _get_path(data, path[:-1])[path[-1]] = value
+        else:
+            data = value
+        text = json.dumps(data, ensure_ascii=False)
 
     raise RuntimeError(
-        f"Failed to parse and validate after {max_retries} attempts. Last error: {last_error}"
+        f"Failed to parse and validate after {repair_calls} repair attempt(s). "
+        f"Last error: {last_error}"
     )
@@ -0,0 +1,158 @@
+import math
+import re
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+from typing import NamedTuple
+
+import fitz
+
+from app.core.config import settings
+from app.enums import BlockType
+from app.pdf_analysis.prompts import PUBLIC_LEASE_DEVELOPER_PROMPT
+from app.schemas.block import BlockBase
+
+# `"field": "...", "aliases": [...]` entries of the field template embedded in
+# the developer prompts. The template is not strict JSON, so it is not parsed
+# as such.
+_FIELD_PATTERN = re.compile(
+    r'"field":\s*"(?P<field>[^"]+)",\s*"aliases":\s*\[(?P<aliases>[^\]]*)\]'
+)
+_WHITESPACE = re.compile(r"\s+")
+
+# Pages with less extractable text than this are likely scanned images and
+# cannot be scored, so they are always kept.
+MIN_TEXT_LENGTH = 50
+
+BLOCK_TYPE_WEIGHTS = {
+    BlockType.TABLE: 0.3,
+    BlockType.TITLE: 0.2,
+    BlockType.TABLE_CAPTION: 0.1,
+    BlockType.TABLE_FOOTNOTE: 0.1,
+    BlockType.PLAIN_TEXT: 0.02,
+}
+MAX_BLOCK_BONUS = 1.0
+
+
+class PageScore(NamedTuple):
+    page_number: int
+    score: float
+    fields: frozenset[str]
+    has_text: bool
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub("", text)
+
+
+def parse_field_aliases(prompt: str) -> dict[str, list[str]]:
+    """Extracts {field: [field, *aliases]} from a prompt's field template."""
+    field_aliases = {}
+    for match in _FIELD_PATTERN.finditer(prompt):
+        aliases = re.findall(r'"([^"]+)"', match["aliases"])
+        field_aliases[match["field"]] = [match["field"], *aliases]
+    return field_aliases
+
+
+@cache
+def get_public_lease_field_aliases() -> dict[str, list[str]]:
+    return parse_field_aliases(PUBLIC_LEASE_DEVELOPER_PROMPT)
+
+
+def score_pages(
+    pdf_path: Path,
+    field_aliases: dict[str, list[str]],
+    blocks: Iterable[BlockBase] | None = None,
+) -> list[PageScore]:
+    """
+    Scores every page by the number of distinct fields whose aliases appear in
+    its text, with small bonuses for the number of alias hits and for layout
+    blocks (tables, titles) that usually carry conditions.
+    """
+    normalized_aliases = {
+        field: [_normalize(alias) for alias in aliases]
+        for field, aliases in field_aliases.items()
+    }
+    block_bonus: dict[int, float] = {}
+    for block in blocks or []:
+        bonus = block_bonus.get(block.page, 0.0) + BLOCK_TYPE_WEIGHTS.get(
+            block.type, 0.0
+        )
+        block_bonus[block.page] = min(bonus, MAX_BLOCK_BONUS)
+
+    scores = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            page_number = page.number + 1
+            text = _normalize(page.get_text())
+            hits = {
+                field: sum(text.count(alias) for alias in aliases)
+                for field, aliases in normalized_aliases.items()
+            }
+            fields = frozenset(field for field, count in hits.items() if count)
+            score = (
+                len(fields)
+                + 0.25 * math.log1p(sum(hits.values()))
+                + block_bonus.get(page_number, 0.0)
+            )
+            scores.append(
+                PageScore(
+                    page_number=page_number,
+                    score=score,
+                    fields=fields,
+                    has_text=len(text) >= MIN_TEXT_LENGTH,
+                )
+            )
+    return scores
+
+
+def select_pages(
+    scores: list[PageScore],
+    keep_ratio: float | None = None,
+    min_pages: int | None = None,
+) -> list[int]:
+    """
+    Chooses the pages to send to the LLM.
+
+    The first page, pages without extractable text and the best page for each
+    field are always kept; the remaining budget
+    (max(min_pages, ceil(keep_ratio * page_count))) is filled by score.
+
+    Returns:
+        The selected 1-based page numbers in document order.
+    """
+    keep_ratio = (
+        keep_ratio if keep_ratio is not None else settings.PAGE_PRUNING_KEEP_RATIO
+    )
+    min_pages = min_pages if min_pages is not None else settings.PAGE_PRUNING_MIN_PAGES
+    budget = max(min_pages, math.ceil(len(scores) * keep_ratio))
+    if len(scores) <= budget:
+        return [s.page_number for s in scores]
+
+    selected = {scores[0].page_number}
+    selected.update(s.page_number for s in scores if not s.has_text)
+
+    best_page: dict[str, PageScore] = {}
+    for s in scores:
+        for field in s.fields:
+            if field not in best_page or s.score > best_page[field].score:
+                best_page[field] = s
+    selected.update(s.page_number for s in best_page.values())
+
+    for s in sorted(scores, key=lambda s: s.score, reverse=True):
+        if len(selected) >= budget:
+            break
+        selected.add(s.page_number)
+
+    return sorted(selected)
+
+
+def page_recall(selected_pages: Iterable[int], condition_pages: list[int]) -> float:
+    """
+    Fraction of conditions whose page is among the selected pages. Used to tune
+    the pruning cutoff against conditions extracted from full documents.
+    """
+    if not condition_pages:
+        return 1.0
+    selected = set(selected_pages)
+    return sum(page in selected for page in condition_pages) / len(condition_pages)
@@ -139,3 +139,7 @@ PUBLIC_LEASE_USER_PROMPT = """
 이미지는 실제 문서의 페이지 순서대로 제공되며,
 각 문서의 표, 각주, 괄호 안 작은 글씨까지 모두 중요한 정보이니 절대 누락하지 말고 가능한 한 세부적으로 분석해주세요.
 """
+
+PRUNED_PAGES_NOTE = """
+문서의 일부 페이지만 제공됩니다. 각 페이지 앞의 page_number는 원문 문서의 페이지 번호이므로, page 값에는 반드시 이 번호를 사용하세요.
+"""
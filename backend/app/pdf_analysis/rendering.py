@@ -0,0 +1,164 @@
+import io
+import multiprocessing
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import fitz
+from PIL import Image
+
+from app.core.blob_store import pdf_blob_store
+from app.core.config import settings
+from app.pdf_analysis.utils import bytes_to_base64_string
+
+_MIME_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp", "png": "image/png"}
+_EXTENSIONS = {"jpeg": "jpg", "webp": "webp", "png": "png"}
+
+
+class RenderSettings(NamedTuple):
+    dpi: int
+    image_format: str
+    quality: int
+
+    @classmethod
+    def default(cls) -> "RenderSettings":
+        return cls(
+            dpi=settings.PDF_RENDER_DPI,
+            image_format=settings.PDF_RENDER_FORMAT,
+            quality=settings.PDF_RENDER_QUALITY,
+        )
+
+    @property
+    def mime_type(self) -> str:
+        return _MIME_TYPES[self.image_format]
+
+    def cache_name(self, page_number: int) -> str:
+        quality = "" if self.image_format == "png" else f"-q{self.quality}"
+        ext = _EXTENSIONS[self.image_format]
+        return f"{page_number:04d}-{self.dpi}dpi{quality}.{ext}"
+
+
+def render_page(pdf_path: str, page_number: int, render: RenderSettings) -> bytes:
+    """
+    Rasterizes and encodes a single page (1-based). Runs in pool workers, so it
+    takes only picklable arguments and opens the document itself.
+    """
+    with fitz.open(pdf_path) as doc:
+        pixmap = doc[page_number - 1].get_pixmap(dpi=render.dpi, alpha=False)
+
+    if render.image_format == "jpeg":
+        return pixmap.tobytes("jpeg", jpg_quality=render.quality)
+    if render.image_format == "png":
+        return pixmap.tobytes("png")
+
+    image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    buffered = io.BytesIO()
+    image.save(buffered, format="WEBP", quality=render.quality)
+    return buffered.getvalue()
+
+
+# One shared pool per worker count, so renderers of the same size reuse it.
+_executors: dict[int, Executor] = {}
+
+
+def _get_executor(workers: int) -> Executor:
+    if workers not in _executors:
+        # Daemonic processes (e.g. Celery prefork children) cannot start a
+        # process pool of their own; fall back to threads there.
+        if multiprocessing.current_process().daemon:
+            _executors[workers] = ThreadPoolExecutor(max_workers=workers)
+        else:
+            _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+
+class PageRenderer:
+    """
+    Renders PDF pages to encoded images, in parallel, with an on-disk cache
+    keyed by PDF content hash, page number and render settings.
+
+    Pages are yielded lazily and in order, so at most one batch of rendered
+    pages is held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        render: RenderSettings | None = None,
+        workers: int | None = None,
+    ):
+        self.cache_dir = cache_dir or settings.PDF_RENDER_CACHE_DIR
+        self.render = render or RenderSettings.default()
+        self.workers = workers or settings.PDF_RENDER_WORKERS
+
+    def _cache_path(self, pdf_hash: str, page_number: int) -> Path:
+        return (
+            self.cache_dir
+            / pdf_hash[:2]
+            / pdf_hash
+            / self.render.cache_name(page_number)
+        )
+
+    def _write_cache(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def iter_pages(
+        self, pdf_path: Path, page_numbers: Iterable[int] | None = None
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        Yields (page_number, image bytes) for the requested 1-based pages, or
+        every page if `page_numbers` is None.
+        """
+        pdf_hash = pdf_blob_store.digest_for_path(pdf_path)
+        if page_numbers is None:
+            with fitz.open(pdf_path) as doc:
+                page_numbers = range(1, doc.page_count + 1)
+        page_numbers = list(page_numbers)
+
+        batch_size = self.workers * 2
+        for start in range(0, len(page_numbers), batch_size):
+            batch = page_numbers[start : start + batch_size]
+            missing = [n for n in batch if not self._cache_path(pdf_hash, n).exists()]
+            rendered = dict(
+                zip(missing, self._render_many(pdf_path, missing), strict=True)
+            )
+            for page_number in batch:
+                cache_path = self._cache_path(pdf_hash, page_number)
+                if page_number in rendered:
+                    data = rendered.pop(page_number)
+                    self._write_cache(cache_path, data)
+                else:
+                    data = cache_path.read_bytes()
+                yield page_number, data
+
+    def _render_many(self, pdf_path: Path, page_numbers: list[int]) -> list[bytes]:
+        if not page_numbers:
+            return []
+        if self.workers == 1 or len(page_numbers) == 1:
+            return [render_page(str(pdf_path), n, self.render) for n in page_numbers]
+        executor = _get_executor(self.workers)
+        return list(
+            executor.map(
+                render_page,
+                [str(pdf_path)] * len(page_numbers),
+                page_numbers,
+                [self.render] * len(page_numbers),
+            )
+        )
+
+    def iter_data_urls(
+        self, pdf_path: Path, page_numbers: Iterable[int] | None = None
+    ) -> Iterator[tuple[int, str]]:
+        """Yields (page_number, base64 data URL) with the correct MIME type."""
+        for page_number, data in self.iter_pages(pdf_path, page_numbers):
+            yield (
+                page_number,
+                f"data:{self.render.mime_type};base64,{bytes_to_base64_string(data)}",
+            )
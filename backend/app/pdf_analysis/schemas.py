@@ -16,6 +16,11 @@ class PublicLeaseCategory(BaseModel):
 PublicLeaseOutput = list[PublicLeaseCategory]
 
 
+class PublicLeaseStructuredOutput(BaseModel):
+    # Structured output modes need an object at the schema root.
+    categories: list[PublicLeaseCategory]
+
+
 class ReferenceMappingCondition(BaseModel):
     content: str
     block_indices: list[int]
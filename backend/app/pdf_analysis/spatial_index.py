@@ -0,0 +1,106 @@
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+
+from app.schemas.block import BlockBase
+
+# Cells per side of the grid over the normalized page.
+GRID_SIZE = 16
+
+
+def _normalize(bbox: Sequence[float]) -> tuple[float, float, float, float]:
+    # LLM bboxes do not always put the smaller coordinate first.
+    x1, y1, x2, y2 = bbox
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+
+def _intersects(
+    a: tuple[float, float, float, float], b: tuple[float, float, float, float]
+) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _cells(bbox: tuple[float, float, float, float]) -> list[tuple[int, int]]:
+    def _cell(value: float) -> int:
+        return min(GRID_SIZE - 1, max(0, int(value * GRID_SIZE)))
+
+    x1, y1, x2, y2 = bbox
+    return [
+        (cx, cy)
+        for cx in range(_cell(x1), _cell(x2) + 1)
+        for cy in range(_cell(y1), _cell(y2) + 1)
+    ]
+
+
+class PageGrid:
+    """
+    Uniform grid over one page's normalized [0, 1] coordinates. Each block is
+    registered in the cells it covers, so a query only checks the blocks of
+    the cells its bbox covers instead of every block on the page.
+    """
+
+    def __init__(self):
+        self._bboxes: dict[int, tuple[float, float, float, float]] = {}
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+
+    def insert(self, key: int, bbox: Sequence[float]) -> None:
+        normalized = _normalize(bbox)
+        self._bboxes[key] = normalized
+        for cell in _cells(normalized):
+            self._cells[cell].append(key)
+
+    def query(self, bbox: Sequence[float]) -> list[int]:
+        """Returns the keys of the blocks intersecting `bbox`, in key order."""
+        normalized = _normalize(bbox)
+        found = set()
+        for cell in _cells(normalized):
+            for key in self._cells.get(cell, ()):
+                if key not in found and _intersects(self._bboxes[key], normalized):
+                    found.add(key)
+        return sorted(found)
+
+    def intersects(self, key: int, bbox: Sequence[float]) -> bool:
+        return key in self._bboxes and _intersects(self._bboxes[key], _normalize(bbox))
+
+
+class BlockIndex:
+    """
+    Per-page spatial index of layout blocks, answering which blocks a
+    condition's bboxes overlap. Blocks are identified by their position in the
+    list the index was built from (as in `ReferenceMappingCondition.block_indices`).
+    """
+
+    def __init__(self, blocks: Iterable[BlockBase]):
+        self._pages: dict[int, PageGrid] = defaultdict(PageGrid)
+        self._block_pages: list[int] = []
+        for i, block in enumerate(blocks):
+            self._pages[block.page].insert(i, block.bbox)
+            self._block_pages.append(block.page)
+
+    def __len__(self) -> int:
+        return len(self._block_pages)
+
+    def query(self, page: int, bboxes: Iterable[Sequence[float]]) -> list[int]:
+        """Returns the indices of the blocks on `page` intersecting any of `bboxes`."""
+        grid = self._pages.get(page)
+        if grid is None:
+            return []
+        found = set()
+        for bbox in bboxes:
+            found.update(grid.query(bbox))
+        return sorted(found)
+
+    def verify(
+        self, page: int, bboxes: Iterable[Sequence[float]], block_indices: list[int]
+    ) -> list[int]:
+        """
+        Keeps the claimed `block_indices` that exist, lie on `page` and
+        intersect one of the condition's `bboxes`.
+        """
+        bboxes = list(bboxes)
+        return [
+            i
+            for i in block_indices
+            if 0 <= i < len(self._block_pages)
+            and self._block_pages[i] == page
+            and any(self._pages[page].intersects(i, bbox) for bbox in bboxes)
+        ]
@@ -1,6 +1,10 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
+from app.llm_providers.batch import BatchRequest
+
 
 class PDFInformationExtractionStrategy(ABC):
     @property
@@ -20,3 +24,44 @@ class PDFInformationExtractionStrategy(ABC):
         model_identifier: str = "gemini/gemini-2.5-pro-preview-05-06",
     ) -> Any | None:
         pass
+
+    def batch_requests(
+        self,
+        announcement: Any,
+        model_identifier: str,
+        structured_output: bool | None = None,
+        blocks: list[Any] | None = None,
+    ) -> list[BatchRequest]:
+        """Builds the batch API requests extracting the announcement."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support batch extraction"
+        )
+
+    def process_batch_results(
+        self,
+        announcement_id: str,
+        model_identifier: str,
+        responses: list[tuple[list[int] | None, dict]],
+        structured_output: bool,
+    ) -> tuple[dict, Any | None]:
+        """Turns the batch API responses of one announcement into a result."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support batch extraction"
+        )
+
+    async def aanalyze(
+        self,
+        announcement: Any,
+        model_identifier: str = "gemini/gemini-2.5-pro-preview-05-06",
+        max_retries: int = 3,
+        on_chunk: Callable[[str], None] | None = None,
+        blocks: list[Any] | None = None,
+    ) -> Any | None:
+        # Strategies without a native async implementation run in a thread;
+        # they do not use the layout blocks.
+        return await asyncio.to_thread(
+            self.analyze,
+            announcement=announcement,
+            model_identifier=model_identifier,
+            max_retries=max_retries,
+        )
@@ -1,18 +1,51 @@
+import asyncio
 import logging
 from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
 
+import fitz
 from pydantic import ValidationError
 
+from app.core.blob_store import get_announcement_pdf_path
 from app.core.config import settings
+from app.llm_providers.base_provider import LLMProviderStrategy
+from app.llm_providers.batch import BatchRequest
 from app.llm_providers.factory import get_llm_provider
 from app.models.announcement import Announcement
-from app.pdf_analysis.llm_content_parsers import parse_and_validate_llm_response
+from app.models.llm_analysis_result import LLMAnalysisResult
+from app.pdf_analysis.chunking import (
+    make_page_windows,
+    merge_category_maps,
+    section_start_pages,
+)
+from app.pdf_analysis.llm_content_parsers import (
+    RepairBudget,
+    parse_and_validate_llm_response,
+)
+from app.pdf_analysis.page_selection import (
+    get_public_lease_field_aliases,
+    score_pages,
+    select_pages,
+)
 from app.pdf_analysis.prompts import (
+    PRUNED_PAGES_NOTE,
     PUBLIC_LEASE_DEVELOPER_PROMPT,
     PUBLIC_LEASE_USER_PROMPT,
 )
-from app.pdf_analysis.schemas import PublicLeaseCategory, PublicLeaseOutput
+from app.pdf_analysis.schemas import (
+    PublicLeaseCategory,
+    PublicLeaseCondition,
+    PublicLeaseOutput,
+    PublicLeaseStructuredOutput,
+)
 from app.pdf_analysis.strategies.base import PDFInformationExtractionStrategy
+from app.pdf_analysis.streaming_parser import (
+    StreamingCategoryParser,
+    StreamingParseResult,
+    parse_categories,
+)
+from app.schemas.block import BlockBase
 
 
 def _prepare_category_condition_map(
@@ -35,6 +68,28 @@ def _prepare_category_condition_map(
     return d
 
 
+def _split_model_identifier(model_identifier: str) -> tuple[str, str]:
+    try:
+        provider_name, actual_model_name = model_identifier.split("/", 1)
+    except ValueError:
+        # Log the error and raise it, as it's an invalid input format.
+        logging.error(
+            f"Invalid model_identifier: '{model_identifier}'. Expected format 'provider/model_name'."
+        )
+        raise ValueError(
+            f"Invalid model_identifier: '{model_identifier}'. Expected format 'provider/model_name'."
+        )
+    return provider_name, actual_model_name
+
+
+def _response_schema(
+    structured_output: bool | None,
+) -> type[PublicLeaseStructuredOutput] | None:
+    if structured_output is None:
+        structured_output = settings.LLM_STRUCTURED_OUTPUT_ENABLED
+    return PublicLeaseStructuredOutput if structured_output else None
+
+
 class PublicLeaseInformationExtractionStrategy(PDFInformationExtractionStrategy):
     """
     Analysis strategy for public lease announcements using image-based analysis
@@ -55,6 +110,9 @@ class PublicLeaseInformationExtractionStrategy(PDFInformationExtractionStrategy)
         announcement: Announcement,
         model_identifier: str = "gemini/gemini-2.5-pro-preview-05-06",
         max_retries: int = 3,
+        prune_pages: bool | None = None,
+        structured_output: bool | None = None,
+        blocks: list[BlockBase] | None = None,
     ) -> tuple[dict, dict[str, list[dict]]] | None:
         """
         Analyzes a public lease announcement PDF using the specified model provider strategy.
@@ -65,6 +123,12 @@ class PublicLeaseInformationExtractionStrategy(PDFInformationExtractionStrategy)
             announcement: The announcement object containing file path and ID.
             model_identifier: Identifier for the model and provider (e.g., "gemini/model-name", "openai/model-name").
             max_retries: Maximum number of retries for parsing and validation.
+            prune_pages: Send only the most relevant pages. Defaults to
+                `PAGE_PRUNING_ENABLED`.
+            structured_output: Constrain the response to the output schema
+                natively. Defaults to `LLM_STRUCTURED_OUTPUT_ENABLED`.
+            blocks: Layout blocks of the announcement, if analyzed; they
+                refine page pruning.
 
         Returns:
             A tuple containing the LLM output metadata and the category_condition_map on success,
@@ -73,33 +137,409 @@ class PublicLeaseInformationExtractionStrategy(PDFInformationExtractionStrategy)
         Raises:
             ValueError: If the model_identifier is invalid or provider is unsupported by the factory.
         """
-        pdf_path = settings.MYHOME_DATA_DIR / announcement.filename
+        pdf_path = get_announcement_pdf_path(announcement)
         if not pdf_path.exists():
             logging.error(f"PDF file not found: {pdf_path}")
             # Return None, None if the PDF is not found, as no LLM call will be made.
             return None, None
 
-        try:
-            provider_name, actual_model_name = model_identifier.split("/", 1)
-        except ValueError:
-            # Log the error and raise it, as it's an invalid input format.
-            logging.error(
-                f"Invalid model_identifier: '{model_identifier}'. Expected format 'provider/model_name'."
-            )
-            raise ValueError(
-                f"Invalid model_identifier: '{model_identifier}'. Expected format 'provider/model_name'."
-            )
+        provider_name, actual_model_name = _split_model_identifier(model_identifier)
+        page_numbers = self._select_pages(pdf_path, prune_pages, blocks)
+        llm_provider = get_llm_provider(provider_name)
+        response_schema = _response_schema(structured_output)
+        result = llm_provider.generate_from_pdf(
+            pdf_path=pdf_path,
+            system_prompt=self.system_prompt,
+            user_prompt=self._user_prompt_for(page_numbers),
+            model_name=actual_model_name,
+            page_numbers=page_numbers,
+            response_schema=response_schema,
+        )
+        return self._process_result(
+            result,
+            pdf_path,
+            model_identifier,
+            structured_output=response_schema is not None,
+        )
+
+    async def aanalyze(
+        self,
+        announcement: Announcement,
+        model_identifier: str = "gemini/gemini-2.5-pro-preview-05-06",
+        max_retries: int = 3,
+        prune_pages: bool | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        chunked: bool | None = None,
+        blocks: list[BlockBase] | None = None,
+        on_condition: Callable[[str, PublicLeaseCondition], None] | None = None,
+        structured_output: bool | None = None,
+    ) -> tuple[dict, dict[str, list[dict]]] | None:
+        """
+        Async variant of `analyze` using the provider's async client, so many
+        analyses can overlap in one event loop. If `on_chunk` is given the LLM
+        response is streamed and each text delta is passed to it; if
+        `on_condition` is given, each condition is also parsed and reported as
+        soon as it is complete in the stream (single-request extractions only).
+
+        Long documents (see `CHUNKED_EXTRACTION_MIN_PAGES`, or `chunked=True`)
+        are extracted in concurrent page windows whose results are merged; the
+        stored raw response then holds one entry per window. Layout `blocks`,
+        if available, align windows to sections and refine page pruning.
+        `structured_output` is as for `analyze`.
+        """
+        pdf_path = get_announcement_pdf_path(announcement)
+        if not pdf_path.exists():
+            logging.error(f"PDF file not found: {pdf_path}")
+            return None, None
 
+        provider_name, actual_model_name = _split_model_identifier(model_identifier)
+        page_numbers = await asyncio.to_thread(
+            self._select_pages, pdf_path, prune_pages, blocks
+        )
         llm_provider = get_llm_provider(provider_name)
-        content, raw_response_dict = llm_provider.generate_from_pdf(
+        response_schema = _response_schema(structured_output)
+
+        windows = await asyncio.to_thread(
+            self._page_windows, pdf_path, page_numbers, chunked, blocks
+        )
+        if windows is not None:
+            return await self._aanalyze_windows(
+                llm_provider,
+                pdf_path,
+                actual_model_name,
+                model_identifier,
+                windows,
+                max_retries,
+                response_schema,
+            )
+
+        parser = None
+        if on_condition is not None:
+            parser = StreamingCategoryParser(on_condition=on_condition)
+            forward = on_chunk
+
+            def on_chunk(text: str) -> None:
+                parser.feed(text)
+                if forward is not None:
+                    forward(text)
+
+        result = await llm_provider.agenerate_from_pdf(
             pdf_path=pdf_path,
             system_prompt=self.system_prompt,
-            user_prompt=self.user_prompt,
+            user_prompt=self._user_prompt_for(page_numbers),
             model_name=actual_model_name,
+            page_numbers=page_numbers,
+            on_chunk=on_chunk,
+            response_schema=response_schema,
+        )
+        # Repairs make blocking provider calls.
+        return await asyncio.to_thread(
+            self._process_result,
+            result,
+            pdf_path,
+            model_identifier,
+            structured_output=response_schema is not None,
+            parsed=parser.close() if parser is not None else None,
+        )
+
+    def batch_requests(
+        self,
+        announcement: Announcement,
+        model_identifier: str,
+        structured_output: bool | None = None,
+        prune_pages: bool | None = None,
+        chunked: bool | None = None,
+        blocks: list[BlockBase] | None = None,
+    ) -> list[BatchRequest]:
+        """
+        Builds the batch API requests extracting the announcement: one per page
+        window for long documents (as in `aanalyze`), otherwise one for the
+        selected pages. Custom IDs are "<announcement_id>:<index>".
+        Layout `blocks` refine page pruning and align windows to sections as in
+        `aanalyze`.
+
+        Returns:
+            The requests, or an empty list if the PDF file is not found.
+        """
+        pdf_path = get_announcement_pdf_path(announcement)
+        if not pdf_path.exists():
+            logging.error(f"PDF file not found: {pdf_path}")
+            return []
+
+        _, actual_model_name = _split_model_identifier(model_identifier)
+        page_numbers = self._select_pages(pdf_path, prune_pages, blocks)
+        windows = self._page_windows(pdf_path, page_numbers, chunked, blocks)
+        response_schema = _response_schema(structured_output)
+        return [
+            BatchRequest(
+                custom_id=f"{announcement.id}:{i}",
+                pdf_path=pdf_path,
+                system_prompt=self.system_prompt,
+                user_prompt=self._user_prompt_for(pages),
+                model_name=actual_model_name,
+                page_numbers=pages,
+                response_schema=response_schema,
+            )
+            for i, pages in enumerate(windows or [page_numbers])
+        ]
+
+    def process_batch_results(
+        self,
+        announcement_id: str,
+        model_identifier: str,
+        responses: list[tuple[list[int] | None, dict]],
+        structured_output: bool,
+    ) -> tuple[dict, dict[str, list[dict]] | None]:
+        """
+        Parses the batch API responses of the requests from `batch_requests`,
+        given as (page_numbers, raw_response) in request order, into the same
+        result as `analyze`/`aanalyze`.
+
+        Windows can't be re-extracted in halves here, so truncated window
+        responses keep their completed conditions.
+        """
+        provider_name, _ = _split_model_identifier(model_identifier)
+        llm_provider = get_llm_provider(provider_name)
+        budget = RepairBudget()
+        repair_count = 0
+        category_maps = []
+        for pages, raw_response in responses:
+            content = llm_provider.text_from_raw_response(raw_response)
+            if content is None:
+                logging.error(
+                    f"Batch response for {announcement_id} pages {pages} has no content "
+                    f"(model: {model_identifier})"
+                )
+                category_maps.append(None)
+                continue
+            category_map, repairs = self._parse_content(
+                content,
+                f"{announcement_id} pages {pages}",
+                model_identifier,
+                budget=budget,
+            )
+            repair_count += repairs
+            category_maps.append(category_map)
+
+        llm_output_meta = {
+            "model": model_identifier,
+            "raw_response": (
+                responses[0][1]
+                if len(responses) == 1
+                else {
+                    "chunks": [
+                        {"pages": pages, "raw_response": raw_response}
+                        for pages, raw_response in responses
+                    ]
+                }
+            ),
+            "structured_output": structured_output,
+            "repair_count": repair_count,
+            "repair_attempts": budget.attempts,
+        }
+        if any(category_map is None for category_map in category_maps):
+            return llm_output_meta, None
+        return llm_output_meta, merge_category_maps(category_maps)
+
+    def _select_pages(
+        self,
+        pdf_path: Path,
+        prune_pages: bool | None,
+        blocks: list[BlockBase] | None = None,
+    ) -> list[int] | None:
+        """Returns the pages to send, or None to send the whole document."""
+        if prune_pages is None:
+            prune_pages = settings.PAGE_PRUNING_ENABLED
+        if not prune_pages:
+            return None
+
+        scores = score_pages(pdf_path, get_public_lease_field_aliases(), blocks)
+        page_numbers = select_pages(scores)
+        if len(page_numbers) == len(scores):
+            return None
+        logging.info(
+            f"Sending {len(page_numbers)}/{len(scores)} pages of {pdf_path}: {page_numbers}"
+        )
+        return page_numbers
+
+    def _page_windows(
+        self,
+        pdf_path: Path,
+        page_numbers: list[int] | None,
+        chunked: bool | None,
+        blocks: list[BlockBase] | None,
+    ) -> list[list[int]] | None:
+        """Returns the page windows for chunked extraction, or None."""
+        if page_numbers is None:
+            with fitz.open(pdf_path) as doc:
+                page_numbers = list(range(1, doc.page_count + 1))
+
+        if chunked is None:
+            min_pages = settings.CHUNKED_EXTRACTION_MIN_PAGES
+            chunked = min_pages is not None and len(page_numbers) > min_pages
+        if not chunked:
+            return None
+
+        windows = make_page_windows(
+            page_numbers,
+            settings.CHUNKED_EXTRACTION_WINDOW_PAGES,
+            settings.CHUNKED_EXTRACTION_OVERLAP_PAGES,
+            section_starts=section_start_pages(blocks) if blocks else None,
+        )
+        return windows if len(windows) > 1 else None
+
+    async def _aanalyze_windows(
+        self,
+        llm_provider: LLMProviderStrategy,
+        pdf_path: Path,
+        actual_model_name: str,
+        model_identifier: str,
+        windows: list[list[int]],
+        max_retries: int,
+        response_schema: type[PublicLeaseStructuredOutput] | None,
+    ) -> tuple[dict, dict[str, list[dict]] | None]:
+        logging.info(
+            f"Extracting {pdf_path} in {len(windows)} page windows (model: {model_identifier})"
+        )
+        budget = RepairBudget()
+        window_results = await asyncio.gather(
+            *(
+                self._aanalyze_window(
+                    llm_provider,
+                    pdf_path,
+                    actual_model_name,
+                    model_identifier,
+                    window,
+                    max_retries,
+                    response_schema,
+                    budget,
+                )
+                for window in windows
+            )
+        )
+        results = [result for results in window_results for result in results]
+        llm_output_meta = {
+            "model": model_identifier,
+            "raw_response": {
+                "chunks": [
+                    {"pages": pages, "raw_response": raw_response}
+                    for pages, raw_response, _, _ in results
+                ]
+            },
+            "structured_output": response_schema is not None,
+            "repair_count": sum(repairs for _, _, _, repairs in results),
+            "repair_attempts": budget.attempts,
+        }
+
+        failed = [
+            pages for pages, _, category_map, _ in results if category_map is None
+        ]
+        if failed:
+            logging.error(
+                f"Chunked extraction of {pdf_path} failed for pages {failed} (model: {model_identifier})"
+            )
+            return llm_output_meta, None
+        return llm_output_meta, merge_category_maps(
+            category_map for _, _, category_map, _ in results
+        )
+
+    async def _aanalyze_window(
+        self,
+        llm_provider: LLMProviderStrategy,
+        pdf_path: Path,
+        actual_model_name: str,
+        model_identifier: str,
+        window: list[int],
+        max_retries: int,
+        response_schema: type[PublicLeaseStructuredOutput] | None,
+        budget: RepairBudget,
+    ) -> list[tuple[list[int], dict | None, dict[str, list[dict]] | None, int]]:
+        """
+        Extracts one page window. Provider errors are retried up to
+        `max_retries` times; a response that fails validation (typically output
+        truncated at the token limit) is retried as two half-size windows.
+
+        Returns:
+            (pages, raw_response, category_condition_map, repair_count) per
+            extracted window.
+        """
+        result = None
+        for attempt in range(max_retries + 1):
+            result = await llm_provider.agenerate_from_pdf(
+                pdf_path=pdf_path,
+                system_prompt=self.system_prompt,
+                user_prompt=self._user_prompt_for(window),
+                model_name=actual_model_name,
+                page_numbers=window,
+                response_schema=response_schema,
+            )
+            if result is not None and result[0] is not None:
+                break
+            logging.warning(
+                f"No content for pages {window} of {pdf_path} "
+                f"(attempt {attempt + 1}/{max_retries + 1}, model: {model_identifier})"
+            )
+        else:
+            return [(window, result[1] if result is not None else None, None, 0)]
+
+        content, raw_response = result
+        category_map, repairs = await asyncio.to_thread(
+            self._parse_content,
+            content,
+            f"{pdf_path} pages {window}",
+            model_identifier,
+            allow_truncated=len(window) == 1,
+            budget=budget,
+        )
+        if category_map is not None or len(window) == 1:
+            return [(window, raw_response, category_map, repairs)]
+
+        mid = len(window) // 2
+        halves = await asyncio.gather(
+            self._aanalyze_window(
+                llm_provider,
+                pdf_path,
+                actual_model_name,
+                model_identifier,
+                window[:mid],
+                max_retries,
+                response_schema,
+                budget,
+            ),
+            self._aanalyze_window(
+                llm_provider,
+                pdf_path,
+                actual_model_name,
+                model_identifier,
+                window[mid:],
+                max_retries,
+                response_schema,
+                budget,
+            ),
         )
+        return halves[0] + halves[1]
+
+    def _user_prompt_for(self, page_numbers: list[int] | None) -> str:
+        if page_numbers is None:
+            return self.user_prompt
+        return self.user_prompt + PRUNED_PAGES_NOTE
+
+    def _process_result(
+        self,
+        result: tuple[str, dict] | None,
+        pdf_path: Path,
+        model_identifier: str,
+        structured_output: bool,
+        parsed: StreamingParseResult | None = None,
+    ) -> tuple[dict, dict[str, list[dict]] | None]:
+        content, raw_response_dict = result if result is not None else (None, None)
+        provider_name = model_identifier.split("/", 1)[0]
         llm_output_meta = {
             "model": model_identifier,
             "raw_response": raw_response_dict,
+            "structured_output": structured_output,
+            "repair_count": 0,
+            "repair_attempts": [],
         }
 
         if content is None:
@@ -109,25 +549,152 @@ class PublicLeaseInformationExtractionStrategy(PDFInformationExtractionStrategy)
             )
             return llm_output_meta, None
 
-        try:
-            validated_data: PublicLeaseOutput = parse_and_validate_llm_response(
-                content=content,
-                validation_model=list[PublicLeaseCategory],
+        budget = RepairBudget()
+        category_map, llm_output_meta["repair_count"] = self._parse_content(
+            content, pdf_path, model_identifier, parsed=parsed, budget=budget
+        )
+        llm_output_meta["repair_attempts"] = budget.attempts
+        return llm_output_meta, category_map
+
+    def reparse(self, llm_result: LLMAnalysisResult) -> dict[str, list[dict]] | None:
+        """
+        Re-parses a stored LLM analysis result without calling the LLM API,
+        e.g. after the output schema or the parsing logic changed.
+
+        Args:
+            llm_result: The stored LLMAnalysisResult.
+
+        Returns:
+            The category_condition_map, or None if the stored response holds no
+            usable content.
+        """
+        provider_name = llm_result.model.split("/", 1)[0]
+        llm_provider = get_llm_provider(provider_name)
+
+        # Chunked extractions store one raw response per page window.
+        chunks = llm_result.raw_response.get("chunks")
+        raw_responses = (
+            [chunk["raw_response"] for chunk in chunks]
+            if chunks is not None
+            else [llm_result.raw_response]
+        )
+
+        category_maps = []
+        for raw_response in raw_responses:
+            content = (
+                llm_provider.text_from_raw_response(raw_response)
+                if raw_response
+                else None
+            )
+            if content is None:
+                logging.error(
+                    f"Stored LLM result {llm_result.id} (model: {llm_result.model}) has no content."
+                )
+                return None
+            category_map, _ = self._parse_content(
+                content, llm_result.announcement_id, llm_result.model
             )
-            category_condition_map = _prepare_category_condition_map(
-                validated_data=validated_data,
+            if category_map is None:
+                return None
+            category_maps.append(category_map)
+        return merge_category_maps(category_maps)
+
+    def _parse_content(
+        self,
+        content: str,
+        source: Path | str,
+        model_identifier: str,
+        parsed: StreamingParseResult | None = None,
+        allow_truncated: bool = True,
+        budget: RepairBudget | None = None,
+    ) -> tuple[dict[str, list[dict]] | None, int]:
+        """
+        Validates the LLM content; `source` only identifies it in log messages.
+
+        Every well-formed condition is kept and only malformed conditions are
+        sent for repair, one at a time, to the provider that produced them and
+        within the token `budget` of the result. A response cut off mid-output keeps
+        what was completed unless `allow_truncated` is False (chunked windows
+        are re-extracted in halves instead). `parsed` can be passed when the
+        content was already parsed while streaming.
+
+        Returns:
+            The category_condition_map (None on failure) and the number of
+            conditions that were sent for repair.
+        """
+        repairs = 0
+        provider_name, actual_model_name = _split_model_identifier(model_identifier)
+        repair_model = settings.LLM_REPAIR_MODELS.get(provider_name, actual_model_name)
+        if budget is None:
+            budget = RepairBudget()
+        try:
+            if parsed is None:
+                parsed = parse_categories(content)
+            if not parsed.categories and not parsed.broken:
+                raise ValueError("No category array found in the LLM response.")
+            if parsed.truncated:
+                if not allow_truncated:
+                    raise ValueError("The LLM response is truncated.")
+                logging.warning(
+                    f"LLM response for {source} is truncated (model: {model_identifier}); "
+                    "keeping the completed conditions."
+                )
+
+            # Categories repeated in the output are merged, as are repairs.
+            categories: dict[str, PublicLeaseCategory] = {}
+            for category in parsed.categories:
+                categories.setdefault(
+                    category.category,
+                    PublicLeaseCategory(category=category.category, conditions=[]),
+                ).conditions.extend(category.conditions)
+            for fragment in parsed.broken:
+                if fragment.truncated:
+                    continue
+                if fragment.category is None:
+                    logging.error(
+                        f"Dropping a malformed condition without category for {source} "
+                        f"(model: {model_identifier}): {fragment.error}"
+                    )
+                    continue
+                repairs += 1
+                try:
+                    condition = parse_and_validate_llm_response(
+                        content=fragment.text,
+                        validation_model=PublicLeaseCondition,
+                        provider=get_llm_provider(provider_name),
+                        model_name=repair_model,
+                        budget=budget,
+                    )
+                except RuntimeError as e:
+                    logging.error(
+                        f"Dropping an unrepairable condition in category "
+                        f"'{fragment.category}' for {source} (model: {model_identifier}): {e}"
+                    )
+                    continue
+                categories.setdefault(
+                    fragment.category,
+                    PublicLeaseCategory(category=fragment.category, conditions=[]),
+                ).conditions.append(condition)
+
+            category_map = _prepare_category_condition_map(
+                validated_data=list(categories.values()),
             )
-            return llm_output_meta, category_condition_map
+            if repairs:
+                logging.info(
+                    f"Sent {repairs} malformed condition(s) for repair for {source} "
+                    f"(model: {model_identifier})"
+                )
+            return category_map, repairs
 
-        except (RuntimeError, TypeError, ValidationError) as e:
+        except (ValueError, TypeError, ValidationError) as e:
             logging.error(
-                f"Failed to validate/process LLM response for {pdf_path} (model: {model_identifier}): {e}",
+                f"Failed to validate/process LLM response for {source} (model: {model_identifier}): {e}",
                 exc_info=True,
             )
-            return llm_output_meta, None
+            return None, repairs
         except Exception as e:
             logging.error(
-                f"Unexpected error during condition processing/saving for {pdf_path} (model: {model_identifier}): {e}",
+                f"Unexpected error during condition processing/saving for {source} (model: {model_identifier}): {e}",
                 exc_info=True,
             )
-            return llm_output_meta, None
+            return None, repairs
@@ -0,0 +1,178 @@
+import json
+import re
+from collections.abc import Callable
+from typing import NamedTuple
+
+from pydantic import ValidationError
+
+from app.pdf_analysis.schemas import PublicLeaseCategory, PublicLeaseCondition
+
+_CATEGORY_NAME = re.compile(r'"category"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Nesting depth of the objects of interest in
+# [ {"category": ..., "conditions": [ {condition}, ... ]}, ... ]
+_CATEGORY_DEPTH = 2
+_CONDITION_DEPTH = 4
+
+
+class BrokenFragment(NamedTuple):
+    """A condition that could not be parsed, to be repaired on its own."""
+
+    category: str | None
+    text: str
+    error: str
+    # Cut off by the end of the response rather than malformed; such a
+    # fragment cannot be repaired without the missing text.
+    truncated: bool = False
+
+
+class StreamingParseResult(NamedTuple):
+    categories: list[PublicLeaseCategory]
+    broken: list[BrokenFragment]
+    truncated: bool
+
+
+class StreamingCategoryParser:
+    """
+    Incremental parser for the `list[PublicLeaseCategory]` JSON the extraction
+    prompt asks for.
+
+    Text can be fed as it streams in. Each condition object is validated as
+    soon as its closing brace arrives and reported through `on_condition`;
+    a condition that fails to parse or validate is kept as a `BrokenFragment`
+    while every other condition is salvaged. Text around the top-level array
+    (e.g. ``` fences, or the `{"categories": ...}` wrapper of structured output)
+    is ignored.
+    """
+
+    def __init__(
+        self,
+        on_condition: Callable[[str, PublicLeaseCondition], None] | None = None,
+    ):
+        self.on_condition = on_condition
+        self._buffer = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._done = False
+        self._category_start: int | None = None
+        self._condition_start: int | None = None
+        self._category_name: str | None = None
+        self._category_conditions: list[PublicLeaseCondition] = []
+        # Conditions seen before their category name (key order not guaranteed)
+        self._pending: list[PublicLeaseCondition] = []
+        self._categories: list[PublicLeaseCategory] = []
+        self._broken: list[BrokenFragment] = []
+
+    def feed(self, chunk: str) -> None:
+        offset = len(self._buffer)
+        self._buffer += chunk
+        for i, char in enumerate(chunk):
+            if self._done:
+                break
+            self._consume(char, offset + i)
+
+    def _consume(self, char: str, pos: int) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+            return
+
+        if self._depth == 0 and char != "[":
+            return  # preamble such as ```json
+        if char == '"':
+            self._in_string = True
+        elif char in "[{":
+            self._depth += 1
+            if char == "{" and self._depth == _CATEGORY_DEPTH:
+                self._start_category(pos)
+            elif char == "{" and self._depth == _CONDITION_DEPTH:
+                self._condition_start = pos
+        elif char in "]}":
+            if char == "}" and self._depth == _CONDITION_DEPTH:
+                self._end_condition(pos)
+            elif char == "}" and self._depth == _CATEGORY_DEPTH:
+                self._end_category()
+            self._depth -= 1
+            if self._depth == 0:
+                self._done = True
+
+    def _start_category(self, pos: int) -> None:
+        self._category_start = pos
+        self._category_name = None
+        self._category_conditions = []
+        self._pending = []
+
+    def _resolve_category_name(self) -> str | None:
+        if self._category_name is None and self._category_start is not None:
+            match = _CATEGORY_NAME.search(self._buffer, self._category_start)
+            if match:
+                self._category_name = json.loads(f'"{match.group(1)}"')
+                for condition in self._pending:
+                    self._emit(condition)
+                self._pending = []
+        return self._category_name
+
+    def _emit(self, condition: PublicLeaseCondition) -> None:
+        self._category_conditions.append(condition)
+        if self.on_condition is not None:
+            self.on_condition(self._category_name, condition)
+
+    def _end_condition(self, pos: int) -> None:
+        text = self._buffer[self._condition_start : pos + 1]
+        self._condition_start = None
+        name = self._resolve_category_name()
+        try:
+            condition = PublicLeaseCondition.model_validate(json.loads(text))
+        except (json.JSONDecodeError, ValidationError) as e:
+            self._broken.append(BrokenFragment(name, text, str(e)))
+            return
+        if name is None:
+            self._pending.append(condition)
+        else:
+            self._emit(condition)
+
+    def _end_category(self) -> None:
+        name = self._resolve_category_name()
+        if name is not None:
+            self._categories.append(
+                PublicLeaseCategory(category=name, conditions=self._category_conditions)
+            )
+        self._category_start = None
+
+    def close(self) -> StreamingParseResult:
+        """
+        Finishes parsing. A condition left open by a truncated response is
+        reported as a broken fragment, and the conditions of an unfinished
+        category are still returned.
+        """
+        truncated = not self._done
+        if truncated:
+            name = self._resolve_category_name()
+            if self._condition_start is not None:
+                self._broken.append(
+                    BrokenFragment(
+                        name,
+                        self._buffer[self._condition_start :],
+                        "Response ended inside this condition",
+                        truncated=True,
+                    )
+                )
+            if self._category_start is not None and name is not None:
+                self._categories.append(
+                    PublicLeaseCategory(
+                        category=name, conditions=self._category_conditions
+                    )
+                )
+        return StreamingParseResult(self._categories, self._broken, truncated)
+
+
+def parse_categories(content: str) -> StreamingParseResult:
+    """Parses a complete response with the incremental parser."""
+    parser = StreamingCategoryParser()
+    parser.feed(content)
+    return parser.close()
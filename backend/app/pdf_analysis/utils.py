@@ -1,5 +1,6 @@
 import base64
 import io
+from pathlib import Path
 
 import fitz
 from PIL import Image
@@ -53,3 +54,21 @@ def copy_fitz_document(doc: fitz.Document) -> fitz.Document:
     """
     pdf_data = doc.tobytes()
     return fitz.open("pdf", pdf_data)
+
+
+def split_pdf_pages(pdf_path: Path, page_numbers: list[int]) -> list[tuple[int, bytes]]:
+    """
+    Extracts the given 1-based pages as single-page PDF documents.
+
+    Returns:
+        A list of (page_number, pdf_bytes) in the order of `page_numbers`.
+    """
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for page_number in page_numbers:
+            with fitz.open() as page_doc:
+                page_doc.insert_pdf(
+                    doc, from_page=page_number - 1, to_page=page_number - 1
+                )
+                pages.append((page_number, page_doc.tobytes()))
+    return pages
@@ -8,6 +8,10 @@ from app.enums import AnnouncementType
 from app.models.announcement import Announcement
 from app.schemas.category import CategoryResponse
 from app.schemas.condition import ConditionResponse
+from app.utils.hashing import sha256_json
+
+# Fields added by us on top of the MyHome API item; excluded from change detection.
+RAW_DATA_HASH_EXCLUDE = frozenset({"filename", "pdf_hash", "type"})
 
 
 def empty_str_to_none(value: Any) -> Any | None:
@@ -17,6 +21,13 @@ def empty_str_to_none(value: Any) -> Any | None:
     return value
 
 
+def hash_raw_data(raw_data: dict) -> str:
+    """Stable hash of the MyHome API fields of an announcement's raw data."""
+    return sha256_json(
+        {k: v for k, v in raw_data.items() if k not in RAW_DATA_HASH_EXCLUDE}
+    )
+
+
 class AnnouncementCreate(BaseModel):
     pblancId: str
     houseSn: int
@@ -54,6 +65,7 @@ class AnnouncementCreate(BaseModel):
     beginDe: str
     endDe: str
     filename: str | None = None
+    pdf_hash: str | None = None
     type: AnnouncementType
 
     @field_validator(
@@ -111,8 +123,10 @@ class AnnouncementRead(BaseModel):
 
 
 class AnnouncementListRequest(BaseModel):
-    page: int
+    page: int = 1
     limit: int
+    # Opaque `nextCursor` of the previous page; takes precedence over `page`.
+    cursor: str | None = None
     provinceName: str | None = None
     districtName: str | None = None
     supplyTypeName: str | None = None
@@ -184,34 +198,18 @@ class AnnouncementListRequest(BaseModel):
 
         return query_conditions
 
-    def get_sort_expression(
-        self, model_cls: type[Announcement]
-    ) -> QueryExpression | None:
-        sort_field_name = self._sort_map.get(self.sortType)
-
-        if not sort_field_name:
-            # Default to sorting by 'latest' if sortType is unrecognized or not in map
-            # (though "view" is now in the map, this is a fallback)
-            sort_field_name = self._sort_map["latest"]
-            model_field = getattr(model_cls, sort_field_name)
-            return model_field.desc()
-
-        model_field = getattr(model_cls, sort_field_name)
-
-        if self.sortType == "latest":
-            return model_field.desc()
-        elif self.sortType == "deadline":
-            return model_field.asc()
-        elif self.sortType == "view":
-            return model_field.desc()  # Sort by view_count in descending order
-
-        # Fallback for any other unhandled sortType (should ideally not be reached if validation is strict)
-        return getattr(model_cls, self._sort_map["latest"]).desc()
+    def get_sort_key(self) -> tuple[str, bool]:
+        """Returns the model field to sort by and whether the order is descending."""
+        sort_field_name = self._sort_map.get(self.sortType, self._sort_map["latest"])
+        # Latest and most viewed first; nearest deadline first.
+        return sort_field_name, self.sortType != "deadline"
 
 
 class AnnouncementListResponse(BaseModel):
     items: list[AnnouncementRead]
-    totalCount: int
+    # Only counted for the first request of a listing (without a cursor).
+    totalCount: int | None = None
+    nextCursor: str | None = None
 
 
 class AnnouncementDetailResponse(BaseModel):
@@ -11,6 +11,9 @@ class LLMAnalysisResultCreate(BaseModel):
     announcement_id: str
     model: str
     raw_response: dict
+    structured_output: bool = False
+    repair_count: int = 0
+    repair_attempts: list[dict] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
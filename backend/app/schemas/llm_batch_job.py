@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class LLMBatchJobCreate(BaseModel):
+    provider: str
+    model: str
+    batch_id: str
+    structured_output: bool = False
+    requests: list[dict]
+
+
+class LLMBatchJobUpdate(BaseModel):
+    status: str | None = None
+    detail: str | None = None
+    completed_at: datetime | None = None
@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+
+class SyncStateCreate(BaseModel):
+    id: str  # brtcCode
+    last_application_date: str | None = None
+    last_announcement_id: str | None = None
+
+
+class SyncStateUpdate(BaseModel):
+    last_application_date: str | None = None
+    last_announcement_id: str | None = None
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
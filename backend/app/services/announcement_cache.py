@@ -0,0 +1,163 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import TypedDict
+
+from odmantic import AIOEngine
+from redis import RedisError
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis_client
+from app.crud import crud_category, crud_condition
+from app.schemas.category import CategoryResponse
+from app.schemas.condition import ConditionResponse
+
+KEY_PREFIX = "announcement_originals"
+
+# Color of original conditions extracted without one.
+DEFAULT_CONDITION_COLOR = "#53A4F3"
+
+
+class OriginalPayload(TypedDict):
+    """The serialized original (`user_id is None`) documents of an announcement."""
+
+    categories: list[dict]
+    conditions: list[dict]
+
+
+def apply_user_overlay(originals: list[dict], user_documents: list[dict]) -> list[dict]:
+    """
+    Merges a user's serialized documents over the serialized originals, as
+    `user_overlay_pipeline` does in the database: an original is replaced by
+    the user's version of it, or hidden if that version is deleted, and the
+    user's own documents follow unless deleted. Versions of originals that no
+    longer exist are left out.
+    """
+    versions = {doc["original_id"]: doc for doc in user_documents if doc["original_id"]}
+    merged = []
+    for original in originals:
+        version = versions.get(original["id"], original)
+        if not version["is_deleted"]:
+            merged.append(version)
+    merged.extend(
+        doc
+        for doc in user_documents
+        if not doc["original_id"] and not doc["is_deleted"]
+    )
+    return merged
+
+
+class AnnouncementPayloadCache:
+    """
+    Two-tier cache of the pre-serialized original categories and conditions
+    of announcements, which only change when an extraction result is stored.
+
+    Payloads are kept in a bounded per-process LRU in front of Redis. Local
+    entries expire after `local_ttl` seconds, which bounds how long other
+    processes keep serving a payload after `invalidate`. Redis being
+    unavailable only costs a database read.
+    """
+
+    def __init__(
+        self,
+        redis: AsyncRedis | None = None,
+        ttl: int | None = None,
+        local_size: int | None = None,
+        local_ttl: float | None = None,
+    ):
+        self._redis = redis
+        self.ttl = ttl or settings.ANNOUNCEMENT_CACHE_TTL
+        self.local_size = local_size or settings.ANNOUNCEMENT_CACHE_LOCAL_SIZE
+        self.local_ttl = (
+            local_ttl
+            if local_ttl is not None
+            else settings.ANNOUNCEMENT_CACHE_LOCAL_TTL
+        )
+        self._local: OrderedDict[str, tuple[float, OriginalPayload]] = OrderedDict()
+
+    @property
+    def redis(self) -> AsyncRedis:
+        return self._redis or get_async_redis_client()
+
+    @staticmethod
+    def _key(engine: AIOEngine, announcement_id: str) -> str:
+        # Databases sharing a Redis server (e.g. test databases) stay apart.
+        return f"{KEY_PREFIX}:{engine.database_name}:{announcement_id}"
+
+    def _get_local(self, key: str) -> OriginalPayload | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return payload
+
+    def _set_local(self, key: str, payload: OriginalPayload) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, payload)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def _load(self, engine: AIOEngine, announcement_id: str) -> OriginalPayload:
+        categories = await crud_category.get_originals(
+            engine, announcement_id=announcement_id
+        )
+        conditions = []
+        for condition in await crud_condition.get_originals(
+            engine, announcement_id=announcement_id
+        ):
+            response = ConditionResponse.from_model(condition)
+            if response.color is None:
+                response.color = DEFAULT_CONDITION_COLOR
+            conditions.append(response.model_dump(mode="json"))
+        return OriginalPayload(
+            categories=[
+                CategoryResponse.from_model(category).model_dump(mode="json")
+                for category in categories
+            ],
+            conditions=conditions,
+        )
+
+    async def get(self, engine: AIOEngine, announcement_id: str) -> OriginalPayload:
+        """Returns the original payload of the announcement, loading it on a miss."""
+        key = self._key(engine, announcement_id)
+        payload = self._get_local(key)
+        if payload is not None:
+            return payload
+
+        try:
+            data = await self.redis.get(key)
+        except RedisError as e:
+            logging.warning(f"Announcement cache unavailable: {e}")
+            data = None
+        if data is not None:
+            payload = json.loads(data)
+            self._set_local(key, payload)
+            return payload
+
+        payload = await self._load(engine, announcement_id)
+        try:
+            await self.redis.set(key, json.dumps(payload), ex=self.ttl)
+        except RedisError as e:
+            logging.warning(f"Failed to cache announcement {announcement_id}: {e}")
+        self._set_local(key, payload)
+        return payload
+
+    async def invalidate(self, engine: AIOEngine, announcement_id: str) -> None:
+        """Drops the payload of the announcement, e.g. after a new extraction."""
+        key = self._key(engine, announcement_id)
+        self._local.pop(key, None)
+        try:
+            await self.redis.delete(key)
+        except RedisError as e:
+            logging.warning(
+                f"Failed to invalidate cached announcement {announcement_id}: {e}"
+            )
+
+
+announcement_payload_cache = AnnouncementPayloadCache()
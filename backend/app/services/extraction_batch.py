@@ -0,0 +1,290 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timezone
+
+from odmantic import AIOEngine
+
+from app.core.config import settings
+from app.crud import (
+    crud_announcement,
+    crud_block,
+    crud_llm_analysis_result,
+    crud_llm_batch_job,
+)
+from app.crud.base import BulkCreateError
+from app.llm_providers.batch import Batch, BatchBuilder, LLMBatchClient
+from app.llm_providers.factory import get_batch_client
+from app.models.announcement import Announcement
+from app.models.llm_batch_job import LLMBatchJob
+from app.pdf_analysis.strategies.factory import get_strategy
+from app.schemas.llm_batch_job import LLMBatchJobCreate, LLMBatchJobUpdate
+from app.services.announcement_cache import announcement_payload_cache
+from app.services.extraction_scheduler import ExtractionJob
+from app.services.information_extraction_service import (
+    build_extraction_documents,
+    save_extraction_documents,
+)
+
+
+async def _get_announcements(
+    engine: AIOEngine, announcement_ids: list[str]
+) -> dict[str, Announcement]:
+    announcements = await crud_announcement.get_many(
+        engine, Announcement.id.in_(announcement_ids), limit=None
+    )
+    return {ann.id: ann for ann in announcements}
+
+
+async def _iter_batches(
+    engine: AIOEngine,
+    client: LLMBatchClient,
+    model: str,
+    model_jobs: list[ExtractionJob],
+    structured_output: bool,
+) -> AsyncIterator[Batch]:
+    """
+    Builds the request lines of the jobs announcement by announcement and
+    yields each batch as soon as it is full.
+    """
+    announcements = await _get_announcements(engine, [job[0] for job in model_jobs])
+    builder = BatchBuilder(
+        settings.LLM_BATCH_MAX_REQUESTS, settings.LLM_BATCH_MAX_BYTES
+    )
+    for ann_id, ann_type, _ in model_jobs:
+        ann = announcements.get(ann_id)
+        if ann is None:
+            print(f"Announcement with id {ann_id} not found for model {model}")
+            continue
+        try:
+            blocks = await crud_block.get_by_announcement(
+                engine, announcement_id=ann_id
+            )
+            batch_requests = await asyncio.to_thread(
+                get_strategy(ann_type).batch_requests,
+                ann,
+                model,
+                structured_output=structured_output,
+                blocks=blocks or None,
+            )
+            ann_lines = [
+                await asyncio.to_thread(client.request_line, request)
+                for request in batch_requests
+            ]
+        except Exception as e:
+            print(f"Error preparing batch requests for {ann_id} with {model}: {e}")
+            continue
+        full = builder.add(
+            ann_lines,
+            [
+                {
+                    "custom_id": request.custom_id,
+                    "announcement_id": ann_id,
+                    "pages": request.page_numbers,
+                }
+                for request in batch_requests
+            ],
+        )
+        if full is not None:
+            yield full
+
+    last = builder.flush()
+    if last is not None:
+        yield last
+
+
+async def submit_extraction_batches(
+    engine: AIOEngine,
+    jobs: list[ExtractionJob],
+    structured_output: bool | None = None,
+    get_client: Callable[[str], LLMBatchClient] = get_batch_client,
+) -> list[LLMBatchJob]:
+    """
+    Submits the extraction jobs to the providers' batch APIs, in one or more
+    batches per model, and records each batch for `poll_extraction_batches`.
+    Jobs that are already in a running batch are skipped.
+
+    A batch is submitted as soon as the next announcement's requests would
+    exceed `LLM_BATCH_MAX_REQUESTS`/`LLM_BATCH_MAX_BYTES`, so at most one
+    batch is held in memory, and the requests of an announcement always go
+    to the same batch.
+
+    Args:
+        engine: The AIOEngine instance for database interaction.
+        jobs: The jobs to submit, e.g. from `find_missing_extractions`.
+        structured_output: As for the strategies' `analyze`.
+        get_client: Returns the batch client of a provider.
+
+    Returns:
+        The recorded batches.
+    """
+    if structured_output is None:
+        structured_output = settings.LLM_STRUCTURED_OUTPUT_ENABLED
+
+    pending = await crud_llm_batch_job.get_pending_pairs(engine)
+    jobs_by_model: dict[str, list[ExtractionJob]] = defaultdict(list)
+    for job in jobs:
+        if (job[0], job[2]) not in pending:
+            jobs_by_model[job[2]].append(job)
+
+    batch_jobs = []
+    for model, model_jobs in jobs_by_model.items():
+        provider_name, actual_model_name = model.split("/", 1)
+        client = get_client(provider_name)
+        submitted_at = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        i = 0
+        async for batch in _iter_batches(
+            engine, client, model, model_jobs, structured_output
+        ):
+            batch_id = await asyncio.to_thread(
+                client.submit,
+                actual_model_name,
+                batch.lines,
+                f"extraction-{provider_name}-{submitted_at}-{i}",
+            )
+            batch_jobs.append(
+                await crud_llm_batch_job.create(
+                    engine,
+                    LLMBatchJobCreate(
+                        provider=provider_name,
+                        model=model,
+                        batch_id=batch_id,
+                        structured_output=structured_output,
+                        requests=batch.items,
+                    ),
+                )
+            )
+            print(
+                f"Submitted batch {batch_id} with {len(batch.lines)} requests for {model}"
+            )
+            i += 1
+    return batch_jobs
+
+
+async def ingest_batch_results(
+    engine: AIOEngine, batch_job: LLMBatchJob, results: dict[str, dict | None]
+) -> dict[str, int]:
+    """
+    Stores the results of a completed batch, each announcement with
+    `save_extraction_documents` so that a failed save leaves nothing behind.
+
+    Announcements with a failed or missing request or a failed save are not
+    stored, so the next backfill picks them up again; those already analyzed
+    meanwhile are skipped.
+
+    Returns:
+        Counts of succeeded, failed and skipped announcements.
+    """
+    requests_by_ann: dict[str, list[dict]] = defaultdict(list)
+    for request in batch_job.requests:
+        requests_by_ann[request["announcement_id"]].append(request)
+
+    stats = {"succeeded": 0, "failed": 0, "skipped": 0}
+    analyzed = await crud_llm_analysis_result.get_analyzed_models(
+        engine, models=[batch_job.model]
+    )
+    announcements = await _get_announcements(engine, list(requests_by_ann))
+
+    outputs = []
+    for ann_id, requests in requests_by_ann.items():
+        ann = announcements.get(ann_id)
+        if ann is None or batch_job.model in analyzed.get(ann_id, set()):
+            stats["skipped"] += 1
+            continue
+        responses = [
+            (request["pages"], results.get(request["custom_id"]))
+            for request in requests
+        ]
+        if any(raw_response is None for _, raw_response in responses):
+            print(
+                f"Batch {batch_job.batch_id} has no response for announcement {ann_id}"
+            )
+            stats["failed"] += 1
+            continue
+        try:
+            # Repairs make blocking provider calls.
+            llm_output, category_condition_map = await asyncio.to_thread(
+                get_strategy(ann.type).process_batch_results,
+                ann_id,
+                batch_job.model,
+                responses,
+                batch_job.structured_output,
+            )
+        except Exception as e:
+            print(f"Error processing batch results for {ann_id}: {e}")
+            stats["failed"] += 1
+            continue
+        outputs.append((ann, llm_output, category_condition_map))
+
+    if not outputs:
+        return stats
+
+    for ann, llm_output, category_condition_map in outputs:
+        documents = build_extraction_documents(ann, llm_output, category_condition_map)
+        try:
+            # A partial save would count the pair as analyzed without its
+            # conditions; the save is rolled back as a whole instead.
+            await save_extraction_documents(engine, *documents)
+        except BulkCreateError as e:
+            # Typically a result stored by an interactive run in the meantime.
+            for error in e.errors:
+                print(
+                    f"Error storing batch result for announcement {ann.id}: "
+                    f"{error['message']}"
+                )
+            stats["failed"] += 1
+            continue
+        except Exception as e:
+            print(f"Error storing batch result for announcement {ann.id}: {e}")
+            stats["failed"] += 1
+            continue
+        stats["succeeded" if category_condition_map is not None else "failed"] += 1
+        await announcement_payload_cache.invalidate(engine, ann.id)
+    return stats
+
+
+async def poll_extraction_batches(
+    engine: AIOEngine,
+    get_client: Callable[[str], LLMBatchClient] = get_batch_client,
+) -> dict[str, int]:
+    """
+    Checks every running batch and ingests the results of those that ended.
+
+    Returns:
+        Counts of batches still running, completed and failed, and of the
+        announcements stored, failed and skipped.
+    """
+    stats = {
+        "running": 0,
+        "completed": 0,
+        "failed": 0,
+        "succeeded_announcements": 0,
+        "failed_announcements": 0,
+        "skipped_announcements": 0,
+    }
+    for batch_job in await crud_llm_batch_job.get_running(engine):
+        client = get_client(batch_job.provider)
+        status = await asyncio.to_thread(client.status, batch_job.batch_id)
+        if status.state == "running":
+            stats["running"] += 1
+            continue
+
+        if status.state == "completed":
+            results = await asyncio.to_thread(client.results, batch_job.batch_id)
+            ingested = await ingest_batch_results(engine, batch_job, results)
+            for key, count in ingested.items():
+                stats[f"{key}_announcements"] += count
+        else:
+            print(f"Batch {batch_job.batch_id} failed: {status.detail}")
+
+        stats[status.state] += 1
+        await crud_llm_batch_job.update(
+            engine,
+            batch_job,
+            LLMBatchJobUpdate(
+                status=status.state,
+                detail=status.detail,
+                completed_at=datetime.now(timezone.utc),
+            ),
+        )
+    return stats
@@ -0,0 +1,117 @@
+import asyncio
+import zlib
+from collections import defaultdict
+
+from odmantic import AIOEngine
+
+from app.core.config import settings
+from app.crud import crud_announcement, crud_llm_analysis_result
+from app.enums import AnnouncementType
+from app.llm_providers.usage import extract_result_token_usage
+from app.pdf_analysis.strategies.factory import get_strategy
+from app.services.information_extraction_service import perform_information_extraction
+
+# (announcement_id, announcement_type, model_identifier)
+ExtractionJob = tuple[str, AnnouncementType, str]
+
+
+def _in_shard(announcement_id: str, shard_index: int, shard_count: int) -> bool:
+    return zlib.crc32(announcement_id.encode()) % shard_count == shard_index
+
+
+async def find_missing_extractions(
+    engine: AIOEngine,
+    models: list[str],
+    shard_index: int = 0,
+    shard_count: int = 1,
+) -> list[ExtractionJob]:
+    """
+    Lists every (announcement, model) pair without a stored analysis result.
+
+    The pairs are derived from the database on each call, so an interrupted
+    backfill resumes where it stopped. With `shard_count > 1` only the
+    announcements hashing to `shard_index` are returned, which lets several
+    workers split a backfill without coordination.
+    """
+    announcement_types = await crud_announcement.get_types(engine)
+    analyzed = await crud_llm_analysis_result.get_analyzed_models(engine, models=models)
+    return [
+        (ann_id, ann_type, model)
+        for ann_id, ann_type in announcement_types.items()
+        if _in_shard(ann_id, shard_index, shard_count)
+        for model in models
+        if model not in analyzed.get(ann_id, set())
+    ]
+
+
+async def run_extractions(
+    engine: AIOEngine,
+    jobs: list[ExtractionJob],
+    provider_concurrency: dict[str, int] | None = None,
+) -> dict[str, int]:
+    """
+    Runs the extraction jobs through one asyncio worker pool per provider, so
+    a slow or throttled provider does not hold back the others. Request and
+    token rates are enforced by the shared limiters of `LLM_RATE_LIMITS`.
+
+    Args:
+        engine: The AIOEngine instance for database interaction.
+        jobs: The jobs to run, e.g. from `find_missing_extractions`.
+        provider_concurrency: Workers per provider. Defaults to
+            `EXTRACTION_PROVIDER_CONCURRENCY`.
+
+    Returns:
+        Counts of total, succeeded and failed jobs, and the input tokens sent
+        and served from prompt caches.
+    """
+    provider_concurrency = (
+        provider_concurrency or settings.EXTRACTION_PROVIDER_CONCURRENCY
+    )
+
+    queues: dict[str, asyncio.Queue[ExtractionJob]] = defaultdict(asyncio.Queue)
+    for job in jobs:
+        queues[job[2].split("/", 1)[0]].put_nowait(job)
+
+    stats = {
+        "total": len(jobs),
+        "succeeded": 0,
+        "failed": 0,
+        "input_tokens": 0,
+        "cached_tokens": 0,
+    }
+
+    async def _worker(queue: asyncio.Queue[ExtractionJob]):
+        while not queue.empty():
+            ann_id, ann_type, model = queue.get_nowait()
+            try:
+                result = await perform_information_extraction(
+                    announcement_id=ann_id,
+                    model_identifier=model,
+                    db_engine=engine,
+                    strategy=get_strategy(ann_type),
+                )
+                succeeded = result is not None and result[1] is not None
+                if result is not None:
+                    usage = extract_result_token_usage(result[0].raw_response)
+                    stats["input_tokens"] += usage["input_tokens"]
+                    stats["cached_tokens"] += usage["cached_tokens"]
+            except Exception as e:
+                print(f"Error extracting announcement {ann_id} with {model}: {e}")
+                succeeded = False
+
+            stats["succeeded" if succeeded else "failed"] += 1
+            done = stats["succeeded"] + stats["failed"]
+            print(
+                f"[{done}/{stats['total']}] announcement {ann_id} with {model}: "
+                f"{'ok' if succeeded else 'failed'}"
+            )
+
+    workers = []
+    for provider, queue in queues.items():
+        concurrency = provider_concurrency.get(
+            provider, settings.EXTRACTION_DEFAULT_CONCURRENCY
+        )
+        workers.extend(_worker(queue) for _ in range(concurrency))
+    await asyncio.gather(*workers)
+
+    return stats
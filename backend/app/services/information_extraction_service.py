@@ -1,19 +1,28 @@
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from odmantic import AIOEngine
+
+from app.core.db import supports_transactions
 from app.crud import (
     crud_announcement,
+    crud_block,
     crud_category,
     crud_condition,
     crud_llm_analysis_result,
 )
 from app.models.announcement import Announcement
+from app.models.category import Category
+from app.models.condition import Condition
+from app.models.llm_analysis_result import LLMAnalysisResult
 from app.pdf_analysis.information_extractor import (
-    extract_information as default_extract_pdf,
+    aextract_information as default_extract_pdf,
 )
 from app.pdf_analysis.strategies.base import PDFInformationExtractionStrategy
 from app.schemas.category import CategoryCreate
 from app.schemas.condition import ConditionCreate
 from app.schemas.llm_analysis_result import LLMAnalysisResultCreate
+from app.services.announcement_cache import announcement_payload_cache
 
 
 async def perform_information_extraction(
@@ -24,8 +33,10 @@ async def perform_information_extraction(
     crud_announcement: Any = crud_announcement,
     crud_llm_analysis_result: Any = crud_llm_analysis_result,
     crud_condition: Any = crud_condition,
-    extract_pdf_func: callable = default_extract_pdf,
-) -> None:
+    extract_pdf_func: Callable[..., Awaitable[Any]] = default_extract_pdf,
+    crud_block: Any = crud_block,
+    crud_category: Any = crud_category,
+) -> tuple[LLMAnalysisResult, list[Category] | None, list[Condition] | None] | None:
     ann = await crud_announcement.get(db_engine, Announcement.id == announcement_id)
     if ann is None:
         print(
@@ -37,50 +48,128 @@ async def perform_information_extraction(
         f"Extracting information from announcement {ann.id} with model: {model_identifier}"
     )
 
-    result = extract_pdf_func(ann, strategy, model_identifier=model_identifier)
+    # Stored layout blocks (see `analyze_announcement_layouts`) refine page
+    # pruning; announcements without them are extracted on text scores alone.
+    blocks = await crud_block.get_by_announcement(db_engine, announcement_id=ann.id)
+    result = await extract_pdf_func(
+        ann, strategy, model_identifier=model_identifier, blocks=blocks or None
+    )
 
     if result is None:
         print(f"Failed to extract information from announcement {ann.id}")
         return
 
     llm_output, category_condition_map = result
-    llm_output_created = await crud_llm_analysis_result.create(
+    llm_output_obj, categories, conditions = build_extraction_documents(
+        ann,
+        llm_output,
+        category_condition_map,
+        crud_llm_analysis_result=crud_llm_analysis_result,
+        crud_category=crud_category,
+        crud_condition=crud_condition,
+    )
+    await save_extraction_documents(
         db_engine,
+        llm_output_obj,
+        categories,
+        conditions,
+        crud_llm_analysis_result=crud_llm_analysis_result,
+        crud_category=crud_category,
+        crud_condition=crud_condition,
+    )
+    await announcement_payload_cache.invalidate(db_engine, ann.id)
+
+    if category_condition_map is None:
+        return llm_output_obj, None, None
+    return llm_output_obj, categories, conditions
+
+
+def build_extraction_documents(
+    ann: Announcement,
+    llm_output: dict,
+    category_condition_map: dict[str, list[dict]] | None,
+    crud_llm_analysis_result: Any = crud_llm_analysis_result,
+    crud_category: Any = crud_category,
+    crud_condition: Any = crud_condition,
+) -> tuple[LLMAnalysisResult, list[Category], list[Condition]]:
+    """
+    Builds the analysis result, category and condition documents of one
+    extraction in memory, with their IDs already linked, ready for bulk insert.
+    """
+    llm_output_obj = crud_llm_analysis_result.build(
         LLMAnalysisResultCreate(
             announcement_type=ann.type,
             announcement_id=ann.id,
             model=llm_output["model"],
             raw_response=llm_output["raw_response"],
-        ),
+            structured_output=llm_output.get("structured_output", False),
+            repair_count=llm_output.get("repair_count", 0),
+            repair_attempts=llm_output.get("repair_attempts", []),
+        )
     )
 
-    if category_condition_map is None:
-        return llm_output_created, None, None
-
-    categories_created = []
-    conditions_created = []
-    for category_name, conditions_data in category_condition_map.items():
-        category_created = await crud_category.create(
-            db_engine,
+    categories = []
+    conditions = []
+    for category_name, conditions_data in (category_condition_map or {}).items():
+        category = crud_category.build(
             CategoryCreate(
                 announcement_id=ann.id,
                 name=category_name,
-            ),
+            )
         )
-        categories_created.append(category_created)
+        categories.append(category)
 
         for condition_data in conditions_data:
             condition_in = ConditionCreate(
                 announcement_id=ann.id,
-                llm_output_id=llm_output_created.id,
-                category_id=category_created.id,
+                llm_output_id=llm_output_obj.id,
+                category_id=category.id,
                 content=condition_data["content"],
                 section=condition_data["section"],
                 page=condition_data["page"],
                 bbox=condition_data["bbox"],
             )
-            conditions_created.append(
-                await crud_condition.create(db_engine, condition_in)
+            conditions.append(crud_condition.build(condition_in))
+
+    return llm_output_obj, categories, conditions
+
+
+async def save_extraction_documents(
+    db_engine: AIOEngine,
+    llm_output_obj: LLMAnalysisResult,
+    categories: list[Category],
+    conditions: list[Condition],
+    crud_llm_analysis_result: Any = crud_llm_analysis_result,
+    crud_category: Any = crud_category,
+    crud_condition: Any = crud_condition,
+) -> None:
+    """
+    Saves the documents of one extraction with one bulk insert per collection,
+    in a transaction where the deployment supports it. On standalone servers
+    the documents already inserted are deleted again if a later insert fails.
+    """
+    if await supports_transactions(db_engine):
+        async with db_engine.transaction() as transaction:
+            await crud_llm_analysis_result.insert_many(
+                db_engine, [llm_output_obj], session=transaction
             )
+            await crud_category.insert_many(db_engine, categories, session=transaction)
+            await crud_condition.insert_many(db_engine, conditions, session=transaction)
+        return
 
-    return llm_output_created, categories_created, conditions_created
+    try:
+        await crud_llm_analysis_result.insert_many(db_engine, [llm_output_obj])
+        await crud_category.insert_many(db_engine, categories)
+        await crud_condition.insert_many(db_engine, conditions)
+    except Exception:
+        # crud_condition does not delete; remove the partial inserts directly.
+        await db_engine.remove(
+            Condition, Condition.id.in_([condition.id for condition in conditions])
+        )
+        await db_engine.remove(
+            Category, Category.id.in_([category.id for category in categories])
+        )
+        await db_engine.remove(
+            LLMAnalysisResult, LLMAnalysisResult.id == llm_output_obj.id
+        )
+        raise
@@ -0,0 +1,361 @@
+import asyncio
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+from odmantic import AIOEngine
+
+from app.core.blob_store import BlobStore, pdf_blob_store
+from app.core.browser_pool import BrowserPool
+from app.core.config import settings
+from app.core.myhome_client import MyHomeClient
+from app.crud import crud_announcement, crud_sync_state
+from app.enums import AnnouncementType
+from app.models.sync_state import SyncState
+from app.schemas.announcement import AnnouncementCreate, hash_raw_data
+
+
+async def _fetch_region_pages_until(
+    client: MyHomeClient, brtc_code: str, num_of_rows: int, stop_before: str
+) -> tuple[list[dict], bool]:
+    """
+    Fetches pages of a region one by one until a page reaches announcements
+    posted before `stop_before` (YYYYMMDD). The listing is returned newest first,
+    so an incremental sync usually needs only the first page or two.
+
+    Returns:
+        The listed items and whether every page was fetched successfully.
+    """
+    items_data: list[dict] = []
+    page_no = 1
+    while True:
+        try:
+            result = await client.aget_housing_list(page_no, num_of_rows, brtc_code)
+            page_items, total_count = client.extract_items(result)
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"[brtcCode={brtc_code}, pageNo={page_no}] {e}")
+            return items_data, False
+
+        items_data.extend(page_items)
+        oldest = min((item.get("rcritPblancDe", "") for item in page_items), default="")
+        if (
+            not page_items
+            or oldest < stop_before
+            or page_no * num_of_rows >= total_count
+        ):
+            break
+        page_no += 1
+
+    return items_data, True
+
+
+async def _fetch_region_items(
+    client: MyHomeClient, brtc_code: str, num_of_rows: int
+) -> tuple[list[dict], bool]:
+    """
+    Fetches the first page of a region, then every remaining page concurrently.
+
+    Returns:
+        The listed items and whether every page was fetched successfully.
+    """
+    try:
+        result = await client.aget_housing_list(1, num_of_rows, brtc_code)
+        items_data, total_count = client.extract_items(result)
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"[brtcCode={brtc_code}, pageNo=1] {e}")
+        return [], False
+
+    last_page = math.ceil(total_count / num_of_rows)
+    results = await asyncio.gather(
+        *(
+            client.aget_housing_list(page_no, num_of_rows, brtc_code)
+            for page_no in range(2, last_page + 1)
+        ),
+        return_exceptions=True,
+    )
+    complete = True
+    for page_no, result in enumerate(results, start=2):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            page_items, _ = client.extract_items(result)
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"[brtcCode={brtc_code}, pageNo={page_no}] {e}")
+            complete = False
+            continue
+        items_data.extend(page_items)
+
+    return items_data, complete
+
+
+async def fetch_housing_announcements_by_region(
+    client: MyHomeClient,
+    brtc_codes: list[str] | None = None,
+    num_of_rows: int | None = None,
+    stop_before: dict[str, str] | None = None,
+) -> tuple[dict[str, list[AnnouncementCreate]], set[str]]:
+    """
+    Fetches the housing list of each region concurrently.
+
+    Args:
+        client: The MyHome API client.
+        brtc_codes: Region codes to fetch. Defaults to `MYHOME_BRTC_CODES`.
+        num_of_rows: Page size. Defaults to `MYHOME_NUM_OF_ROWS`.
+        stop_before: Optional per-region rcritPblancDe (YYYYMMDD) cutoff. Regions
+            with a cutoff stop paging once older announcements are reached;
+            the others are fetched in full.
+
+    Returns:
+        A mapping of brtcCode to the announcements listed for that region, and
+        the brtcCodes of the regions where a page failed to fetch.
+    """
+    brtc_codes = brtc_codes or settings.MYHOME_BRTC_CODES
+    num_of_rows = num_of_rows or settings.MYHOME_NUM_OF_ROWS
+    stop_before = stop_before or {}
+
+    region_items = await asyncio.gather(
+        *(
+            _fetch_region_pages_until(
+                client, brtc_code, num_of_rows, stop_before[brtc_code]
+            )
+            if brtc_code in stop_before
+            else _fetch_region_items(client, brtc_code, num_of_rows)
+            for brtc_code in brtc_codes
+        )
+    )
+
+    by_region = {}
+    incomplete_regions = set()
+    for brtc_code, (items_data, complete) in zip(brtc_codes, region_items, strict=True):
+        by_region[brtc_code] = [
+            AnnouncementCreate(**item, type=AnnouncementType.PUBLIC_LEASE)
+            for item in items_data
+        ]
+        if not complete:
+            incomplete_regions.add(brtc_code)
+    return by_region, incomplete_regions
+
+
+async def fetch_housing_announcements(
+    client: MyHomeClient,
+    brtc_codes: list[str] | None = None,
+    num_of_rows: int | None = None,
+) -> list[AnnouncementCreate]:
+    """
+    Fetches every page of the housing list for each region concurrently and
+    returns the announcements, de-duplicated by pblancId.
+    """
+    by_region, _ = await fetch_housing_announcements_by_region(
+        client, brtc_codes, num_of_rows
+    )
+    return _dedupe(by_region)
+
+
+def _dedupe(
+    by_region: dict[str, list[AnnouncementCreate]],
+) -> list[AnnouncementCreate]:
+    announcements: dict[str, AnnouncementCreate] = {}
+    for region_announcements in by_region.values():
+        for announcement in region_announcements:
+            announcements.setdefault(announcement.pblancId, announcement)
+    return list(announcements.values())
+
+
+def _sync_cutoff(watermark: SyncState) -> str | None:
+    """
+    Date before which a region does not need to be re-listed. Announcements
+    within the lookback window are re-checked so status changes
+    (e.g. 접수중 -> 마감) are still picked up.
+    """
+    if not watermark.last_application_date:
+        return None
+    last_date = datetime.strptime(watermark.last_application_date, "%Y%m%d")
+    cutoff = last_date - timedelta(days=settings.MYHOME_SYNC_LOOKBACK_DAYS)
+    return cutoff.strftime("%Y%m%d")
+
+
+def _watermark_announcements(
+    announcements: list[AnnouncementCreate], failed_ids: set[str]
+) -> list[AnnouncementCreate]:
+    """
+    Announcements of a region the watermark may advance over: the ones listed
+    before the oldest announcement that failed to store, so the next
+    incremental sync lists the failed ones again.
+    """
+    failed = [
+        (announcement.rcritPblancDe, announcement.pblancId)
+        for announcement in announcements
+        if announcement.pblancId in failed_ids
+    ]
+    if not failed:
+        return announcements
+    oldest_failed = min(failed)
+    return [
+        announcement
+        for announcement in announcements
+        if (announcement.rcritPblancDe, announcement.pblancId) < oldest_failed
+    ]
+
+
+async def download_announcement_pdfs(
+    client: MyHomeClient,
+    announcements: list[AnnouncementCreate],
+    concurrency: int | None = None,
+    browser_pool_size: int | None = None,
+    blob_store: BlobStore = pdf_blob_store,
+) -> dict[str, str]:
+    """
+    Downloads the PDFs of the given announcements concurrently using a shared
+    browser pool and adds them to the content-addressed blob store.
+
+    Returns:
+        A mapping of pblancId to the SHA-256 of its PDF. Failed downloads
+        are omitted.
+    """
+    if not announcements:
+        return {}
+
+    concurrency = concurrency or settings.MYHOME_DOWNLOAD_CONCURRENCY
+    browser_pool_size = browser_pool_size or min(
+        concurrency, settings.MYHOME_BROWSER_POOL_SIZE
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    incoming_dir = client.DOWNLOAD_DIR / ".incoming"
+    incoming_dir.mkdir(parents=True, exist_ok=True)
+
+    async def _download(
+        browser_pool: BrowserPool, announcement: AnnouncementCreate
+    ) -> tuple[str, str | None]:
+        download_path = incoming_dir / f"{announcement.pblancId}-{uuid4().hex}.pdf"
+        async with semaphore:
+            downloaded = await client.download_pdf_with_playwright(
+                announcement, download_path, browser_pool=browser_pool
+            )
+        if downloaded is None:
+            return announcement.pblancId, None
+        pdf_hash = await asyncio.to_thread(
+            blob_store.put_file, Path(downloaded), move=True
+        )
+        return announcement.pblancId, pdf_hash
+
+    async with BrowserPool(size=browser_pool_size) as browser_pool:
+        results = await asyncio.gather(
+            *(_download(browser_pool, ann) for ann in announcements)
+        )
+
+    return {ann_id: pdf_hash for ann_id, pdf_hash in results if pdf_hash is not None}
+
+
+async def ingest_housing_announcements(
+    engine: AIOEngine,
+    client: MyHomeClient | None = None,
+    brtc_codes: list[str] | None = None,
+    concurrency: int | None = None,
+    incremental: bool = False,
+) -> dict[str, int]:
+    """
+    Fetches announcements for the given regions, downloads and stores the new
+    ones and refreshes the ones whose source data changed.
+
+    Args:
+        engine: The AIOEngine instance for database interaction.
+        client: The MyHome API client. A default client is created if omitted.
+        brtc_codes: Region codes to sync. Defaults to `MYHOME_BRTC_CODES`.
+        concurrency: Maximum number of concurrent PDF downloads.
+        incremental: If True, only re-list each region back to its stored
+            sync watermark (minus `MYHOME_SYNC_LOOKBACK_DAYS`).
+
+    Returns:
+        Counts of created, updated, unchanged and failed announcements.
+    """
+    client = client or MyHomeClient()
+    brtc_codes = brtc_codes or settings.MYHOME_BRTC_CODES
+
+    stop_before = {}
+    if incremental:
+        watermarks = await crud_sync_state.get_watermarks(engine, brtc_codes=brtc_codes)
+        for brtc_code, watermark in watermarks.items():
+            cutoff = _sync_cutoff(watermark)
+            if cutoff is not None:
+                stop_before[brtc_code] = cutoff
+
+    by_region, incomplete_regions = await fetch_housing_announcements_by_region(
+        client, brtc_codes, stop_before=stop_before
+    )
+    announcements = _dedupe(by_region)
+
+    known_hashes = await crud_announcement.get_raw_data_hashes(
+        engine, ids=[announcement.pblancId for announcement in announcements]
+    )
+    new_announcements = []
+    changed_announcements = {}
+    for announcement in announcements:
+        known_hash = known_hashes.get(announcement.pblancId)
+        if known_hash is None:
+            new_announcements.append(announcement)
+        elif known_hash != hash_raw_data(announcement.model_dump()):
+            changed_announcements[announcement.pblancId] = announcement
+
+    stats = {
+        "created": 0,
+        "updated": 0,
+        "unchanged": len(announcements)
+        - len(new_announcements)
+        - len(changed_announcements),
+        "failed": 0,
+    }
+    failed_ids = set()
+
+    for db_obj in await crud_announcement.get_many_by_ids(
+        engine, ids=list(changed_announcements)
+    ):
+        try:
+            await crud_announcement.sync_from_source(
+                engine, db_obj, changed_announcements[db_obj.id]
+            )
+            print(f"Announcement {db_obj.id} changed at source, updated")
+            stats["updated"] += 1
+        except Exception as e:
+            print(f"Error updating announcement {db_obj.id}: {e}")
+            stats["failed"] += 1
+            failed_ids.add(db_obj.id)
+
+    downloaded = await download_announcement_pdfs(
+        client, new_announcements, concurrency=concurrency
+    )
+
+    for announcement in new_announcements:
+        ann_id = announcement.pblancId
+        pdf_hash = downloaded.get(ann_id)
+        if pdf_hash is None:
+            print(f"Failed to download PDF for announcement {ann_id}")
+            stats["failed"] += 1
+            failed_ids.add(ann_id)
+            continue
+
+        announcement.filename = f"{ann_id}.pdf"
+        announcement.pdf_hash = pdf_hash
+        try:
+            async with engine.transaction():
+                await crud_announcement.create(engine, announcement)
+            stats["created"] += 1
+        except Exception as e:
+            # The blob is left in place: it may be shared with other announcements.
+            print(f"Error creating announcement {ann_id}: {e}")
+            stats["failed"] += 1
+            failed_ids.add(ann_id)
+
+    for brtc_code, region_announcements in by_region.items():
+        if brtc_code in incomplete_regions:
+            # A missing page may hold announcements newer than the watermark.
+            print(f"[brtcCode={brtc_code}] Listing incomplete, watermark kept")
+            continue
+        await crud_sync_state.advance_watermark(
+            engine,
+            brtc_code=brtc_code,
+            announcements=_watermark_announcements(region_announcements, failed_ids),
+        )
+
+    return stats
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from collections import Counter
+from uuid import uuid4
+
+from odmantic import AIOEngine
+from pymongo import UpdateOne
+from redis import RedisError, ResponseError
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis_client
+from app.models.announcement import Announcement
+
+KEY_PREFIX = "announcement_views"
+
+
+class ViewCounter:
+    """
+    Write-behind announcement view counter. Views are counted in a Redis hash
+    per database and periodically flushed to MongoDB as one bulk of `$inc`
+    updates, so viewing an announcement does not write its document.
+
+    `view_count` in MongoDB (and the `sortType="view"` ordering) lags by at
+    most one flush interval. When Redis is unavailable, the view is counted
+    with a direct `$inc` instead.
+    """
+
+    def __init__(self, redis: AsyncRedis | None = None):
+        self._redis = redis
+
+    @property
+    def redis(self) -> AsyncRedis:
+        return self._redis or get_async_redis_client()
+
+    @staticmethod
+    def _key(engine: AIOEngine) -> str:
+        return f"{KEY_PREFIX}:{engine.database_name}"
+
+    async def record(self, engine: AIOEngine, announcement: Announcement) -> int:
+        """Counts a view of the announcement and returns its view count."""
+        try:
+            pending = await self.redis.hincrby(self._key(engine), announcement.id, 1)
+        except RedisError as e:
+            logging.warning(f"View counter unavailable, writing directly: {e}")
+            await engine.get_collection(Announcement).update_one(
+                {"_id": announcement.id}, {"$inc": {"view_count": 1}}
+            )
+            return announcement.view_count + 1
+        return announcement.view_count + pending
+
+    async def _claim_orphans(self, key: str) -> list[str]:
+        """
+        Claims the hashes left by flushes that did not finish, e.g. because
+        the process died before deleting them: those whose lease expired.
+        """
+        claimed = []
+        async for flushing_key in self.redis.scan_iter(match=f"{key}:flushing:*"):
+            flushing_key = flushing_key.decode()
+            if flushing_key.endswith(":lease"):
+                continue
+            if await self.redis.set(
+                f"{flushing_key}:lease",
+                1,
+                ex=settings.VIEW_COUNT_FLUSH_LEASE,
+                nx=True,
+            ):
+                claimed.append(flushing_key)
+        return claimed
+
+    async def flush(self, engine: AIOEngine) -> int:
+        """
+        Adds the pending views to the announcements' `view_count` and returns
+        the number of announcements updated.
+
+        The pending hash is renamed before it is read, so views counted during
+        the flush go to a new hash, and concurrent flushes (e.g. from several
+        API processes) never apply the same views twice. Each renamed hash
+        holds a lease while it is flushed; the hashes of flushes whose lease
+        expired are applied along with the pending views.
+        """
+        key = self._key(engine)
+        flushing_key = f"{key}:flushing:{uuid4().hex}"
+        try:
+            flushing_keys = await self._claim_orphans(key)
+            # Leased before it exists, so it is never claimed as an orphan.
+            await self.redis.set(
+                f"{flushing_key}:lease", 1, ex=settings.VIEW_COUNT_FLUSH_LEASE
+            )
+            try:
+                await self.redis.rename(key, flushing_key)
+                flushing_keys.append(flushing_key)
+            except ResponseError:
+                # No views since the last flush.
+                await self.redis.delete(f"{flushing_key}:lease")
+        except RedisError as e:
+            # Views were written directly meanwhile (see `record`).
+            logging.warning(f"View counter unavailable, nothing to flush: {e}")
+            return 0
+        if not flushing_keys:
+            return 0
+
+        counts: Counter[bytes] = Counter()
+        for flushing_key in flushing_keys:
+            for announcement_id, n in (await self.redis.hgetall(flushing_key)).items():
+                counts[announcement_id] += int(n)
+        done_keys = [
+            k
+            for flushing_key in flushing_keys
+            for k in (flushing_key, f"{flushing_key}:lease")
+        ]
+        operations = [
+            UpdateOne({"_id": announcement_id.decode()}, {"$inc": {"view_count": n}})
+            for announcement_id, n in counts.items()
+        ]
+        try:
+            if operations:
+                await engine.get_collection(Announcement).bulk_write(
+                    operations, ordered=False
+                )
+        except Exception:
+            # Put the views back for the next flush.
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for announcement_id, n in counts.items():
+                    pipe.hincrby(key, announcement_id, n)
+                pipe.delete(*done_keys)
+                await pipe.execute()
+            raise
+        await self.redis.delete(*done_keys)
+        return len(operations)
+
+    async def run(self, engine: AIOEngine, interval: float | None = None) -> None:
+        """Flushes the pending views every `interval` seconds until cancelled."""
+        interval = interval or settings.VIEW_COUNT_FLUSH_INTERVAL
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush(engine)
+            except Exception as e:
+                logging.warning(f"Failed to flush announcement views: {e}")
+
+
+view_counter = ViewCounter()
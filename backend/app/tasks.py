@@ -1,18 +1,35 @@
-import os
+import asyncio
 import time
-from collections import defaultdict
 
+from celery.signals import worker_process_init
 from odmantic import AIOEngine
 
+from app.core.blob_store import get_announcement_pdf_path
 from app.core.celery_app import celery_app
+from app.core.config import settings
 from app.core.myhome_client import MyHomeClient
-from app.crud import crud_announcement, crud_condition, crud_llm_analysis_result
-from app.enums import AnnouncementType
+from app.crud import (
+    crud_announcement,
+    crud_block,
+    crud_condition,
+    crud_llm_analysis_result,
+)
+from app.llm_providers.rate_limiter import get_rate_limit_budgets
 from app.models.announcement import Announcement
-from app.pdf_analysis.information_extractor import extract_information
+from app.pdf_analysis.information_extractor import aextract_information
+from app.pdf_analysis.layout_analysis import get_layout_analyzer
 from app.pdf_analysis.strategies.factory import get_strategy
-from app.schemas.announcement import AnnouncementCreate
+from app.services import extraction_batch
+from app.services.extraction_scheduler import find_missing_extractions, run_extractions
 from app.services.information_extraction_service import perform_information_extraction
+from app.services.myhome_ingestion_service import ingest_housing_announcements
+from app.services.view_counter import view_counter
+
+
+@worker_process_init.connect
+def preload_layout_model(**_kwargs) -> None:
+    if settings.LAYOUT_PRELOAD:
+        get_layout_analyzer()
 
 
 @celery_app.task(acks_late=True)
@@ -26,49 +43,28 @@ def example_task(word: str) -> str:
 
 
 @celery_app.task(acks_late=True)
-async def myhome_get_housing_list(engine: AIOEngine):
-    client = MyHomeClient()
-
-    result = client.get_housing_list()  # Assuming get_housing_list is still sync
-    if "response" in result and "header" in result["response"]:
-        header = result["response"]["header"]
-        if header["resultCode"] == "00":
-            items_data = result["response"]["body"]["item"]
-            if not isinstance(items_data, list):
-                items_data = [items_data]
-            items = [
-                AnnouncementCreate(**item, type=AnnouncementType.PUBLIC_LEASE)
-                for item in items_data
-            ]
-
-            for item in items:
-                ann_id = item.pblancId
-                ann_in_db = await crud_announcement.get(engine, {"_id": ann_id})
-                filename = f"{ann_id}.pdf"
-                download_path = client.DOWNLOAD_DIR / filename
-
-                if ann_in_db:
-                    print(f"Announcement {ann_id} already exists")
-                    continue
-
-                download_path = await client.download_pdf_with_playwright(
-                    item, download_path
-                )
-                if download_path is not None:
-                    item.filename = filename
-                    try:
-                        async with engine.transaction():
-                            await crud_announcement.create(engine, item)
-                    except Exception as e:
-                        print(f"Error creating announcement {ann_id}: {e}")
-                        os.remove(download_path)
-                        continue
-                else:
-                    print(f"Failed to download PDF for announcement {ann_id}")
-        else:
-            print(f"API 호출 실패: {header.get('resultMsg', '알 수 없는 오류')}")
-    else:
-        print("API 응답 형식이 올바르지 않습니다.")
+async def myhome_get_housing_list(
+    engine: AIOEngine,
+    brtc_codes: list[str] | None = None,
+    concurrency: int | None = None,
+    incremental: bool = False,
+):
+    try:
+        stats = await ingest_housing_announcements(
+            engine,
+            brtc_codes=brtc_codes,
+            concurrency=concurrency,
+            incremental=incremental,
+        )
+    finally:
+        # The connections are bound to this task's event loop.
+        await MyHomeClient.aclose()
+    print(
+        f"MyHome ingestion finished: {stats['created']} created, "
+        f"{stats['updated']} updated, {stats['unchanged']} unchanged, "
+        f"{stats['failed']} failed"
+    )
+    return stats
 
 
 @celery_app.task(acks_late=True)
@@ -85,32 +81,109 @@ async def extract_announcement_information(
         crud_announcement=crud_announcement,
         crud_llm_analysis_result=crud_llm_analysis_result,
         crud_condition=crud_condition,
-        extract_pdf_func=extract_information,
+        extract_pdf_func=aextract_information,
     )
 
 
 @celery_app.task(acks_late=True)
 async def extract_announcement_information_for_models(
-    engine: AIOEngine, models: list[str]
+    engine: AIOEngine,
+    models: list[str],
+    shard_index: int = 0,
+    shard_count: int = 1,
+    batch: bool = False,
 ):
-    anns = await crud_announcement.get_many(engine)
-    llm_outputs = await crud_llm_analysis_result.get_many(engine)
-
-    # Group existing analyses by announcement_id and store the set of models used
-    analyses_by_ann_id = defaultdict(set)
-    for llm_output in llm_outputs:
-        analyses_by_ann_id[llm_output.announcement_id].add(llm_output.model)
-
-    required_models = set(models)
-
-    for ann in anns:
-        analyzed_models = analyses_by_ann_id.get(str(ann.id), set())
-        missing_models = required_models - analyzed_models
-        print(f"Announcement {ann.id} has {len(missing_models)} missing models")
-
-        if missing_models:
-            for model_name in missing_models:
-                print(
-                    f"Queueing analysis for announcement {ann.id} for model: {model_name}"
-                )
-                await extract_announcement_information(engine, ann, model_name)
+    """
+    Runs every missing (announcement, model) extraction. Completed pairs are
+    skipped, so the task can simply be re-run after an interruption; large
+    backfills can be split across workers with `shard_index`/`shard_count`.
+
+    With `batch=True` the extractions are submitted to the providers' batch
+    APIs instead, and `poll_extraction_batches` stores the results once the
+    batches complete.
+    """
+    jobs = await find_missing_extractions(
+        engine, models, shard_index=shard_index, shard_count=shard_count
+    )
+    print(f"Found {len(jobs)} missing extractions for models: {models}")
+
+    if batch:
+        batch_jobs = await extraction_batch.submit_extraction_batches(engine, jobs)
+        print(f"Submitted {len(batch_jobs)} extraction batches")
+        return {"batches": [batch_job.batch_id for batch_job in batch_jobs]}
+
+    stats = await run_extractions(engine, jobs)
+    print(
+        f"Extraction finished: {stats['succeeded']} succeeded, "
+        f"{stats['failed']} failed out of {stats['total']}; "
+        f"{stats['cached_tokens']}/{stats['input_tokens']} input tokens from prompt caches"
+    )
+    return stats
+
+
+@celery_app.task(acks_late=True)
+async def poll_extraction_batches(engine: AIOEngine):
+    """Stores the results of extraction batches that completed since the last poll."""
+    stats = await extraction_batch.poll_extraction_batches(engine)
+    print(
+        f"Extraction batches: {stats['completed']} completed, {stats['failed']} failed, "
+        f"{stats['running']} running; {stats['succeeded_announcements']} announcements "
+        f"stored, {stats['failed_announcements']} failed"
+    )
+    return stats
+
+
+@celery_app.task(acks_late=True)
+async def analyze_announcement_layouts(
+    engine: AIOEngine, announcement_ids: list[str] | None = None
+) -> dict:
+    """
+    Detects the layout of each announcement's PDF (all announcements if no IDs
+    are given) and stores the blocks. Pages analyzed before are served from the
+    layout cache.
+    """
+    queries = (
+        [] if announcement_ids is None else [Announcement.id.in_(announcement_ids)]
+    )
+    announcements = await crud_announcement.get_many(engine, *queries, limit=None)
+
+    analyzer = get_layout_analyzer()
+    stats = {"total": len(announcements), "analyzed": 0, "failed": 0, "blocks": 0}
+    for announcement in announcements:
+        pdf_path = get_announcement_pdf_path(announcement)
+        try:
+            blocks = await asyncio.to_thread(analyzer.analyze, pdf_path)
+            await crud_block.replace_for_announcement(
+                engine, announcement_id=announcement.id, blocks=blocks
+            )
+        except Exception as e:
+            print(f"Error analyzing layout of announcement {announcement.id}: {e}")
+            stats["failed"] += 1
+            continue
+        stats["analyzed"] += 1
+        stats["blocks"] += len(blocks)
+    print(
+        f"Layout analysis finished: {stats['analyzed']} analyzed, "
+        f"{stats['failed']} failed out of {stats['total']}"
+    )
+    return stats
+
+
+@celery_app.task(acks_late=True)
+async def flush_announcement_views(engine: AIOEngine) -> int:
+    """Adds the views counted since the last flush to the announcements."""
+    updated = await view_counter.flush(engine)
+    print(f"Flushed views of {updated} announcements")
+    return updated
+
+
+@celery_app.task(acks_late=True)
+def report_llm_rate_limit_budget() -> dict:
+    """Reports the remaining requests/tokens per minute of each LLM model."""
+    budgets = get_rate_limit_budgets()
+    for name, budget in budgets.items():
+        print(
+            f"{name}: {budget['requests_left']:.0f}/{budget['rpm']} requests, "
+            f"{budget['tokens_left']:.0f}/{budget['tpm']} tokens left"
+        )
+    return budgets
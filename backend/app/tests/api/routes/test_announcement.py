@@ -19,6 +19,7 @@ from app.schemas.condition import (
     ConditionResponse,
     ConditionUpdateRequest,
 )
+from app.services.view_counter import view_counter
 from app.tests.test_factories import TestDataFactory
 
 
@@ -198,6 +199,42 @@ async def test_get_announcements_sort_by_view_count(
     assert data.items[2].viewCount == 1
 
 
+@pytest.mark.asyncio
+async def test_get_announcements_follows_cursor(
+    client: TestClient,
+    test_factory: TestDataFactory,
+    housing_data: dict,
+):
+    for i, views in enumerate([3, 7, 3, 0, 7]):
+        ann_data = housing_data.copy()
+        ann_data["pblancId"] = f"cursor_{i}"
+        ann = await test_factory.create_announcement(ann_data)
+        await test_factory.increment_announcement_view_count(ann.id, times=views)
+
+    ids, total_counts, cursor = [], [], None
+    while True:
+        req = AnnouncementListRequest(limit=2, sortType="view", cursor=cursor)
+        response = await client.get(
+            "/api/v1/announcements/", params=req.model_dump(exclude_none=True)
+        )
+        assert response.status_code == 200
+        data = AnnouncementListResponse(**response.json())
+        ids.extend(item.id for item in data.items)
+        total_counts.append(data.totalCount)
+        cursor = data.nextCursor
+        if cursor is None:
+            break
+
+    # Equal view counts are ordered by ID, descending.
+    assert ids == ["cursor_4", "cursor_1", "cursor_2", "cursor_0", "cursor_3"]
+    assert total_counts == [5, None, None]
+
+    response = await client.get(
+        "/api/v1/announcements/", params={"limit": 2, "cursor": "garbage"}
+    )
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_announcements_sort_by_deadline(
     client: TestClient,
@@ -314,6 +351,8 @@ async def test_get_announcement(
     assert data.pdfUrl == f"/api/v1/announcements/{announcement.id}/pdf"
     assert data.viewCount == initial_view_count + 1
 
+    # Views reach the database with the next flush.
+    await view_counter.flush(test_factory.engine)
     updated_announcement_in_db = await test_factory.engine.find_one(
         Announcement, Announcement.id == announcement.id
     )
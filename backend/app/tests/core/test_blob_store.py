@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from app.core.blob_store import BlobStore
+from app.utils.hashing import sha256_file
+
+
+def test_put_file_is_content_addressed(tmp_path: Path):
+    store = BlobStore(tmp_path / "blobs", suffix=".pdf")
+    src = tmp_path / "a.pdf"
+    src.write_bytes(b"%PDF-1.4 same content")
+
+    digest = store.put_file(src)
+
+    assert digest == sha256_file(src)
+    assert store.path_for(digest) == (
+        tmp_path / "blobs" / digest[:2] / digest[2:4] / f"{digest}.pdf"
+    )
+    assert store.path_for(digest).read_bytes() == src.read_bytes()
+    assert store.verify(digest)
+
+
+def test_put_file_deduplicates_identical_content(tmp_path: Path):
+    store = BlobStore(tmp_path / "blobs", suffix=".pdf")
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    first.write_bytes(b"%PDF-1.4 reposted notice")
+    second.write_bytes(b"%PDF-1.4 reposted notice")
+
+    first_digest = store.put_file(first, move=True)
+    second_digest = store.put_file(second, move=True)
+
+    assert first_digest == second_digest
+    assert not first.exists() and not second.exists()
+    assert len(list((tmp_path / "blobs").rglob("*.pdf"))) == 1
+    assert not list((tmp_path / "blobs").rglob("*.tmp"))
+
+
+def test_verify_detects_corruption(tmp_path: Path):
+    store = BlobStore(tmp_path / "blobs")
+    src = tmp_path / "a.pdf"
+    src.write_bytes(b"original")
+    digest = store.put_file(src)
+
+    store.path_for(digest).write_bytes(b"tampered")
+
+    assert not store.verify(digest)
+    assert not store.verify("0" * 64)
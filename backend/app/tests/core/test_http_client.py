@@ -0,0 +1,122 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import http_client
+from app.core.http_client import AsyncHTTPClient
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        # Records the backoff instead of waiting; a zero sleep still yields.
+        if delay:
+            delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", sleep)
+    return delays
+
+
+def _client(handler, **kwargs) -> AsyncHTTPClient:
+    kwargs.setdefault("max_retries", 2)
+    kwargs.setdefault("backoff", 1.0)
+    return AsyncHTTPClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_retries_retryable_status_codes_with_backoff(no_backoff_sleep) -> None:
+    statuses = iter([503, 429, 200])
+    client = _client(lambda request: httpx.Response(next(statuses)))
+
+    response = await client.get("https://example.com/a")
+
+    assert response.status_code == 200
+    # Exponential backoff with up to 100% jitter.
+    assert len(no_backoff_sleep) == 2
+    assert 1.0 <= no_backoff_sleep[0] <= 2.0
+    assert 2.0 <= no_backoff_sleep[1] <= 4.0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries() -> None:
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    client = _client(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("https://example.com/a")
+    assert len(calls) == 3
+
+    # Other errors are not retried.
+    calls.clear()
+    client = _client(lambda request: calls.append(request) or httpx.Response(404))
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("https://example.com/a")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_transport_errors() -> None:
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    assert (await _client(handler).get("https://example.com/a")).status_code == 200
+
+    attempts.clear()
+    client = _client(handler, max_retries=1)
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://example.com/a")
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrent_requests_per_host() -> None:
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    client = _client(handler, per_host_limit=2)
+    await asyncio.gather(
+        *(client.get(f"https://a.example/{i}") for i in range(6)),
+        *(client.get(f"https://b.example/{i}") for i in range(6)),
+    )
+
+    assert peak == {"a.example": 2, "b.example": 2}
+
+
+def test_client_of_a_previous_loop_is_closed() -> None:
+    client = _client(lambda request: httpx.Response(200))
+
+    async def use():
+        await client.get("https://example.com/a")
+        return client._client
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+
+    assert first is not second
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(client.aclose())
+    assert second.is_closed
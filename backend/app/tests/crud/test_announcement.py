@@ -1,6 +1,8 @@
 import pytest
 
+from app.crud import crud_announcement
 from app.models.announcement import Announcement
+from app.schemas.announcement import AnnouncementCreate, hash_raw_data
 from app.tests.test_factories import TestDataFactory
 
 
@@ -58,3 +60,45 @@ async def test_delete_announcement(
         Announcement, Announcement.id == announcement.id
     )
     assert announcement_deleted is None
+
+
+@pytest.mark.asyncio
+async def test_get_raw_data_hashes(
+    test_factory: TestDataFactory,
+    housing_data: dict,
+    announcement_filename: str,
+):
+    announcement = await test_factory.create_announcement(
+        housing_data, filename=announcement_filename
+    )
+
+    hashes = await crud_announcement.get_raw_data_hashes(
+        test_factory.engine, ids=[announcement.id, "unknown_id"]
+    )
+
+    assert hashes == {announcement.id: announcement.raw_data_hash}
+    # The hash ignores fields we add on top of the API item
+    assert announcement.raw_data_hash == hash_raw_data(housing_data)
+
+
+@pytest.mark.asyncio
+async def test_sync_from_source(
+    test_factory: TestDataFactory,
+    housing_data: dict,
+    announcement_filename: str,
+):
+    announcement = await test_factory.create_announcement(
+        housing_data, filename=announcement_filename
+    )
+    changed_data = {**housing_data, "sttusNm": "마감"}
+
+    updated = await crud_announcement.sync_from_source(
+        test_factory.engine,
+        announcement,
+        AnnouncementCreate(**changed_data, type=announcement.type),
+    )
+
+    assert updated.status_name == "마감"
+    assert updated.filename == announcement_filename
+    assert updated.raw_data_hash == hash_raw_data(changed_data)
+    assert updated.raw_data_hash != hash_raw_data(housing_data)
@@ -0,0 +1,162 @@
+from datetime import date, timedelta
+
+import pytest
+from odmantic import query
+
+from app.core.db import init_db
+from app.crud import crud_announcement
+from app.models.announcement import Announcement
+from app.schemas.announcement import AnnouncementListRequest
+
+# Every filter of AnnouncementListRequest, alone and combined.
+FILTERS = {
+    "none": {},
+    "province": {"provinceName": "서울특별시"},
+    "region": {"provinceName": "서울특별시", "districtName": "강남구"},
+    "district": {"districtName": "강남구"},
+    "supply_type": {"supplyTypeName": "공공임대"},
+    "house_type": {"houseTypeName": "아파트"},
+    "begin_date": {"beginDate": "2024-03-01"},
+    "end_date": {"endDate": "2024-03-31"},
+    "name": {"announcementName": "테스트"},
+    "open": {"announcementStatus": "open"},
+    "receiving": {"announcementStatus": "receiving"},
+    "closed": {"announcementStatus": "closed"},
+    "combined": {
+        "provinceName": "서울특별시",
+        "districtName": "강남구",
+        "supplyTypeName": "공공임대",
+        "announcementStatus": "receiving",
+    },
+}
+PROVINCE = (+Announcement.province_name,)
+DISTRICT = (+Announcement.district_name,)
+# Prefixes of the (prefix, sort field, _id) indexes that serve a filter and the
+# sort together, so the first page is read without a blocking sort.
+SORTED_INDEX_PREFIXES = {
+    "none": [()],
+    "province": [PROVINCE],
+    "district": [DISTRICT],
+    "region": [PROVINCE, DISTRICT],
+    "combined": [PROVINCE, DISTRICT],
+}
+LIMIT = 10
+MATCHING = 33
+OTHER_REGION = 20
+
+
+def _stages(plan) -> set[str]:
+    if isinstance(plan, list):
+        return set().union(*(_stages(p) for p in plan))
+    if not isinstance(plan, dict):
+        return set()
+    stages = {plan["stage"]} if "stage" in plan else set()
+    return stages.union(*(_stages(value) for value in plan.values()))
+
+
+def _index_scans(plan) -> list[tuple[str, ...]]:
+    """The key patterns of the index scans in `plan`."""
+    if isinstance(plan, list):
+        return [key for p in plan for key in _index_scans(p)]
+    if not isinstance(plan, dict):
+        return []
+    keys = [tuple(plan["keyPattern"])] if plan.get("stage") == "IXSCAN" else []
+    return keys + [key for value in plan.values() for key in _index_scans(value)]
+
+
+async def _seed(test_factory, housing_data: dict) -> None:
+    """
+    Receiving announcements in 서울특별시 강남구, and announcements of another
+    region that come first in every sort order: an index that does not narrow
+    the region has to step over all of them.
+    """
+    today = date.today()
+    collection = test_factory.engine.get_collection(Announcement)
+    regions = [
+        # (ID prefix, count, province, district, first application, first end,
+        # first view count)
+        ("ann", MATCHING, "서울특별시", "강남구", date(2024, 1, 1), today, 0),
+        (
+            "other",
+            OTHER_REGION,
+            "부산광역시",
+            "해운대구",
+            date(2030, 1, 1),
+            date(2020, 1, 1),
+            1000,
+        ),
+    ]
+    for prefix, count, province, district, applied, ends, views in regions:
+        for i in range(count):
+            await test_factory.create_announcement(
+                {
+                    **housing_data,
+                    "pblancId": f"{prefix}{i}",
+                    "brtcNm": province,
+                    "signguNm": district,
+                    "rcritPblancDe": (applied + timedelta(days=i)).strftime("%Y%m%d"),
+                    "beginDe": "20240101",
+                    "endDe": (ends + timedelta(days=i + 1)).strftime("%Y%m%d"),
+                }
+            )
+            await collection.update_one(
+                {"_id": f"{prefix}{i}"}, {"$set": {"view_count": views + i}}
+            )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("with_cursor", [False, True])
+@pytest.mark.parametrize("sort_type", ["latest", "view", "deadline"])
+@pytest.mark.parametrize("filter_name", FILTERS)
+async def test_announcement_listing_uses_an_index(
+    test_factory, housing_data, filter_name, sort_type, with_cursor
+):
+    engine = test_factory.engine
+    await init_db(engine)
+    await _seed(test_factory, housing_data)
+
+    request = AnnouncementListRequest(
+        limit=LIMIT, sortType=sort_type, **FILTERS[filter_name]
+    )
+    conditions = request.get_query_conditions(Announcement)
+    sort_field, descending = request.get_sort_key()
+    cursor = None
+    if with_cursor:
+        # A page into the listing.
+        _, cursor = await crud_announcement.get_page(
+            engine,
+            *conditions,
+            sort_field=sort_field,
+            descending=descending,
+            limit=4,
+        )
+    queries, sort = crud_announcement.build_page_query(
+        *conditions, sort_field=sort_field, descending=descending, cursor=cursor
+    )
+
+    explained = (
+        await engine.get_collection(Announcement)
+        .find(
+            query.and_(*queries) if queries else {},
+            sort=[item for expression in sort for item in expression.items()],
+        )
+        .limit(request.limit + 1)
+        .explain()
+    )
+
+    winning_plan = explained["queryPlanner"]["winningPlan"]
+    stages = _stages(winning_plan)
+    assert "COLLSCAN" not in stages, winning_plan
+    if filter_name not in SORTED_INDEX_PREFIXES:
+        return
+    sorted_indexes = {
+        (*prefix, +getattr(Announcement, sort_field), "_id")
+        for prefix in SORTED_INDEX_PREFIXES[filter_name]
+    }
+    index_scans = _index_scans(winning_plan)
+    assert index_scans, winning_plan
+    assert set(index_scans) <= sorted_indexes, winning_plan
+    assert "SORT" not in stages, winning_plan
+    # Only the page is read, not the other region or the pages before it.
+    total_keys_examined = explained["executionStats"]["totalKeysExamined"]
+    assert total_keys_examined <= 2 * (request.limit + 1), explained["executionStats"]
@@ -0,0 +1,41 @@
+import pytest
+
+from app.crud import crud_block
+from app.enums import BlockType
+from app.schemas.block import BlockBase
+from app.tests.test_factories import TestDataFactory
+
+
+def _block(page: int, y: float) -> BlockBase:
+    return BlockBase(
+        page=page,
+        bbox=[0.1, y, 0.9, y + 0.1],
+        type=BlockType.PLAIN_TEXT,
+        confidence=0.9,
+        model="YOLOv10",
+    )
+
+
+@pytest.mark.asyncio
+async def test_replace_for_announcement(test_factory: TestDataFactory):
+    engine = test_factory.engine
+    await crud_block.replace_for_announcement(
+        engine, announcement_id="a", blocks=[_block(1, 0.1), _block(3, 0.1)]
+    )
+    await crud_block.replace_for_announcement(
+        engine,
+        announcement_id="a",
+        blocks=[_block(2, 0.5), _block(1, 0.2), _block(2, 0.1)],
+    )
+    await crud_block.replace_for_announcement(
+        engine, announcement_id="b", blocks=[_block(1, 0.1)]
+    )
+
+    blocks = await crud_block.get_by_announcement(engine, announcement_id="a")
+    assert [block.page for block in blocks] == [1, 2, 2]
+    assert blocks[0].type == BlockType.PLAIN_TEXT
+
+    page_two = await crud_block.get_by_announcement(
+        engine, announcement_id="a", pages=[2]
+    )
+    assert len(page_two) == 2
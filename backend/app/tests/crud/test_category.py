@@ -2,6 +2,9 @@ from datetime import datetime, timezone  # Required for type checking
 
 import pytest
 
+from app.crud import crud_category
+from app.crud.base import BulkCreateError
+from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 from app.tests.test_factories import TestDataFactory
 
@@ -138,3 +141,84 @@ async def test_delete_category_raises_not_implemented(
 
     with pytest.raises(NotImplementedError):
         await test_factory.delete_many_categories(announcement.id)
+
+
+@pytest.mark.asyncio
+async def test_create_many_reports_failed_documents(
+    test_factory: TestDataFactory,
+) -> None:
+    """A duplicate in an unordered bulk insert fails alone and is reported."""
+    existing = (
+        await crud_category.create_many(
+            test_factory.engine, [CategoryCreate(announcement_id="a", name="A")]
+        )
+    )[0]
+    new = crud_category.build(CategoryCreate(announcement_id="a", name="B"))
+
+    with pytest.raises(BulkCreateError) as exc_info:
+        await crud_category.insert_many(test_factory.engine, [existing, new])
+
+    assert exc_info.value.created == [new]
+    assert [error["index"] for error in exc_info.value.errors] == [0]
+    assert exc_info.value.errors[0]["code"] == 11000
+    stored = await crud_category.get_many(
+        test_factory.engine, Category.announcement_id == "a"
+    )
+    assert sorted(category.name for category in stored) == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_get_for_user_merges_only_the_users_versions(
+    test_factory: TestDataFactory,
+) -> None:
+    engine = test_factory.engine
+    originals = await crud_category.create_many(
+        engine,
+        [CategoryCreate(announcement_id="a", name=f"orig-{i}") for i in range(150)],
+    )
+    await crud_category.create_many(
+        engine,
+        [
+            # Another user's version and creation are never shown.
+            CategoryCreate(
+                announcement_id="a",
+                user_id="other",
+                original_id=originals[0].id,
+                name="other-version",
+            ),
+            CategoryCreate(announcement_id="a", user_id="other", name="other-own"),
+            CategoryCreate(
+                announcement_id="a",
+                user_id="me",
+                original_id=originals[1].id,
+                name="my-version",
+            ),
+            CategoryCreate(
+                announcement_id="a",
+                user_id="me",
+                original_id=originals[2].id,
+                name="my-deleted-version",
+                is_deleted=True,
+            ),
+            CategoryCreate(
+                announcement_id="a",
+                user_id="me",
+                original_id="gone",
+                name="my-orphan-version",
+            ),
+            CategoryCreate(announcement_id="a", user_id="me", name="my-own"),
+            CategoryCreate(
+                announcement_id="a", user_id="me", name="my-deleted", is_deleted=True
+            ),
+            CategoryCreate(announcement_id="b", name="other-announcement"),
+        ],
+    )
+
+    merged = await crud_category.get_for_user(engine, announcement_id="a", user_id="me")
+    names = [category.name for category in merged]
+
+    # 150 originals, one replaced by my version and one hidden, then my own.
+    assert len(names) == 150
+    assert {"orig-0", "my-version", "orig-3"} <= set(names)
+    assert names[-1] == "my-own"
+    assert not {"orig-1", "orig-2", "other-version", "other-own"} & set(names)
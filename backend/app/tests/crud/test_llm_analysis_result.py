@@ -0,0 +1,82 @@
+import pytest
+
+from app.crud import crud_llm_analysis_result
+from app.enums import AnnouncementType
+from app.schemas.llm_analysis_result import LLMAnalysisResultCreate
+from app.tests.test_factories import TestDataFactory
+
+
+@pytest.mark.asyncio
+async def test_get_analyzed_models(test_factory: TestDataFactory) -> None:
+    for announcement_id, model in [
+        ("ann-1", "gemini/model-a"),
+        ("ann-1", "openai/model-b"),
+        ("ann-2", "gemini/model-a"),
+        ("ann-2", "gemini/other-model"),
+    ]:
+        await crud_llm_analysis_result.create(
+            test_factory.engine,
+            LLMAnalysisResultCreate(
+                announcement_type=AnnouncementType.PUBLIC_LEASE,
+                announcement_id=announcement_id,
+                model=model,
+                raw_response={},
+            ),
+        )
+
+    analyzed = await crud_llm_analysis_result.get_analyzed_models(
+        test_factory.engine, models=["gemini/model-a", "openai/model-b"]
+    )
+
+    assert analyzed == {
+        "ann-1": {"gemini/model-a", "openai/model-b"},
+        "ann-2": {"gemini/model-a"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_repair_rates(test_factory: TestDataFactory) -> None:
+    for announcement_id, structured_output, repair_count in [
+        ("ann-1", False, 2),
+        ("ann-2", False, 0),
+        ("ann-3", True, 0),
+        ("ann-4", True, 1),
+        ("ann-5", True, 0),
+    ]:
+        await crud_llm_analysis_result.create(
+            test_factory.engine,
+            LLMAnalysisResultCreate(
+                announcement_type=AnnouncementType.PUBLIC_LEASE,
+                announcement_id=announcement_id,
+                model="gemini/model-a",
+                raw_response={},
+                structured_output=structured_output,
+                repair_count=repair_count,
+                repair_attempts=[{"total_tokens": 100}] * repair_count,
+            ),
+        )
+
+    rates = await crud_llm_analysis_result.get_repair_rates(test_factory.engine)
+
+    assert rates == [
+        {
+            "model": "gemini/model-a",
+            "structured_output": False,
+            "results": 2,
+            "repaired_results": 1,
+            "repairs": 2,
+            "repair_calls": 2,
+            "repair_tokens": 200,
+            "repair_rate": 0.5,
+        },
+        {
+            "model": "gemini/model-a",
+            "structured_output": True,
+            "results": 3,
+            "repaired_results": 1,
+            "repairs": 1,
+            "repair_calls": 1,
+            "repair_tokens": 100,
+            "repair_rate": 1 / 3,
+        },
+    ]
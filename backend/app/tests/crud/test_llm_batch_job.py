@@ -0,0 +1,45 @@
+import pytest
+
+from app.crud import crud_llm_batch_job
+from app.schemas.llm_batch_job import LLMBatchJobCreate, LLMBatchJobUpdate
+from app.tests.test_factories import TestDataFactory
+
+
+@pytest.mark.asyncio
+async def test_get_pending_pairs_lists_running_batches_only(
+    test_factory: TestDataFactory,
+):
+    engine = test_factory.engine
+    running = await crud_llm_batch_job.create(
+        engine,
+        LLMBatchJobCreate(
+            provider="openai",
+            model="openai/gpt-4.1",
+            batch_id="batch-1",
+            requests=[
+                {"custom_id": "a:0", "announcement_id": "a", "pages": [1, 2]},
+                {"custom_id": "a:1", "announcement_id": "a", "pages": [3]},
+                {"custom_id": "b:0", "announcement_id": "b", "pages": None},
+            ],
+        ),
+    )
+    completed = await crud_llm_batch_job.create(
+        engine,
+        LLMBatchJobCreate(
+            provider="gemini",
+            model="gemini/gemini-2.5-pro",
+            batch_id="batches/2",
+            requests=[{"custom_id": "c:0", "announcement_id": "c", "pages": None}],
+        ),
+    )
+    await crud_llm_batch_job.update(
+        engine, completed, LLMBatchJobUpdate(status="completed")
+    )
+
+    assert await crud_llm_batch_job.get_pending_pairs(engine) == {
+        ("a", "openai/gpt-4.1"),
+        ("b", "openai/gpt-4.1"),
+    }
+    assert [job.id for job in await crud_llm_batch_job.get_running(engine)] == [
+        running.id
+    ]
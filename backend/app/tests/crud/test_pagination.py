@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.crud.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_query,
+)
+
+
+def test_cursor_round_trip() -> None:
+    value = datetime(2025, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor("created_at", value, "id-1")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "created_at") == (value, "id-1")
+    assert decode_cursor(encode_cursor("end_date", None, "id-2"), "end_date") == (
+        None,
+        "id-2",
+    )
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "", encode_cursor("views", 1, "x")])
+def test_invalid_cursors_are_rejected(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "created_at")
+
+
+def test_keyset_query_places_nulls_like_mongodb() -> None:
+    # Ascending: nulls come first, so every non-null value follows them.
+    assert keyset_query("end_date", None, "b", descending=False) == {
+        "$or": [
+            {"end_date": None, "_id": {"$gt": "b"}},
+            {"end_date": {"$ne": None}},
+        ]
+    }
+    # Descending: nulls come last.
+    assert keyset_query("end_date", 5, "b", descending=True) == {
+        "$or": [
+            {"end_date": {"$lt": 5}},
+            {"end_date": 5, "_id": {"$lt": "b"}},
+            {"end_date": None},
+        ]
+    }
+    assert keyset_query("end_date", None, "b", descending=True) == {
+        "end_date": None,
+        "_id": {"$lt": "b"},
+    }
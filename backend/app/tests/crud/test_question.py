@@ -1,5 +1,10 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
+from app.crud import crud_question
+from app.crud.pagination import InvalidCursorError, encode_cursor
+from app.models.question import Question
 from app.schemas.question import QuestionCreate, QuestionUpdate
 
 
@@ -100,3 +105,38 @@ async def test_update_question_non_existent(test_factory):
     # Verify that the question was not created
     fetched_after_attempt = await test_factory.get_question("nonexistentid")
     assert fetched_after_attempt is None
+
+
+@pytest.mark.asyncio
+async def test_get_page_follows_cursor_across_equal_sort_values(test_factory):
+    engine = test_factory.engine
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    # Two questions per timestamp, so pages split ties on the ID.
+    questions = [
+        Question(
+            title=f"Question {i}",
+            content="content",
+            user_id="test_user_id",
+            created_at=created_at + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    ]
+    await engine.save_all(questions)
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await crud_question.get_page(
+            engine, sort_field="created_at", limit=3, cursor=cursor
+        )
+        pages.append([question.id for question in page])
+        if cursor is None:
+            break
+
+    expected = sorted(questions, key=lambda q: (q.created_at, q.id), reverse=True)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [id for page in pages for id in page] == [q.id for q in expected]
+
+    with pytest.raises(InvalidCursorError):
+        await crud_question.get_page(
+            engine, sort_field="updated_at", cursor=encode_cursor("created_at", 1, "x")
+        )
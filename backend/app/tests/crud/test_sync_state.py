@@ -0,0 +1,64 @@
+import pytest
+
+from app.crud import crud_sync_state
+from app.enums import AnnouncementType
+from app.schemas.announcement import AnnouncementCreate
+from app.tests.test_factories import TestDataFactory
+
+
+def _announcement(housing_data: dict, pblanc_id: str, date: str) -> AnnouncementCreate:
+    return AnnouncementCreate(
+        **{**housing_data, "pblancId": pblanc_id, "rcritPblancDe": date},
+        type=AnnouncementType.PUBLIC_LEASE,
+    )
+
+
+@pytest.mark.asyncio
+async def test_advance_watermark_creates_state(
+    test_factory: TestDataFactory,
+    housing_data: dict,
+):
+    state = await crud_sync_state.advance_watermark(
+        test_factory.engine,
+        brtc_code="41",
+        announcements=[
+            _announcement(housing_data, "100", "20240301"),
+            _announcement(housing_data, "101", "20240305"),
+        ],
+    )
+
+    assert state.id == "41"
+    assert state.last_application_date == "20240305"
+    assert state.last_announcement_id == "101"
+
+    watermarks = await crud_sync_state.get_watermarks(
+        test_factory.engine, brtc_codes=["41", "11"]
+    )
+    assert list(watermarks) == ["41"]
+
+
+@pytest.mark.asyncio
+async def test_advance_watermark_never_moves_backwards(
+    test_factory: TestDataFactory,
+    housing_data: dict,
+):
+    await crud_sync_state.advance_watermark(
+        test_factory.engine,
+        brtc_code="41",
+        announcements=[_announcement(housing_data, "200", "20240401")],
+    )
+
+    state = await crud_sync_state.advance_watermark(
+        test_factory.engine,
+        brtc_code="41",
+        announcements=[_announcement(housing_data, "150", "20240310")],
+    )
+    assert state.last_application_date == "20240401"
+    assert state.last_announcement_id == "200"
+
+    state = await crud_sync_state.advance_watermark(
+        test_factory.engine,
+        brtc_code="41",
+        announcements=[_announcement(housing_data, "201", "20240401")],
+    )
+    assert state.last_announcement_id == "201"
@@ -0,0 +1,234 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from google.genai import types
+
+from app.llm_providers import openai_provider
+from app.llm_providers.batch import Batch, BatchBuilder, BatchRequest, to_jsonl
+from app.llm_providers.gemini_files import GeminiFileCache
+from app.llm_providers.gemini_provider import GeminiBatchClient, GeminiProvider
+from app.llm_providers.openai_provider import OpenAIBatchClient, OpenAIProvider
+from app.pdf_analysis.schemas import PublicLeaseStructuredOutput
+from app.tests.llm_providers.test_gemini_files import FakeFiles
+
+
+class FakeOpenAIBatchServer:
+    """In-memory stand-in for the OpenAI Files and Batch APIs."""
+
+    def __init__(self):
+        self.file_contents: dict[str, bytes] = {}
+        self.batches: dict[str, SimpleNamespace] = {}
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches_api = SimpleNamespace(
+            create=self._create_batch, retrieve=self.batches.__getitem__
+        )
+
+    @property
+    def client(self) -> SimpleNamespace:
+        return SimpleNamespace(files=self.files, batches=self.batches_api)
+
+    def _create_file(self, *, file, purpose):
+        assert purpose == "batch"
+        file_id = f"file-{len(self.file_contents)}"
+        self.file_contents[file_id] = file[1].read()
+        return SimpleNamespace(id=file_id)
+
+    def _content(self, file_id):
+        return SimpleNamespace(text=self.file_contents[file_id].decode())
+
+    def _create_batch(self, *, input_file_id, endpoint, completion_window, metadata):
+        batch_id = f"batch-{len(self.batches)}"
+        self.batches[batch_id] = SimpleNamespace(
+            status="in_progress",
+            input_file_id=input_file_id,
+            output_file_id=None,
+            error_file_id=None,
+            errors=None,
+        )
+        return SimpleNamespace(id=batch_id)
+
+    def complete(self, batch_id: str, failed: set[str] = frozenset()) -> None:
+        """Answers every request with its custom ID, except the `failed` ones."""
+        batch = self.batches[batch_id]
+        output, errors = [], []
+        for line in self.file_contents[batch.input_file_id].decode().splitlines():
+            custom_id = json.loads(line)["custom_id"]
+            if custom_id in failed:
+                errors.append(
+                    {
+                        "custom_id": custom_id,
+                        "response": {"status_code": 500, "body": {}},
+                    }
+                )
+                continue
+            body = {
+                "output": [
+                    {
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "output_text", "text": custom_id}],
+                    }
+                ]
+            }
+            output.append(
+                {"custom_id": custom_id, "response": {"status_code": 200, "body": body}}
+            )
+        batch.status = "completed"
+        batch.output_file_id = f"file-{len(self.file_contents)}"
+        self.file_contents[batch.output_file_id] = to_jsonl(output)
+        batch.error_file_id = f"file-{len(self.file_contents)}"
+        self.file_contents[batch.error_file_id] = to_jsonl(errors)
+
+
+class FakeGeminiBatchServer:
+    """In-memory stand-in for the Gemini File and Batch APIs."""
+
+    def __init__(self):
+        self.files = FakeFiles()
+        self.file_contents: dict[str, bytes] = {}
+        self.jobs: dict[str, types.BatchJob] = {}
+        upload = self.files.upload
+
+        def upload_and_keep(*, file, config):
+            uploaded = upload(file=file, config=config)
+            self.file_contents[uploaded.name] = self.files.uploads[-1]
+            return uploaded
+
+        self.files.upload = upload_and_keep
+        self.files.download = lambda *, file: self.file_contents[file]
+        self.batches = SimpleNamespace(
+            create=self._create, get=lambda *, name: self.jobs[name]
+        )
+
+    def _create(self, *, model, src, config):
+        name = f"batches/{len(self.jobs)}"
+        self.jobs[name] = types.BatchJob(
+            name=name,
+            state=types.JobState.JOB_STATE_RUNNING,
+            src=types.BatchJobSource(file_name=src),
+        )
+        return self.jobs[name]
+
+    def complete(self, name: str, failed: set[str] = frozenset()) -> None:
+        job = self.jobs[name]
+        lines = []
+        for line in self.file_contents[job.src.file_name].decode().splitlines():
+            key = json.loads(line)["key"]
+            if key in failed:
+                lines.append({"key": key, "error": {"code": 13, "message": "boom"}})
+                continue
+            lines.append(
+                {
+                    "key": key,
+                    "response": {
+                        "candidates": [
+                            {"content": {"role": "model", "parts": [{"text": key}]}}
+                        ],
+                        "usageMetadata": {"promptTokenCount": 10},
+                    },
+                }
+            )
+        self.file_contents["files/results"] = to_jsonl(lines)
+        job.state = types.JobState.JOB_STATE_SUCCEEDED
+        job.dest = types.BatchJobDestination(file_name="files/results")
+
+
+def _requests(pdf_path: Path, count: int) -> list[BatchRequest]:
+    return [
+        BatchRequest(
+            custom_id=f"ann-{i}:0",
+            pdf_path=pdf_path,
+            system_prompt="system",
+            user_prompt="user",
+            model_name="model",
+            response_schema=PublicLeaseStructuredOutput,
+        )
+        for i in range(count)
+    ]
+
+
+def _build(builder: BatchBuilder, groups: list[list[dict]]) -> list[list[dict]]:
+    batches = [builder.add(group, [group[0]["g"]]) for group in groups]
+    batches.append(builder.flush())
+    return [batch.lines for batch in batches if batch is not None]
+
+
+def test_batch_builder_respects_limits_without_splitting_groups() -> None:
+    lines = [{"g": g, "i": i} for g in range(3) for i in range(2)]
+    groups = [lines[0:2], lines[2:4], lines[4:6]]
+    line_size = len(to_jsonl([lines[0]]))
+
+    assert _build(BatchBuilder(max_requests=4, max_bytes=10**6), groups) == [
+        lines[0:4],
+        lines[4:6],
+    ]
+    # A group that would straddle the request limit starts the next batch.
+    assert _build(BatchBuilder(max_requests=3, max_bytes=10**6), groups) == groups
+    assert _build(BatchBuilder(max_requests=10, max_bytes=5 * line_size), groups) == [
+        lines[0:4],
+        lines[4:6],
+    ]
+    # A group over the limits on its own still gets a batch of its own.
+    assert _build(BatchBuilder(max_requests=1, max_bytes=1), groups) == groups
+
+    builder = BatchBuilder(max_requests=4, max_bytes=10**6)
+    assert builder.add(groups[0], ["a"]) is None
+    assert builder.add(groups[1], ["b"]) is None
+    assert builder.add(groups[2], ["c"]) == Batch(lines[0:4], ["a", "b"])
+    assert builder.flush() == Batch(lines[4:6], ["c"])
+    assert builder.flush() is None
+
+
+def test_openai_batch_round_trip(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(
+        openai_provider,
+        "_image_contents",
+        lambda pdf_path, page_numbers: [{"type": "input_text", "text": "page"}],
+    )
+    server = FakeOpenAIBatchServer()
+    client = OpenAIBatchClient(server.client)
+
+    lines = [client.request_line(r) for r in _requests(tmp_path / "a.pdf", 3)]
+    batch_id = client.submit("model", lines, "test")
+
+    assert lines[0]["url"] == "/v1/responses"
+    text_format = lines[0]["body"]["text"]["format"]
+    assert text_format["type"] == "json_schema"
+    assert text_format["strict"] is True
+    assert text_format["schema"]["additionalProperties"] is False
+    assert client.status(batch_id).state == "running"
+
+    server.complete(batch_id, failed={"ann-1:0"})
+    results = client.results(batch_id)
+
+    assert client.status(batch_id).state == "completed"
+    assert results["ann-1:0"] is None
+    assert OpenAIProvider().text_from_raw_response(results["ann-0:0"]) == "ann-0:0"
+    assert set(results) == {"ann-0:0", "ann-1:0", "ann-2:0"}
+
+
+def test_gemini_batch_round_trip(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "a.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 a")
+    server = FakeGeminiBatchServer()
+    client = GeminiBatchClient(server, GeminiFileCache(server.files))
+
+    lines = [client.request_line(r) for r in _requests(pdf_path, 3)]
+    name = client.submit("model", lines, "test")
+
+    # The PDF is uploaded once and referenced by every request.
+    parts = lines[0]["request"]["contents"][0]["parts"]
+    assert parts[1]["file_data"]["file_uri"] == "https://files.example/files/1"
+    assert lines[0]["request"]["generation_config"]["response_mime_type"] == (
+        "application/json"
+    )
+    assert client.status(name).state == "running"
+
+    server.complete(name, failed={"ann-2:0"})
+    results = client.results(name)
+
+    assert client.status(name).state == "completed"
+    assert results["ann-2:0"] is None
+    assert GeminiProvider().text_from_raw_response(results["ann-1:0"]) == "ann-1:0"
+    assert results["ann-1:0"]["usage_metadata"]["prompt_token_count"] == 10
@@ -0,0 +1,128 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.llm_providers.base_provider import LLMProviderStrategy
+from app.llm_providers.cache import CachedLLMProvider, LLMResponseCache
+
+
+class CountingProvider(LLMProviderStrategy):
+    def __init__(self):
+        self.calls = 0
+
+    def generate_from_pdf(
+        self,
+        pdf_path,
+        system_prompt,
+        user_prompt,
+        model_name,
+        page_numbers=None,
+        response_schema=None,
+    ):
+        self.calls += 1
+        return f"content-{self.calls}", {"call": self.calls}
+
+    def generate_text(self, system_prompt, user_prompt, model_name):
+        return None
+
+    def text_from_raw_response(self, raw_response):
+        return None
+
+
+def test_cached_provider_hits_on_same_pdf_prompt_and_model(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "a.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 a")
+    copy_path = tmp_path / "b.pdf"
+    copy_path.write_bytes(b"%PDF-1.4 a")
+
+    inner = CountingProvider()
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+    provider = CachedLLMProvider(inner, "gemini", cache)
+
+    first = provider.generate_from_pdf(pdf_path, "system", "user", "model")
+    # Same content under another path is still a hit.
+    second = provider.generate_from_pdf(copy_path, "system", "user", "model")
+    assert first == second == ("content-1", {"call": 1})
+    assert inner.calls == 1
+
+    provider.generate_from_pdf(pdf_path, "system", "other user prompt", "model")
+    provider.generate_from_pdf(pdf_path, "system", "user", "other-model")
+    assert inner.calls == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=100)
+    cache.set("a", "pdf-a", "m", "x" * 40, {})
+    cache.set("b", "pdf-b", "m", "x" * 40, {})
+    assert cache.get("a") is not None  # "b" is now the least recently used
+
+    cache.set("c", "pdf-c", "m", "x" * 40, {})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_cache_invalidate(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+    cache.set("a", "pdf-a", "gemini/m1", "a", {})
+    cache.set("b", "pdf-a", "openai/m2", "b", {})
+    cache.set("c", "pdf-c", "gemini/m1", "c", {})
+
+    assert cache.invalidate(pdf_hash="pdf-a", model="gemini/m1") == 1
+    assert cache.invalidate(model="gemini/m1") == 1
+    assert cache.get("b") is not None
+    assert cache.invalidate() == 1
+    assert cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_async_replays_hit_as_chunk(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "a.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 a")
+
+    inner = CountingProvider()
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+    provider = CachedLLMProvider(inner, "gemini", cache)
+
+    chunks = []
+    await provider.agenerate_from_pdf(pdf_path, "system", "user", "model")
+    result = await provider.agenerate_from_pdf(
+        pdf_path, "system", "user", "model", on_chunk=chunks.append
+    )
+
+    assert result == ("content-1", {"call": 1})
+    assert chunks == ["content-1"]
+    assert inner.calls == 1
+
+
+def test_cache_tracks_total_size_and_closes_connections(
+    tmp_path: Path, monkeypatch
+) -> None:
+    connections = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        connections.append(connect(*args, **kwargs))
+        return connections[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+
+    def sizes() -> tuple[int, int]:
+        with cache._connect() as conn:
+            (total,) = conn.execute("SELECT total_size FROM llm_response_stats")
+            (summed,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_response")
+        return total[0], summed[0]
+
+    cache.set("a", "pdf-a", "m", "x" * 10, {})
+    cache.set("b", "pdf-b", "m", "x" * 20, {})
+    cache.set("a", "pdf-a", "m", "x" * 5, {})  # replaced in place; "{}" adds 2
+    assert sizes() == (7 + 22, 7 + 22)
+    cache.invalidate(pdf_hash="pdf-b")
+    assert sizes() == (7, 7)
+
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
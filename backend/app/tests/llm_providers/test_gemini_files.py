@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from google.genai import errors, types
+
+from app.llm_providers import gemini_files, gemini_provider
+from app.llm_providers.gemini_files import GeminiFileCache
+
+
+class FakeFiles:
+    """In-memory stand-in for the Gemini File API."""
+
+    def __init__(self, ttl: timedelta = timedelta(hours=48), processing_polls=0):
+        self.ttl = ttl
+        self.processing_polls = processing_polls
+        self.uploads: list[bytes] = []
+
+    def _file(self, name: str, state: types.FileState) -> types.File:
+        return types.File(
+            name=name,
+            uri=f"https://files.example/{name}",
+            mime_type="application/pdf",
+            state=state,
+            expiration_time=datetime.now(timezone.utc) + self.ttl,
+        )
+
+    def upload(self, *, file, config):
+        data = file.read_bytes() if isinstance(file, Path) else file.read()
+        self.uploads.append(data)
+        state = (
+            types.FileState.PROCESSING
+            if self.processing_polls
+            else types.FileState.ACTIVE
+        )
+        return self._file(f"files/{len(self.uploads)}", state)
+
+    def get(self, *, name):
+        self.processing_polls -= 1
+        state = (
+            types.FileState.PROCESSING
+            if self.processing_polls
+            else types.FileState.ACTIVE
+        )
+        return self._file(name, state)
+
+
+def test_upload_is_reused_until_invalidated(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "a.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 a")
+    files = FakeFiles()
+    cache = GeminiFileCache(files)
+
+    first = cache.get_or_upload(pdf_path, "digest-a")
+    second = cache.get_or_upload(pdf_path, "digest-a")
+    cache.get_or_upload(b"%PDF-1.4 b")
+
+    assert first == second
+    assert files.uploads == [b"%PDF-1.4 a", b"%PDF-1.4 b"]
+
+    cache.invalidate("digest-a")
+    third = cache.get_or_upload(pdf_path, "digest-a")
+
+    assert third.name == "files/3"
+    assert third.part().file_data.file_uri == third.uri
+
+
+def test_handles_close_to_expiry_are_not_kept() -> None:
+    files = FakeFiles(ttl=timedelta(minutes=30))
+    cache = GeminiFileCache(files, ttl_margin=3600)
+
+    cache.get_or_upload(b"%PDF-1.4 a", "digest-a")
+    cache.get_or_upload(b"%PDF-1.4 a", "digest-a")
+
+    assert len(files.uploads) == 2
+
+
+def test_processing_upload_is_polled_until_active(monkeypatch) -> None:
+    monkeypatch.setattr(gemini_files, "_PROCESSING_POLL_INTERVAL", 0)
+    files = FakeFiles(processing_polls=2)
+    cache = GeminiFileCache(files)
+
+    handle = cache.get_or_upload(b"%PDF-1.4 a", "digest-a")
+
+    assert handle.name == "files/1"
+    assert files.processing_polls == 0
+
+
+def test_provider_uploads_again_when_the_file_is_gone(
+    tmp_path: Path, monkeypatch
+) -> None:
+    pdf_path = tmp_path / "a.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 a")
+    files = FakeFiles()
+    cache = GeminiFileCache(files)
+    cache.get_or_upload(
+        pdf_path, gemini_provider.pdf_blob_store.digest_for_path(pdf_path)
+    )
+    requested_uris = []
+
+    def generate_content(*, contents, **_kwargs):
+        uri = contents[1].file_data.file_uri
+        requested_uris.append(uri)
+        if len(requested_uris) == 1:
+            raise errors.ClientError(404, {"error": {"message": "not found"}})
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=[types.Part(text="ok")])
+                )
+            ]
+        )
+
+    monkeypatch.setattr(gemini_provider, "_file_cache", lambda: cache)
+    monkeypatch.setattr(gemini_provider, "_cached_prompt", lambda *_args: None)
+    monkeypatch.setattr(
+        gemini_provider.gemini_client.models, "generate_content", generate_content
+    )
+
+    content, _ = gemini_provider.GeminiProvider().generate_from_pdf(
+        pdf_path, "system", "user", "model"
+    )
+
+    assert content == "ok"
+    assert requested_uris == [
+        "https://files.example/files/1",
+        "https://files.example/files/2",
+    ]
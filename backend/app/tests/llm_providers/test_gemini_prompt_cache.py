@@ -0,0 +1,44 @@
+from google.genai import errors, types
+
+from app.llm_providers.gemini_prompt_cache import GeminiPromptCache
+
+
+class FakeCaches:
+    """In-memory stand-in for the Gemini context cache API."""
+
+    def __init__(self, min_prompt_length: int = 0):
+        self.min_prompt_length = min_prompt_length
+        self.created: list[str] = []
+
+    def create(self, *, model, config):
+        if len(config.system_instruction) < self.min_prompt_length:
+            raise errors.ClientError(400, {"error": {"message": "too small"}})
+        self.created.append(config.system_instruction)
+        return types.CachedContent(name=f"cachedContents/{len(self.created)}")
+
+
+def test_cache_is_created_once_per_model_and_prompt() -> None:
+    caches = FakeCaches()
+    cache = GeminiPromptCache(caches, ttl=600)
+
+    first = cache.get_or_create("model-a", "prompt")
+    second = cache.get_or_create("model-a", "prompt")
+    other_model = cache.get_or_create("model-b", "prompt")
+
+    assert first == second == "cachedContents/1"
+    assert other_model == "cachedContents/2"
+
+    cache.invalidate("model-a", "prompt")
+
+    assert cache.get_or_create("model-a", "prompt") == "cachedContents/3"
+
+
+def test_uncacheable_prompt_is_not_retried() -> None:
+    caches = FakeCaches(min_prompt_length=100)
+    cache = GeminiPromptCache(caches, ttl=600)
+
+    assert cache.get_or_create("model-a", "short") is None
+    caches.min_prompt_length = 0
+
+    assert cache.get_or_create("model-a", "short") is None
+    assert caches.created == []
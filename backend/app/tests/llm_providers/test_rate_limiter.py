@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from app.llm_providers import rate_limiter
+from app.llm_providers.rate_limiter import TokenBucketRateLimiter
+
+
+class Clock:
+    """Drives both the fake Redis server clock and the limiter's sleeps."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.slept: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    real_sleep = asyncio.sleep
+
+    async def async_sleep(seconds):
+        clock.sleep(seconds)
+        await real_sleep(0)
+
+    # Redis TIME in fakeredis reads time.time().
+    monkeypatch.setattr(time, "time", clock.time)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", async_sleep)
+    return clock
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+def _limiter(server, rpm=60, tpm=600, max_wait=60.0) -> TokenBucketRateLimiter:
+    return TokenBucketRateLimiter(
+        "gemini/model",
+        rpm=rpm,
+        tpm=tpm,
+        redis=fakeredis.FakeRedis(server=server),
+        async_redis=fakeredis.FakeAsyncRedis(server=server),
+        max_wait=max_wait,
+    )
+
+
+def test_buckets_refill_with_elapsed_time(server, clock) -> None:
+    limiter = _limiter(server)
+
+    for _ in range(6):
+        assert limiter.acquire(100) == 0
+    budget = limiter.budget()
+    assert budget["requests_left"] == pytest.approx(54)
+    assert budget["tokens_left"] == pytest.approx(0)
+
+    clock.now += 10  # 600 tpm refill 100 tokens, 60 rpm 10 requests
+    budget = limiter.budget()
+    assert budget["requests_left"] == pytest.approx(60)
+    assert budget["tokens_left"] == pytest.approx(100)
+
+
+def test_acquire_waits_for_the_missing_tokens(server, clock) -> None:
+    limiter = _limiter(server)
+    limiter.acquire(550)
+
+    # 150 tokens needed, 50 left: 100 tokens at 10 tokens/second.
+    assert limiter.acquire(150) == pytest.approx(10)
+    assert clock.slept == [pytest.approx(10)]
+    assert limiter.budget()["tokens_left"] == pytest.approx(0)
+
+
+@pytest.mark.usefixtures("clock")
+def test_acquire_waits_for_a_request_slot(server) -> None:
+    limiter = _limiter(server, rpm=2)
+    limiter.acquire(1)
+    limiter.acquire(1)
+
+    assert limiter.acquire(1) == pytest.approx(30)
+
+
+def test_acquire_gives_up_after_max_wait(server, clock) -> None:
+    limiter = _limiter(server, max_wait=5)
+    limiter.acquire(600)
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire(100)
+    assert clock.slept == []
+
+
+@pytest.mark.usefixtures("clock")
+def test_oversized_request_goes_through_a_full_bucket_into_debt(server) -> None:
+    limiter = _limiter(server)
+
+    assert limiter.acquire(900) == 0
+    assert limiter.budget()["tokens_left"] == pytest.approx(-300)
+
+    # The debt is repaid before the next request: 400 tokens at 10/second.
+    assert limiter.acquire(100) == pytest.approx(40)
+
+
+@pytest.mark.usefixtures("clock")
+def test_reconcile_refunds_and_charges_the_reported_usage(server) -> None:
+    limiter = _limiter(server)
+    limiter.acquire(300)
+
+    limiter.reconcile(reserved=300, used=100)
+    assert limiter.budget()["tokens_left"] == pytest.approx(500)
+
+    limiter.reconcile(reserved=100, used=700)
+    assert limiter.budget()["tokens_left"] == pytest.approx(-100)
+
+    # Unknown usage keeps the reservation.
+    limiter.reconcile(reserved=100, used=0)
+    assert limiter.budget()["tokens_left"] == pytest.approx(-100)
+
+
+@pytest.mark.usefixtures("clock")
+def test_budget_is_a_dry_run(server) -> None:
+    limiter = _limiter(server)
+
+    assert limiter.budget() == {
+        "rpm": 60,
+        "tpm": 600,
+        "requests_left": 60,
+        "tokens_left": 600,
+    }
+    assert limiter.budget()["requests_left"] == 60
+    assert fakeredis.FakeRedis(server=server).keys() == []
+
+
+@pytest.mark.usefixtures("clock")
+@pytest.mark.asyncio
+async def test_async_acquire_shares_the_buckets(server) -> None:
+    limiter = _limiter(server)
+
+    assert await limiter.aacquire(500) == 0
+    assert await limiter.aacquire(200) == pytest.approx(10)
+    await limiter.areconcile(reserved=200, used=50)
+
+    assert limiter.budget()["tokens_left"] == pytest.approx(150)
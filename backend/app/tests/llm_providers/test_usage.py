@@ -0,0 +1,52 @@
+from app.llm_providers.usage import extract_result_token_usage, extract_token_usage
+
+
+def test_extract_token_usage_gemini() -> None:
+    raw_response = {
+        "usage_metadata": {
+            "prompt_token_count": 1000,
+            "candidates_token_count": 200,
+            "thoughts_token_count": 50,
+            "total_token_count": 1250,
+            "cached_content_token_count": 600,
+        }
+    }
+    assert extract_token_usage(raw_response) == {
+        "input_tokens": 1000,
+        "output_tokens": 250,
+        "total_tokens": 1250,
+        "cached_tokens": 600,
+    }
+
+
+def test_extract_token_usage_openai() -> None:
+    raw_response = {
+        "usage": {
+            "input_tokens": 800,
+            "output_tokens": 100,
+            "input_tokens_details": {"cached_tokens": 512},
+        }
+    }
+    assert extract_token_usage(raw_response) == {
+        "input_tokens": 800,
+        "output_tokens": 100,
+        "total_tokens": 900,
+        "cached_tokens": 512,
+    }
+
+
+def test_extract_token_usage_missing() -> None:
+    assert extract_token_usage(None)["total_tokens"] == 0
+    assert extract_token_usage({"candidates": []})["total_tokens"] == 0
+
+
+def test_extract_result_token_usage_sums_chunks() -> None:
+    chunk = {"usage": {"input_tokens": 10, "output_tokens": 5}}
+    raw_response = {
+        "chunks": [
+            {"pages": [1, 2], "raw_response": chunk},
+            {"pages": [3], "raw_response": chunk},
+            {"pages": [4], "raw_response": None},
+        ]
+    }
+    assert extract_result_token_usage(raw_response)["total_tokens"] == 30
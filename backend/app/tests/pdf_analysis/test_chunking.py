@@ -0,0 +1,70 @@
+from app.enums import BlockType
+from app.pdf_analysis.chunking import (
+    make_page_windows,
+    merge_category_maps,
+    section_start_pages,
+)
+from app.schemas.block import BlockBase
+
+
+def _condition(content: str, page: int) -> dict:
+    return {"content": content, "section": "s", "page": page, "bbox": [[0, 0, 1, 1]]}
+
+
+def test_fixed_windows_with_overlap() -> None:
+    pages = list(range(1, 11))
+
+    assert make_page_windows(pages, window_size=4, overlap=1) == [
+        [1, 2, 3, 4],
+        [4, 5, 6, 7],
+        [7, 8, 9, 10],
+    ]
+    assert make_page_windows(pages, window_size=20) == [pages]
+    assert make_page_windows([], window_size=4) == []
+
+
+def test_windows_follow_sections() -> None:
+    pages = list(range(1, 13))
+
+    windows = make_page_windows(
+        pages, window_size=4, overlap=1, section_starts=[1, 3, 6, 7]
+    )
+
+    # Sections [1-2] [3-5] [6] [7-12]; the last one is longer than a window.
+    assert windows == [[1, 2], [3, 4, 5, 6], [7, 8, 9, 10], [10, 11, 12]]
+
+
+def test_section_start_pages() -> None:
+    blocks = [
+        BlockBase(
+            page=1, bbox=[0, 0.1, 1, 0.2], type=BlockType.TITLE, confidence=1, model="m"
+        ),
+        BlockBase(
+            page=2, bbox=[0, 0.8, 1, 0.9], type=BlockType.TITLE, confidence=1, model="m"
+        ),
+        BlockBase(
+            page=3, bbox=[0, 0.1, 1, 0.2], type=BlockType.TABLE, confidence=1, model="m"
+        ),
+        BlockBase(
+            page=4, bbox=[0, 0.2, 1, 0.3], type=BlockType.TITLE, confidence=1, model="m"
+        ),
+    ]
+    assert section_start_pages(blocks) == [1, 4]
+
+
+def test_merge_category_maps_dedupes_across_windows() -> None:
+    merged = merge_category_maps(
+        [
+            {"신청자격": [_condition("무주택 세대구성원", 4)]},
+            {
+                "신청자격": [
+                    _condition("무주택  세대구성원", 4),
+                    _condition("무주택 세대구성원", 9),
+                ],
+                "임대조건": [_condition("보증금 1,000만원", 5)],
+            },
+        ]
+    )
+
+    assert [c["page"] for c in merged["신청자격"]] == [4, 9]
+    assert len(merged["임대조건"]) == 1
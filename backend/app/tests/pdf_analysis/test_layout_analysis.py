@@ -0,0 +1,58 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import fitz
+
+from app.enums import BlockType
+from app.pdf_analysis.layout_analysis import LayoutAnalyzer
+from app.pdf_analysis.rendering import PageRenderer, RenderSettings
+
+
+def _value(value):
+    return SimpleNamespace(tolist=lambda: value, item=lambda: value)
+
+
+class FakeLayoutModel:
+    """Detects one plain text block per image and records the batch sizes."""
+
+    def __init__(self):
+        self.batches: list[int] = []
+
+    def _get_name(self) -> str:
+        return "FakeYOLO"
+
+    def predict(self, images, **_kwargs):
+        self.batches.append(len(images))
+        box = SimpleNamespace(
+            xyxyn=[_value([0.1, 0.1, 0.9, 0.5])],
+            conf=[_value(0.9)],
+            cls=[_value(int(BlockType.PLAIN_TEXT))],
+        )
+        return [SimpleNamespace(boxes=[box]) for _ in images]
+
+
+def test_pages_are_detected_in_batches_and_cached(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "doc.pdf"
+    with fitz.open() as doc:
+        for i in range(5):
+            doc.new_page(width=200, height=200).insert_text((20, 100), f"page {i}")
+        doc.save(pdf_path)
+    model = FakeLayoutModel()
+    renderer = PageRenderer(
+        cache_dir=tmp_path / "pages",
+        render=RenderSettings(dpi=36, image_format="png", quality=0),
+        workers=1,
+    )
+    analyzer = LayoutAnalyzer(
+        model, cache_dir=tmp_path / "layout", batch_size=2, renderer=renderer
+    )
+
+    blocks = analyzer.analyze(pdf_path)
+
+    assert [block.page for block in blocks] == [1, 2, 3, 4, 5]
+    assert blocks[0].type == BlockType.PLAIN_TEXT
+    assert blocks[0].model == "FakeYOLO"
+    assert model.batches == [2, 2, 1]
+
+    assert analyzer.analyze(pdf_path, page_numbers=[4, 2]) == [blocks[3], blocks[1]]
+    assert model.batches == [2, 2, 1]
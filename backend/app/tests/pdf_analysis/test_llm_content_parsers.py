@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from app.llm_providers.base_provider import LLMProviderStrategy
+from app.pdf_analysis.llm_content_parsers import (
+    RepairBudget,
+    parse_and_validate_llm_response,
+)
+from app.pdf_analysis.schemas import PublicLeaseCategory, PublicLeaseCondition
+
+
+class RepairProvider(LLMProviderStrategy):
+    """
+    Answers repair prompts with canned outputs, or with the result of calling
+    an output on the prompt, and records the prompts.
+    """
+
+    def __init__(self, *outputs, tokens: int = 10):
+        self.outputs = list(outputs)
+        self.prompts: list[str] = []
+        self.tokens = tokens
+
+    def generate_from_pdf(self, *_args, **_kwargs):
+        raise AssertionError("Repairs must not resend the PDF")
+
+    def generate_text(self, system_prompt, user_prompt, model_name):
+        self.prompts.append(user_prompt)
+        usage = {"input_tokens": 5, "output_tokens": 5, "total_tokens": self.tokens}
+        output = self.outputs.pop(0)
+        if callable(output):
+            output = output(user_prompt)
+        return output, {"usage": usage}
+
+    def text_from_raw_response(self, raw_response):
+        return None
+
+
+def _condition(content: str, page=1) -> dict:
+    return {"content": content, "section": "s", "page": page, "bbox": [[0, 0, 1, 1]]}
+
+
+def test_syntax_error_sends_only_the_surrounding_window() -> None:
+    padding = [_condition("x" * 50) for _ in range(40)]
+    content = json.dumps(
+        {"category": "c", "conditions": [*padding, _condition("broken")]}
+    )
+    content = content.replace('"broken", "section"', '"broken" "section"')
+    provider = RepairProvider(
+        lambda prompt: prompt.split("\n\n", 1)[1].replace(
+            '"broken" "section"', '"broken", "section"'
+        )
+    )
+    budget = RepairBudget(max_tokens=1_000)
+
+    result = parse_and_validate_llm_response(
+        content, PublicLeaseCategory, provider=provider, budget=budget
+    )
+
+    assert result.conditions[-1].content == "broken"
+    assert len(provider.prompts[0]) < len(content) / 2
+    assert budget.spent_tokens == 10
+    assert budget.attempts[0]["kind"] == "syntax"
+    assert budget.attempts[0]["succeeded"]
+
+
+def test_validation_error_sends_only_the_failing_object() -> None:
+    content = json.dumps(
+        [
+            {
+                "category": "c",
+                "conditions": [_condition("ok"), _condition("bad", page="two")],
+            }
+        ]
+    )
+    provider = RepairProvider(json.dumps(_condition("bad", page=2)))
+
+    result = parse_and_validate_llm_response(
+        content, list[PublicLeaseCategory], provider=provider
+    )
+
+    assert [c.page for c in result[0].conditions] == [1, 2]
+    assert '"ok"' not in provider.prompts[0]
+    assert "page" in provider.prompts[0]
+
+
+def test_repairs_stop_when_the_budget_is_spent() -> None:
+    provider = RepairProvider('{"content": "still broken"}', tokens=1_000)
+    budget = RepairBudget(max_tokens=1_200)
+
+    with pytest.raises(RuntimeError):
+        parse_and_validate_llm_response(
+            '{"content": "a"',
+            PublicLeaseCondition,
+            provider=provider,
+            max_retries=3,
+            budget=budget,
+        )
+
+    assert len(provider.prompts) == 1
+    assert budget.spent_tokens == 1_000
+
+
+def test_without_provider_errors_are_not_repaired() -> None:
+    with pytest.raises(RuntimeError):
+        parse_and_validate_llm_response('{"content": 1}', PublicLeaseCondition)
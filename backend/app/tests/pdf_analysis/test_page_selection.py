@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import fitz
+
+from app.enums import BlockType
+from app.pdf_analysis.page_selection import (
+    PageScore,
+    get_public_lease_field_aliases,
+    page_recall,
+    score_pages,
+    select_pages,
+)
+from app.schemas.block import BlockBase
+
+
+def _score(page_number: int, score: float, *fields: str) -> PageScore:
+    return PageScore(page_number, score, frozenset(fields), has_text=True)
+
+
+def test_field_aliases_are_parsed_from_prompt() -> None:
+    field_aliases = get_public_lease_field_aliases()
+
+    assert len(field_aliases) == 13
+    assert field_aliases["신청자격"][:3] == ["신청자격", "지원자격", "입주자격"]
+    assert "임대보증금" in field_aliases["임대조건"]
+
+
+def test_score_pages(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "doc.pdf"
+    with fitz.open() as doc:
+        for text in ["공고 안내", "신청 자격 및 임대 보증금 안내", "문의처"]:
+            page = doc.new_page()
+            page.insert_text((50, 100), text, fontname="korea")
+        doc.save(pdf_path)
+    blocks = [
+        BlockBase(
+            page=3, bbox=[0, 0, 1, 1], type=BlockType.TABLE, confidence=1, model="m"
+        )
+    ]
+
+    scores = score_pages(pdf_path, get_public_lease_field_aliases(), blocks=blocks)
+
+    # Aliases match regardless of whitespace in the extracted text.
+    assert scores[1].fields == {"신청자격", "임대조건"}
+    assert scores[1].score > scores[2].score > scores[0].score == 0
+    assert not any(s.has_text for s in scores)
+
+
+def test_select_pages_keeps_first_page_and_field_coverage() -> None:
+    scores = [
+        _score(1, 0.0),
+        _score(2, 3.0, "a", "b"),
+        _score(3, 2.5, "a", "b"),
+        _score(4, 0.5, "c"),
+        _score(5, 2.0, "a"),
+        _score(6, 0.1),
+        _score(7, 0.1),
+        _score(8, 0.1),
+    ]
+
+    selected = select_pages(scores, keep_ratio=0.25, min_pages=1)
+
+    # Page 1 and the best page per field come first, then the budget (2) is spent.
+    assert selected == [1, 2, 4]
+    assert select_pages(scores, keep_ratio=0.5, min_pages=1) == [1, 2, 3, 4]
+    assert select_pages(scores, keep_ratio=0.1, min_pages=10) == list(range(1, 9))
+
+
+def test_page_recall() -> None:
+    assert page_recall([1, 2], [1, 2, 2, 5]) == 0.75
+    assert page_recall([1], []) == 1.0
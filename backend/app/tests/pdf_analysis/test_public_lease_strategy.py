@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import fitz
+import pytest
+
+from app.core.config import settings
+from app.enums import BlockType
+from app.pdf_analysis.strategies import public_lease
+from app.pdf_analysis.strategies.public_lease import (
+    PublicLeaseInformationExtractionStrategy,
+)
+from app.schemas.block import BlockBase
+
+FILLER = "This page has plenty of text but none of the extracted field names."
+
+
+@pytest.fixture
+def pdf_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "doc.pdf"
+    with fitz.open() as doc:
+        for _ in range(8):
+            doc.new_page().insert_text((20, 100), FILLER, fontsize=8)
+        doc.save(path)
+    monkeypatch.setattr(public_lease, "get_announcement_pdf_path", lambda _: path)
+    return path
+
+
+def _block(page: int, type: BlockType, y: float = 0.5) -> BlockBase:
+    return BlockBase(
+        page=page, bbox=[0, y, 1, y + 0.1], type=type, confidence=1, model="m"
+    )
+
+
+def _pages(requests) -> list[list[int] | None]:
+    return [request.page_numbers for request in requests]
+
+
+@pytest.mark.usefixtures("pdf_path")
+def test_batch_requests_prune_pages_with_layout_blocks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "PAGE_PRUNING_KEEP_RATIO", 0.25)
+    monkeypatch.setattr(settings, "PAGE_PRUNING_MIN_PAGES", 1)
+    strategy = PublicLeaseInformationExtractionStrategy()
+    announcement = SimpleNamespace(id="ann")
+
+    def build(blocks=None):
+        return strategy.batch_requests(
+            announcement,
+            "gemini/model",
+            prune_pages=True,
+            chunked=False,
+            blocks=blocks,
+        )
+
+    # Equal text scores: page 1 plus the next page in document order.
+    assert _pages(build()) == [[1, 2]]
+    # A table lifts its page into the selection.
+    assert _pages(build([_block(6, BlockType.TABLE)])) == [[1, 6]]
+
+
+@pytest.mark.usefixtures("pdf_path")
+def test_batch_request_windows_follow_section_titles(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CHUNKED_EXTRACTION_WINDOW_PAGES", 4)
+    monkeypatch.setattr(settings, "CHUNKED_EXTRACTION_OVERLAP_PAGES", 0)
+    strategy = PublicLeaseInformationExtractionStrategy()
+    announcement = SimpleNamespace(id="ann")
+    titles = [_block(page, BlockType.TITLE, y=0.1) for page in (1, 4, 7)]
+
+    def build(blocks=None):
+        return strategy.batch_requests(
+            announcement,
+            "gemini/model",
+            prune_pages=False,
+            chunked=True,
+            blocks=blocks,
+        )
+
+    assert _pages(build()) == [[1, 2, 3, 4], [5, 6, 7, 8]]
+    # Sections [1-3] [4-6] [7-8] are not split across windows.
+    requests = build(titles)
+    assert _pages(requests) == [[1, 2, 3], [4, 5, 6], [7, 8]]
+    assert [request.custom_id for request in requests] == ["ann:0", "ann:1", "ann:2"]
+
+
+def test_repeated_categories_keep_all_their_conditions() -> None:
+    def condition(content: str) -> dict:
+        return {"content": content, "section": "s", "page": 1, "bbox": [[0, 0, 1, 1]]}
+
+    content = json.dumps(
+        [
+            {"category": "자격", "conditions": [condition("a")]},
+            {"category": "일정", "conditions": [condition("b")]},
+            {"category": "자격", "conditions": [condition("c"), condition("d")]},
+        ],
+        ensure_ascii=False,
+    )
+
+    category_map, repairs = PublicLeaseInformationExtractionStrategy()._parse_content(
+        content, "doc.pdf", "gemini/model"
+    )
+
+    assert repairs == 0
+    assert {
+        name: [condition["content"] for condition in conditions]
+        for name, conditions in category_map.items()
+    } == {"자격": ["a", "c", "d"], "일정": ["b"]}
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import fitz
+import pytest
+
+from app.pdf_analysis import rendering
+from app.pdf_analysis.rendering import PageRenderer, RenderSettings
+
+
+@pytest.fixture
+def pdf_path(tmp_path: Path) -> Path:
+    path = tmp_path / "doc.pdf"
+    with fitz.open() as doc:
+        for i in range(3):
+            page = doc.new_page(width=200, height=200)
+            page.insert_text((20, 100), f"page {i + 1}")
+        doc.save(path)
+    return path
+
+
+def test_iter_pages_renders_and_caches(
+    tmp_path: Path, pdf_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    renderer = PageRenderer(
+        cache_dir=tmp_path / "cache",
+        render=RenderSettings(dpi=72, image_format="jpeg", quality=80),
+        workers=1,
+    )
+
+    pages = list(renderer.iter_pages(pdf_path))
+    assert [n for n, _ in pages] == [1, 2, 3]
+    assert all(data.startswith(b"\xff\xd8") for _, data in pages)  # JPEG magic
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("cached pages must not be re-rendered")
+
+    monkeypatch.setattr(rendering, "render_page", fail)
+    assert list(renderer.iter_pages(pdf_path, page_numbers=[3, 1])) == [
+        pages[2],
+        pages[0],
+    ]
+
+
+def test_cache_is_keyed_by_render_settings(tmp_path: Path, pdf_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    jpeg = PageRenderer(cache_dir, RenderSettings(72, "jpeg", 80), workers=1)
+    webp = PageRenderer(cache_dir, RenderSettings(72, "webp", 80), workers=1)
+
+    [(_, jpeg_data)] = jpeg.iter_pages(pdf_path, page_numbers=[1])
+    [(_, webp_data)] = webp.iter_pages(pdf_path, page_numbers=[1])
+    assert webp_data[8:12] == b"WEBP"
+    assert jpeg_data != webp_data
+
+    [(page_number, data_url)] = webp.iter_data_urls(pdf_path, page_numbers=[2])
+    assert page_number == 2
+    assert data_url.startswith("data:image/webp;base64,")
+
+
+def test_renderers_use_a_pool_of_their_worker_count(
+    tmp_path: Path, pdf_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(rendering, "_executors", {})
+    render = RenderSettings(dpi=72, image_format="png", quality=80)
+    two = PageRenderer(tmp_path / "two", render, workers=2)
+    three = PageRenderer(tmp_path / "three", render, workers=3)
+
+    try:
+        assert list(two.iter_pages(pdf_path)) == list(three.iter_pages(pdf_path))
+        assert {
+            workers: executor._max_workers
+            for workers, executor in rendering._executors.items()
+        } == {2: 2, 3: 3}
+    finally:
+        for executor in rendering._executors.values():
+            executor.shutdown()
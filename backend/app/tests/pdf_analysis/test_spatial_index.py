@@ -0,0 +1,58 @@
+from app.enums import BlockType
+from app.pdf_analysis.spatial_index import BlockIndex
+from app.schemas.block import BlockBase
+
+
+def _block(page: int, bbox: list[float]) -> BlockBase:
+    return BlockBase(
+        page=page, bbox=bbox, type=BlockType.PLAIN_TEXT, confidence=0.9, model="m"
+    )
+
+
+BLOCKS = [
+    _block(1, [0.1, 0.1, 0.9, 0.2]),
+    _block(1, [0.1, 0.3, 0.5, 0.6]),
+    _block(1, [0.6, 0.3, 0.9, 0.6]),
+    _block(2, [0.1, 0.1, 0.9, 0.9]),
+]
+
+
+def _brute_force(page: int, bbox: list[float]) -> list[int]:
+    x1, x2 = sorted(bbox[0::2])
+    y1, y2 = sorted(bbox[1::2])
+    return [
+        i
+        for i, block in enumerate(BLOCKS)
+        if block.page == page
+        and block.bbox[0] <= x2
+        and x1 <= block.bbox[2]
+        and block.bbox[1] <= y2
+        and y1 <= block.bbox[3]
+    ]
+
+
+def test_query_matches_brute_force() -> None:
+    index = BlockIndex(BLOCKS)
+    queries = [
+        (1, [0.0, 0.0, 1.0, 1.0]),
+        (1, [0.2, 0.4, 0.3, 0.5]),
+        (1, [0.45, 0.25, 0.65, 0.28]),
+        (1, [0.55, 0.7, 0.95, 0.9]),
+        (2, [0.5, 0.5, 0.6, 0.6]),
+        (3, [0.0, 0.0, 1.0, 1.0]),
+    ]
+    for page, bbox in queries:
+        assert index.query(page, [bbox]) == _brute_force(page, bbox)
+
+
+def test_query_accepts_unordered_corners() -> None:
+    index = BlockIndex(BLOCKS)
+
+    assert index.query(1, [[0.7, 0.5, 0.2, 0.35]]) == [1, 2]
+
+
+def test_verify_drops_wrong_block_indices() -> None:
+    index = BlockIndex(BLOCKS)
+
+    # Block 2 is elsewhere on the page, block 3 is on another page, 9 does not exist.
+    assert index.verify(1, [[0.2, 0.4, 0.3, 0.5]], [1, 2, 3, 9]) == [1]
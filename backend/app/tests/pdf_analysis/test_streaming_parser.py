@@ -0,0 +1,101 @@
+import json
+
+from app.pdf_analysis.streaming_parser import (
+    StreamingCategoryParser,
+    parse_categories,
+)
+
+
+def _condition(content: str, page: int = 1) -> dict:
+    return {"content": content, "section": "s", "page": page, "bbox": [[0, 0, 1, 1]]}
+
+
+def _response() -> str:
+    return json.dumps(
+        [
+            {"category": "자격", "conditions": [_condition("a"), _condition("b")]},
+            {"category": "일정", "conditions": [_condition("c", 2)]},
+        ],
+        ensure_ascii=False,
+    )
+
+
+def test_conditions_are_reported_as_they_close() -> None:
+    seen = []
+    parser = StreamingCategoryParser(
+        on_condition=lambda category, condition: seen.append(
+            (category, condition.content)
+        )
+    )
+    content = "```json\n" + _response() + "\n```"
+    for start in range(0, len(content), 7):
+        parser.feed(content[start : start + 7])
+        if start == 0:
+            assert seen == []
+
+    result = parser.close()
+
+    assert seen == [("자격", "a"), ("자격", "b"), ("일정", "c")]
+    assert [c.category for c in result.categories] == ["자격", "일정"]
+    assert not result.broken
+    assert not result.truncated
+
+
+def test_broken_condition_is_isolated() -> None:
+    content = _response().replace('"page": 2', '"page": "two"')
+
+    result = parse_categories(content)
+
+    assert [len(c.conditions) for c in result.categories] == [2, 0]
+    assert len(result.broken) == 1
+    assert result.broken[0].category == "일정"
+    assert json.loads(result.broken[0].text)["content"] == "c"
+
+
+def test_truncated_response_keeps_completed_conditions() -> None:
+    content = _response()
+    cut = content.index('"c"') + 3
+
+    result = parse_categories(content[:cut])
+
+    assert result.truncated
+    assert [c.category for c in result.categories] == ["자격", "일정"]
+    assert [len(c.conditions) for c in result.categories] == [2, 0]
+    assert len(result.broken) == 1
+    assert result.broken[0].truncated
+
+
+def test_category_key_after_conditions() -> None:
+    content = json.dumps(
+        [{"conditions": [_condition("a")], "category": "자격"}], ensure_ascii=False
+    )
+    seen = []
+    parser = StreamingCategoryParser(
+        on_condition=lambda category, condition: seen.append(category)
+    )
+    parser.feed(content)
+
+    result = parser.close()
+
+    assert seen == ["자격"]
+    assert result.categories[0].conditions[0].content == "a"
+
+
+def test_braces_inside_strings() -> None:
+    content = json.dumps(
+        [{"category": "x", "conditions": [_condition('{"} ] [ \\ "')]}]
+    )
+
+    result = parse_categories(content)
+
+    assert result.categories[0].conditions[0].content == '{"} ] [ \\ "'
+    assert not result.broken
+
+
+def test_structured_output_wrapper() -> None:
+    content = '{"categories": ' + _response() + "}"
+
+    result = parse_categories(content)
+
+    assert [c.category for c in result.categories] == ["자격", "일정"]
+    assert not result.truncated
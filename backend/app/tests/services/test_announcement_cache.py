@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+from redis import ConnectionError as RedisConnectionError
+
+from app.services.announcement_cache import (
+    AnnouncementPayloadCache,
+    OriginalPayload,
+    apply_user_overlay,
+)
+
+
+class FakeAsyncRedis:
+    def __init__(self, fail: bool = False):
+        self.data: dict[str, str] = {}
+        self.fail = fail
+
+    def _check(self) -> None:
+        if self.fail:
+            raise RedisConnectionError("down")
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    async def delete(self, key):
+        self._check()
+        self.data.pop(key, None)
+
+
+class CountingCache(AnnouncementPayloadCache):
+    """Loads a fixed payload instead of reading the database."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loads = 0
+
+    async def _load(self, engine, announcement_id) -> OriginalPayload:
+        self.loads += 1
+        return OriginalPayload(
+            categories=[],
+            conditions=[_doc(f"{announcement_id}-c{self.loads}")],
+        )
+
+
+def _doc(id: str, original_id: str | None = None, is_deleted: bool = False) -> dict:
+    return {"id": id, "original_id": original_id, "is_deleted": is_deleted}
+
+
+ENGINE = SimpleNamespace(database_name="db")
+
+
+def test_apply_user_overlay_replaces_hides_and_appends() -> None:
+    originals = [_doc("a"), _doc("b"), _doc("c")]
+    user_documents = [
+        _doc("b2", original_id="b"),
+        _doc("c2", original_id="c", is_deleted=True),
+        _doc("orphan", original_id="gone"),
+        _doc("own"),
+        _doc("own-deleted", is_deleted=True),
+    ]
+
+    merged = apply_user_overlay(originals, user_documents)
+
+    assert [doc["id"] for doc in merged] == ["a", "b2", "own"]
+    assert apply_user_overlay(originals, []) == originals
+
+
+@pytest.mark.asyncio
+async def test_payload_is_served_from_memory_then_redis() -> None:
+    redis = FakeAsyncRedis()
+    cache = CountingCache(redis=redis, ttl=60, local_size=10, local_ttl=60)
+
+    first = await cache.get(ENGINE, "ann")
+    assert await cache.get(ENGINE, "ann") is first
+    assert cache.loads == 1
+
+    # Another process shares the Redis entry.
+    other = CountingCache(redis=redis, ttl=60, local_size=10, local_ttl=60)
+    assert await other.get(ENGINE, "ann") == first
+    assert other.loads == 0
+
+    await cache.invalidate(ENGINE, "ann")
+    assert redis.data == {}
+    assert (await cache.get(ENGINE, "ann"))["conditions"][0]["id"] == "ann-c2"
+
+
+@pytest.mark.asyncio
+async def test_local_entries_are_bounded_and_expire() -> None:
+    cache = CountingCache(redis=FakeAsyncRedis(), ttl=60, local_size=2, local_ttl=0)
+
+    await cache.get(ENGINE, "a")
+    # Expired locally, so the next read goes to Redis.
+    await cache.get(ENGINE, "a")
+    assert cache.loads == 1
+
+    cache.local_ttl = 60
+    for ann_id in ["a", "b", "c"]:
+        await cache.get(ENGINE, ann_id)
+    assert len(cache._local) == 2
+    assert "announcement_originals:db:a" not in cache._local
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_the_database() -> None:
+    cache = CountingCache(redis=FakeAsyncRedis(fail=True), local_ttl=0)
+
+    await cache.get(ENGINE, "ann")
+    await cache.get(ENGINE, "ann")
+    await cache.invalidate(ENGINE, "ann")
+
+    assert cache.loads == 2
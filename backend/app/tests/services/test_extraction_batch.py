@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.crud import crud_condition, crud_llm_batch_job
+from app.enums import AnnouncementType
+from app.llm_providers import openai_provider
+from app.llm_providers.batch import BatchRequest
+from app.llm_providers.openai_provider import OpenAIBatchClient
+from app.models.category import Category
+from app.models.condition import Condition
+from app.models.llm_analysis_result import LLMAnalysisResult
+from app.models.llm_batch_job import LLMBatchJob
+from app.services import extraction_batch, information_extraction_service
+from app.tests.llm_providers.test_batch import FakeOpenAIBatchServer
+from app.tests.test_factories import TestDataFactory
+
+MODEL = "openai/model"
+# Page windows per announcement.
+WINDOWS = {"a": 2, "b": 3, "c": 1}
+
+
+class FakeStrategy:
+    def batch_requests(self, announcement, model_identifier, structured_output, blocks):
+        return [
+            BatchRequest(
+                custom_id=f"{announcement.id}:{i}",
+                pdf_path=Path("unused.pdf"),
+                system_prompt="system",
+                user_prompt="user",
+                model_name=model_identifier.split("/", 1)[1],
+                page_numbers=[i + 1],
+            )
+            for i in range(WINDOWS[announcement.id])
+        ]
+
+    def process_batch_results(
+        self, announcement_id, model_identifier, responses, structured_output
+    ):
+        condition = {"content": "c", "section": "s", "page": 1, "bbox": [[0, 0, 1, 1]]}
+        return (
+            {"model": model_identifier, "raw_response": {}},
+            {"자격": [condition for _ in responses]},
+        )
+
+
+@pytest.fixture
+def fake_strategy(monkeypatch) -> FakeStrategy:
+    strategy = FakeStrategy()
+    monkeypatch.setattr(extraction_batch, "get_strategy", lambda _: strategy)
+    monkeypatch.setattr(
+        openai_provider,
+        "_image_contents",
+        lambda pdf_path, page_numbers: [{"type": "input_text", "text": "page"}],
+    )
+    return strategy
+
+
+@pytest.mark.usefixtures("fake_strategy")
+@pytest.mark.asyncio
+async def test_announcements_are_not_split_across_batches(
+    test_factory: TestDataFactory, housing_data: dict, monkeypatch
+):
+    engine = test_factory.engine
+    for ann_id in WINDOWS:
+        await test_factory.create_announcement({**housing_data, "pblancId": ann_id})
+    # "b" would straddle the limit after "a"'s two windows.
+    monkeypatch.setattr(settings, "LLM_BATCH_MAX_REQUESTS", 4)
+    server = FakeOpenAIBatchServer()
+
+    batch_jobs = await extraction_batch.submit_extraction_batches(
+        engine,
+        [(ann_id, AnnouncementType.PUBLIC_LEASE, MODEL) for ann_id in WINDOWS],
+        structured_output=False,
+        get_client=lambda _: OpenAIBatchClient(server.client),
+    )
+
+    assert [
+        [request["custom_id"] for request in batch_job.requests]
+        for batch_job in batch_jobs
+    ] == [["a:0", "a:1"], ["b:0", "b:1", "b:2", "c:0"]]
+    # The recorded requests match the submitted input files.
+    for batch_job in batch_jobs:
+        input_file_id = server.batches[batch_job.batch_id].input_file_id
+        submitted = [
+            json.loads(line)["custom_id"]
+            for line in server.file_contents[input_file_id].decode().splitlines()
+        ]
+        assert submitted == [request["custom_id"] for request in batch_job.requests]
+    assert await crud_llm_batch_job.get_pending_pairs(engine) == {
+        (ann_id, MODEL) for ann_id in WINDOWS
+    }
+
+
+@pytest.mark.usefixtures("fake_strategy")
+@pytest.mark.asyncio
+async def test_failed_save_of_batch_results_leaves_nothing(
+    test_factory: TestDataFactory, housing_data: dict, monkeypatch
+):
+    engine = test_factory.engine
+    for ann_id in WINDOWS:
+        await test_factory.create_announcement({**housing_data, "pblancId": ann_id})
+
+    async def no_transactions(_engine):
+        return False
+
+    monkeypatch.setattr(
+        information_extraction_service, "supports_transactions", no_transactions
+    )
+    server = FakeOpenAIBatchServer()
+
+    def get_client(_provider):
+        return OpenAIBatchClient(server.client)
+
+    batch_jobs = await extraction_batch.submit_extraction_batches(
+        engine,
+        [(ann_id, AnnouncementType.PUBLIC_LEASE, MODEL) for ann_id in WINDOWS],
+        structured_output=False,
+        get_client=get_client,
+    )
+    for batch_job in batch_jobs:
+        server.complete(batch_job.batch_id)
+    insert_conditions = crud_condition.insert_many
+
+    async def fail_for_b(engine, db_objs, session=None):
+        # The first condition is stored before the failure.
+        await insert_conditions(engine, db_objs[:1], session)
+        if any(condition.announcement_id == "b" for condition in db_objs):
+            raise RuntimeError("insert failed")
+        return await insert_conditions(engine, db_objs[1:], session)
+
+    monkeypatch.setattr(crud_condition, "insert_many", fail_for_b)
+
+    stats = await extraction_batch.poll_extraction_batches(engine, get_client)
+
+    assert stats["succeeded_announcements"] == 2
+    assert stats["failed_announcements"] == 1
+    results = await engine.find(LLMAnalysisResult)
+    assert sorted(result.announcement_id for result in results) == ["a", "c"]
+    for model, expected in ((Category, 2), (Condition, 3)):
+        documents = await engine.find(model)
+        assert "b" not in {document.announcement_id for document in documents}
+        assert len(documents) == expected
+    # "b" is left for the next backfill.
+    assert await crud_llm_batch_job.get_pending_pairs(engine) == set()
+    for batch_job in await engine.find(LLMBatchJob):
+        assert batch_job.status == "completed"
+        assert batch_job.completed_at is not None
@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.crud.category import CRUDCategory
+from app.crud.condition import CRUDCondition
+from app.enums import AnnouncementType
+from app.models.category import Category
+from app.models.condition import Condition
+from app.models.llm_analysis_result import LLMAnalysisResult
+from app.services import information_extraction_service
+from app.services.information_extraction_service import (
+    build_extraction_documents,
+    perform_information_extraction,
+    save_extraction_documents,
+)
+from app.tests.test_factories import TestDataFactory
+
+
+class FakeCRUD:
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+
+    async def get(self, engine, *queries):
+        return self.result
+
+    async def get_by_announcement(self, engine, *, announcement_id):
+        self.calls.append(announcement_id)
+        return self.result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stored_blocks", [["block"], []])
+async def test_extraction_uses_the_stored_layout_blocks(stored_blocks) -> None:
+    announcement = SimpleNamespace(id="ann")
+    crud_block = FakeCRUD(stored_blocks)
+    extract_calls = []
+
+    async def extract_pdf(ann, strategy, model_identifier, blocks):
+        extract_calls.append((ann, strategy, model_identifier, blocks))
+        return None
+
+    await perform_information_extraction(
+        announcement_id="ann",
+        model_identifier="gemini/model",
+        db_engine=None,
+        strategy=None,
+        crud_announcement=FakeCRUD(announcement),
+        crud_block=crud_block,
+        extract_pdf_func=extract_pdf,
+    )
+
+    assert crud_block.calls == ["ann"]
+    # Announcements without a stored layout are extracted without blocks.
+    assert extract_calls == [
+        (announcement, None, "gemini/model", stored_blocks or None)
+    ]
+
+
+class FailingCRUDCategory(CRUDCategory):
+    """Inserts the first category, then fails."""
+
+    async def insert_many(self, engine, db_objs, session=None):
+        await super().insert_many(engine, db_objs[:1], session)
+        raise RuntimeError("insert failed")
+
+
+class FailingCRUDCondition(CRUDCondition):
+    """Inserts the first condition, then fails."""
+
+    async def insert_many(self, engine, db_objs, session=None):
+        await super().insert_many(engine, db_objs[:1], session)
+        raise RuntimeError("insert failed")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "failing_crud",
+    [
+        {"crud_category": FailingCRUDCategory(Category)},
+        {"crud_condition": FailingCRUDCondition(Condition)},
+    ],
+    ids=["category", "condition"],
+)
+async def test_failed_save_leaves_nothing_without_transactions(
+    test_factory: TestDataFactory, monkeypatch, failing_crud
+):
+    async def no_transactions(_engine):
+        return False
+
+    monkeypatch.setattr(
+        information_extraction_service, "supports_transactions", no_transactions
+    )
+    engine = test_factory.engine
+    announcement = SimpleNamespace(id="ann", type=AnnouncementType.PUBLIC_LEASE)
+    condition = {"content": "c", "section": "s", "page": 1, "bbox": [[0, 0, 1, 1]]}
+    llm_output_obj, categories, conditions = build_extraction_documents(
+        announcement,
+        {"model": "gemini/model", "raw_response": {}},
+        {"자격": [condition, condition], "임대조건": [condition]},
+    )
+
+    with pytest.raises(RuntimeError):
+        await save_extraction_documents(
+            engine, llm_output_obj, categories, conditions, **failing_crud
+        )
+
+    assert await engine.count(LLMAnalysisResult) == 0
+    assert await engine.count(Category) == 0
+    assert await engine.count(Condition) == 0
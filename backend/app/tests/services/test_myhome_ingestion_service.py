@@ -0,0 +1,81 @@
+import httpx
+import pytest
+
+from app.core.myhome_client import MyHomeClient
+from app.enums import AnnouncementType
+from app.schemas.announcement import AnnouncementCreate
+from app.services.myhome_ingestion_service import (
+    _watermark_announcements,
+    fetch_housing_announcements_by_region,
+)
+
+
+class FakeMyHomeClient:
+    """Serves `pages[brtc_code][page_no - 1]`; an exception entry is raised."""
+
+    def __init__(self, pages: dict[str, list], total_count: int):
+        self.pages = pages
+        self.total_count = total_count
+
+    async def aget_housing_list(self, page_no, num_of_rows, brtc_code):
+        page = self.pages[brtc_code][page_no - 1]
+        if isinstance(page, Exception):
+            raise page
+        return {
+            "response": {
+                "header": {"resultCode": "00"},
+                "body": {"item": page, "totalCount": self.total_count},
+            }
+        }
+
+    extract_items = staticmethod(MyHomeClient.extract_items)
+
+
+def _item(housing_data: dict, pblanc_id: str, date: str) -> dict:
+    return {**housing_data, "pblancId": pblanc_id, "rcritPblancDe": date}
+
+
+def _announcement(housing_data: dict, pblanc_id: str, date: str) -> AnnouncementCreate:
+    return AnnouncementCreate(
+        **_item(housing_data, pblanc_id, date), type=AnnouncementType.PUBLIC_LEASE
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("incremental", [False, True])
+async def test_regions_with_failed_pages_are_reported(housing_data, incremental):
+    error = httpx.ConnectError("refused")
+    client = FakeMyHomeClient(
+        {
+            "11": [[_item(housing_data, "a", "20240305")], error],
+            "41": [
+                [_item(housing_data, "b", "20240305")],
+                [_item(housing_data, "c", "20240301")],
+            ],
+        },
+        total_count=2,
+    )
+    stop_before = {"11": "20240101", "41": "20240101"} if incremental else None
+
+    by_region, incomplete_regions = await fetch_housing_announcements_by_region(
+        client, ["11", "41"], num_of_rows=1, stop_before=stop_before
+    )
+
+    assert [a.pblancId for a in by_region["11"]] == ["a"]
+    assert [a.pblancId for a in by_region["41"]] == ["b", "c"]
+    assert incomplete_regions == {"11"}
+
+
+def test_watermark_stops_below_the_oldest_failed_announcement(housing_data):
+    announcements = [
+        _announcement(housing_data, "100", "20240310"),
+        _announcement(housing_data, "101", "20240305"),
+        _announcement(housing_data, "102", "20240305"),
+        _announcement(housing_data, "103", "20240301"),
+    ]
+
+    assert _watermark_announcements(announcements, set()) == announcements
+    assert _watermark_announcements(announcements, {"100"}) == announcements[1:]
+    kept = _watermark_announcements(announcements, {"100", "102"})
+    assert [a.pblancId for a in kept] == ["101", "103"]
+    assert _watermark_announcements(announcements, {"103"}) == []
@@ -0,0 +1,95 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.services.view_counter import ViewCounter
+
+
+class FakeCollection:
+    def __init__(self):
+        self.view_counts: Counter = Counter()
+        self.fail = False
+
+    async def update_one(self, filter, update):
+        self.view_counts[filter["_id"]] += update["$inc"]["view_count"]
+
+    async def bulk_write(self, operations, ordered):
+        if self.fail:
+            raise RuntimeError("write failed")
+        for operation in operations:
+            await self.update_one(operation._filter, operation._doc)
+
+
+def _engine(collection: FakeCollection) -> SimpleNamespace:
+    return SimpleNamespace(database_name="db", get_collection=lambda _: collection)
+
+
+def _announcement(id: str, view_count: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(id=id, view_count=view_count)
+
+
+@pytest.mark.asyncio
+async def test_views_are_flushed_in_bulk() -> None:
+    redis, collection = fakeredis.FakeAsyncRedis(), FakeCollection()
+    counter, engine = ViewCounter(redis), _engine(collection)
+
+    assert await counter.record(engine, _announcement("a", view_count=7)) == 8
+    assert await counter.record(engine, _announcement("a", view_count=7)) == 9
+    await counter.record(engine, _announcement("b"))
+    # Reads do not write the announcements.
+    assert collection.view_counts == {}
+
+    assert await counter.flush(engine) == 2
+    assert collection.view_counts == {"a": 2, "b": 1}
+    assert await redis.keys() == []
+    assert await counter.flush(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_the_views() -> None:
+    redis, collection = fakeredis.FakeAsyncRedis(), FakeCollection()
+    counter, engine = ViewCounter(redis), _engine(collection)
+    await counter.record(engine, _announcement("a"))
+
+    collection.fail = True
+    with pytest.raises(RuntimeError):
+        await counter.flush(engine)
+    await counter.record(engine, _announcement("a"))
+
+    collection.fail = False
+    assert await counter.flush(engine) == 1
+    assert collection.view_counts == {"a": 2}
+
+
+@pytest.mark.asyncio
+async def test_views_are_written_directly_without_redis() -> None:
+    server, collection = fakeredis.FakeServer(), FakeCollection()
+    counter = ViewCounter(fakeredis.FakeAsyncRedis(server=server))
+    engine = _engine(collection)
+    server.connected = False
+
+    assert await counter.record(engine, _announcement("a", view_count=3)) == 4
+    assert await counter.flush(engine) == 0
+    assert collection.view_counts == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_views_of_an_unfinished_flush_are_applied_after_its_lease() -> None:
+    redis, collection = fakeredis.FakeAsyncRedis(), FakeCollection()
+    counter, engine = ViewCounter(redis), _engine(collection)
+    await counter.record(engine, _announcement("a"))
+    await counter.record(engine, _announcement("b"))
+    # A flush that renamed the hash and died, and one still running.
+    await redis.rename("announcement_views:db", "announcement_views:db:flushing:dead")
+    await redis.hincrby("announcement_views:db:flushing:running", "a", 5)
+    await redis.set("announcement_views:db:flushing:running:lease", 1, ex=300)
+    await counter.record(engine, _announcement("a"))
+
+    assert await counter.flush(engine) == 2
+    assert collection.view_counts == {"a": 2, "b": 1}
+    assert sorted(await redis.keys()) == [
+        b"announcement_views:db:flushing:running",
+        b"announcement_views:db:flushing:running:lease",
+    ]
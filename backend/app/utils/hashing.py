@@ -0,0 +1,24 @@
+"""Hashing helpers used for change detection and content addressing."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+
+def sha256_json(data: Any) -> str:
+    """Returns the SHA-256 hex digest of a JSON-serializable value.
+
+    Keys are sorted so that logically equal dicts always hash the same.
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from odmantic import AIOEngine
+
+from app.core.config import settings
+from app.crud import crud_category, crud_condition
+from app.models.category import Category
+from app.models.condition import Condition
+from app.schemas.category import CategoryCreate
+from app.schemas.condition import ConditionCreate
+
+ANNOUNCEMENT_ID = "benchmark"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the per-user category/condition merge of the announcement "
+            "detail endpoint against a scratch MongoDB database."
+        )
+    )
+    parser.add_argument("--users", type=int, default=2000, help="Annotating users")
+    parser.add_argument("--originals", type=int, default=60, help="Original conditions")
+    parser.add_argument(
+        "--edits", type=int, default=3, help="Conditions edited per user"
+    )
+    parser.add_argument(
+        "--creations", type=int, default=2, help="Conditions created per user"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timed requests")
+    return parser.parse_args()
+
+
+async def seed(engine: AIOEngine, args) -> None:
+    categories = await crud_category.create_many(
+        engine,
+        [
+            CategoryCreate(announcement_id=ANNOUNCEMENT_ID, name=f"category {i}")
+            for i in range(max(1, args.originals // 10))
+        ],
+    )
+    originals = await crud_condition.create_many(
+        engine,
+        [
+            ConditionCreate(
+                announcement_id=ANNOUNCEMENT_ID,
+                category_id=categories[i % len(categories)].id,
+                content=f"condition {i}",
+                page=1 + i // 10,
+                bbox=[[0.1, 0.1, 0.5, 0.2]],
+            )
+            for i in range(args.originals)
+        ],
+    )
+
+    user_conditions = []
+    for u in range(args.users):
+        user_id = f"user-{u}"
+        for e in range(args.edits):
+            original = originals[(u + e) % len(originals)]
+            user_conditions.append(
+                ConditionCreate(
+                    announcement_id=ANNOUNCEMENT_ID,
+                    original_id=original.id,
+                    user_id=user_id,
+                    category_id=original.category_id,
+                    content=f"{original.content} edited by {user_id}",
+                    page=original.page,
+                    bbox=original.bbox,
+                    color="#ffd400",
+                )
+            )
+        for c in range(args.creations):
+            user_conditions.append(
+                ConditionCreate(
+                    announcement_id=ANNOUNCEMENT_ID,
+                    user_id=user_id,
+                    content=f"note {c} by {user_id}",
+                    page=1,
+                    bbox=[[0.2, 0.5, 0.7, 0.6]],
+                    color="#ffd400",
+                )
+            )
+    for start in range(0, len(user_conditions), 10_000):
+        await crud_condition.create_many(
+            engine, user_conditions[start : start + 10_000]
+        )
+
+
+async def python_merge(engine: AIOEngine, user_id: str) -> list[Condition]:
+    """The previous endpoint logic: read every user's conditions, merge in Python."""
+    conditions = await crud_condition.get_many(
+        engine, Condition.announcement_id == ANNOUNCEMENT_ID, limit=None
+    )
+    originals = [c for c in conditions if c.user_id is None]
+    mine = [c for c in conditions if c.user_id == user_id]
+    versions = {c.original_id: c for c in mine if c.original_id is not None}
+    merged = []
+    for original in originals:
+        version = versions.get(original.id)
+        if version is None:
+            merged.append(original)
+        elif not version.is_deleted:
+            merged.append(version)
+    merged.extend(c for c in mine if c.original_id is None and not c.is_deleted)
+    return merged
+
+
+async def aggregation_merge(engine: AIOEngine, user_id: str) -> list[Condition]:
+    return await crud_condition.get_for_user(
+        engine, announcement_id=ANNOUNCEMENT_ID, user_id=user_id
+    )
+
+
+async def measure(name: str, merge, engine: AIOEngine, args) -> None:
+    timings = []
+    for i in range(args.repeat):
+        user_id = f"user-{i % args.users}"
+        start = time.perf_counter()
+        merged = await merge(engine, user_id)
+        timings.append(time.perf_counter() - start)
+    expected = args.originals + args.creations
+    assert len(merged) == expected, f"{name}: {len(merged)} != {expected}"
+    print(
+        f"{name:<12} median {statistics.median(timings) * 1000:8.1f} ms, "
+        f"max {max(timings) * 1000:8.1f} ms ({len(merged)} conditions per user)"
+    )
+
+
+async def main():
+    args = parse_args()
+    client = AsyncIOMotorClient(settings.MONGO_DATABASE_URI)
+    database = f"benchmark_{uuid.uuid4().hex}"
+    engine = AIOEngine(client=client, database=database)
+    try:
+        await engine.configure_database([Category, Condition])
+        print(
+            f"Seeding {args.originals} originals and {args.users} users "
+            f"({args.edits} edits + {args.creations} creations each)..."
+        )
+        await seed(engine, args)
+        await measure("python", python_merge, engine, args)
+        await measure("aggregation", aggregation_merge, engine, args)
+    finally:
+        await client.drop_database(database)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
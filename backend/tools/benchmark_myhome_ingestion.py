@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from app.core.blob_store import BlobStore
+from app.core.myhome_client import MyHomeClient
+from app.services.myhome_ingestion_service import (
+    download_announcement_pdfs,
+    fetch_housing_announcements,
+)
+
+FAKE_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark MyHome ingestion against a local stub server."
+    )
+    parser.add_argument("--items", type=int, default=40, help="Fake announcements")
+    parser.add_argument("--regions", type=int, default=2, help="Fake regions")
+    parser.add_argument("--rows", type=int, default=10, help="Rows per list page")
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Stub response latency (s)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Concurrent downloads"
+    )
+    parser.add_argument(
+        "--skip-baseline",
+        action="store_true",
+        help="Skip the sequential one-browser-per-download baseline",
+    )
+    return parser.parse_args()
+
+
+def fake_item(pblanc_id: str, brtc_code: str, base_url: str) -> dict:
+    return {
+        "pblancId": pblanc_id,
+        "houseSn": int(pblanc_id),
+        "sttusNm": "접수중",
+        "pblancNm": f"벤치마크 공고 {pblanc_id}",
+        "suplyInsttNm": "LH",
+        "houseTyNm": "아파트",
+        "suplyTyNm": "행복주택",
+        "beforePblancId": "",
+        "rcritPblancDe": "20250101",
+        "przwnerPresnatnDe": "20250201",
+        "suplyHoCo": "10",
+        "refrnc": "",
+        "url": f"{base_url}/detail?pblancId={pblanc_id}",
+        "pcUrl": f"{base_url}/detail?pblancId={pblanc_id}",
+        "mobileUrl": f"{base_url}/detail?pblancId={pblanc_id}",
+        "hsmpNm": "벤치마크 단지",
+        "brtcNm": brtc_code,
+        "signguNm": "",
+        "fullAdres": "",
+        "rnCodeNm": "",
+        "refrnLegaldongNm": "",
+        "pnu": "",
+        "heatMthdNm": "",
+        "totHshldCo": 10,
+        "sumSuplyCo": 10,
+        "rentGtn": "",
+        "enty": "",
+        "prtpay": "",
+        "surlus": "",
+        "mtRntchrg": "",
+        "beginDe": "20250101",
+        "endDe": "20250115",
+    }
+
+
+def make_handler(items_per_region: dict[str, list[str]], latency: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str, **headers):
+            time.sleep(latency)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in headers.items():
+                self.send_header(key.replace("_", "-"), value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            base_url = f"http://{self.headers['Host']}"
+
+            if url.path == "/rsdtRcritNtcList":
+                brtc_code = query.get("brtcCode", "")
+                page_no = int(query.get("pageNo", 1))
+                num_of_rows = int(query.get("numOfRows", 10))
+                ids = items_per_region.get(brtc_code, [])
+                page_ids = ids[(page_no - 1) * num_of_rows : page_no * num_of_rows]
+                body = {
+                    "response": {
+                        "header": {"resultCode": "00", "resultMsg": "NORMAL"},
+                        "body": {
+                            "item": [
+                                fake_item(i, brtc_code, base_url) for i in page_ids
+                            ],
+                            "totalCount": len(ids),
+                            "pageNo": page_no,
+                            "numOfRows": num_of_rows,
+                        },
+                    }
+                }
+                self._send(
+                    200,
+                    json.dumps(body, ensure_ascii=False).encode("utf-8"),
+                    "application/json; charset=utf-8",
+                )
+            elif url.path == "/detail":
+                pblanc_id = query.get("pblancId", "")
+                html = (
+                    "<html><body><table><tr><th>공고문</th>"
+                    f'<td><a href="/files/{pblanc_id}.pdf">공고문_{pblanc_id}.pdf</a>'
+                    "</td></tr></table></body></html>"
+                )
+                self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+            elif url.path.startswith("/files/"):
+                self._send(
+                    200,
+                    FAKE_PDF,
+                    "application/pdf",
+                    Content_Disposition=f'attachment; filename="{Path(url.path).name}"',
+                )
+            else:
+                self._send(404, b"not found", "text/plain")
+
+    return StubHandler
+
+
+async def run_baseline(client: MyHomeClient, announcements, download_dir: Path):
+    """The pre-engine behaviour: one Chromium launch per announcement, serially."""
+    for announcement in announcements:
+        await client.download_pdf_with_playwright(
+            announcement, download_dir / f"{announcement.pblancId}.pdf"
+        )
+
+
+async def main():
+    args = parse_args()
+    regions = [str(41 + i) for i in range(args.regions)]
+    items_per_region = {
+        code: [
+            f"{90000 + r * args.items + i}" for i in range(args.items // len(regions))
+        ]
+        for r, code in enumerate(regions)
+    }
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(items_per_region, args.latency)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Stub MyHome server listening on {base_url}")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            client = MyHomeClient(base_url=base_url, service_key="benchmark")
+            client.DOWNLOAD_DIR = Path(tmp_dir) / "engine"
+            client.DOWNLOAD_DIR.mkdir()
+
+            start = time.perf_counter()
+            announcements = await fetch_housing_announcements(
+                client, brtc_codes=regions, num_of_rows=args.rows
+            )
+            listing_elapsed = time.perf_counter() - start
+            print(
+                f"Listing: {len(announcements)} announcements in {listing_elapsed:.2f}s"
+            )
+
+            start = time.perf_counter()
+            downloaded = await download_announcement_pdfs(
+                client,
+                announcements,
+                concurrency=args.concurrency,
+                blob_store=BlobStore(Path(tmp_dir) / "blobs", suffix=".pdf"),
+            )
+            engine_elapsed = time.perf_counter() - start
+            print(
+                f"Engine (concurrency={args.concurrency}): "
+                f"{len(downloaded)} PDFs in {engine_elapsed:.2f}s"
+            )
+
+            if not args.skip_baseline:
+                baseline_dir = Path(tmp_dir) / "baseline"
+                baseline_dir.mkdir()
+                start = time.perf_counter()
+                await run_baseline(client, announcements, baseline_dir)
+                baseline_elapsed = time.perf_counter() - start
+                print(
+                    f"Baseline (sequential, browser per PDF): {baseline_elapsed:.2f}s "
+                    f"-> speedup x{baseline_elapsed / engine_elapsed:.1f}"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import logging
+import sys
+from collections import defaultdict
+
+from app.core.blob_store import get_announcement_pdf_path
+from app.core.db import get_mongodb_engine
+from app.crud import crud_announcement, crud_block, crud_condition
+from app.pdf_analysis.page_selection import (
+    get_public_lease_field_aliases,
+    page_recall,
+    score_pages,
+    select_pages,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - L%(lineno)d - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Report the recall of relevance-based page pruning against the "
+            "pages of conditions already extracted from full documents."
+        )
+    )
+    parser.add_argument(
+        "--keep-ratio",
+        type=float,
+        default=None,
+        help="Fraction of pages to keep (default: PAGE_PRUNING_KEEP_RATIO)",
+    )
+    parser.add_argument(
+        "--min-pages",
+        type=int,
+        default=None,
+        help="Minimum pages to keep (default: PAGE_PRUNING_MIN_PAGES)",
+    )
+    parser.add_argument(
+        "--announcement_id", type=str, help="Only evaluate this announcement"
+    )
+    parser.add_argument(
+        "--ignore-layout",
+        action="store_true",
+        help="Score pages on text only, without the stored layout blocks",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print the missed pages")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    try:
+        engine = get_mongodb_engine()
+    except Exception as e:
+        logging.exception(f"Error connecting to MongoDB: {e}")
+        sys.exit(1)
+
+    # Only LLM-extracted originals: user edits may point at pages the model
+    # never reported.
+    query = {"user_id": None, "original_id": None, "is_deleted": False}
+    if args.announcement_id:
+        query["announcement_id"] = args.announcement_id
+    conditions = await crud_condition.get_many(engine, query, limit=None)
+
+    condition_pages = defaultdict(list)
+    for condition in conditions:
+        condition_pages[condition.announcement_id].append(condition.page)
+
+    announcements = await crud_announcement.get_many_by_ids(
+        engine, ids=list(condition_pages)
+    )
+    field_aliases = get_public_lease_field_aliases()
+
+    total_conditions = 0
+    total_hits = 0.0
+    total_pages = 0
+    total_selected = 0
+    for ann in announcements:
+        pdf_path = get_announcement_pdf_path(ann)
+        if not pdf_path.exists():
+            logging.warning(f"PDF not found for announcement {ann.id}: {pdf_path}")
+            continue
+
+        blocks = None
+        if not args.ignore_layout:
+            blocks = await crud_block.get_by_announcement(
+                engine, announcement_id=ann.id
+            )
+        scores = score_pages(pdf_path, field_aliases, blocks)
+        selected = select_pages(
+            scores, keep_ratio=args.keep_ratio, min_pages=args.min_pages
+        )
+        pages = condition_pages[ann.id]
+        recall = page_recall(selected, pages)
+
+        total_conditions += len(pages)
+        total_hits += recall * len(pages)
+        total_pages += len(scores)
+        total_selected += len(selected)
+
+        line = (
+            f"{ann.id}: recall {recall:.3f} ({len(pages)} conditions), "
+            f"{len(selected)}/{len(scores)} pages"
+        )
+        if args.verbose and recall < 1:
+            missed = sorted(set(pages) - set(selected))
+            line += f", missed pages {missed}"
+        print(line)
+
+    if total_conditions:
+        print(
+            f"Overall: recall {total_hits / total_conditions:.3f} over "
+            f"{total_conditions} conditions, sending {total_selected}/{total_pages} "
+            f"pages ({total_selected / total_pages:.1%})"
+        )
+    else:
+        print("No extracted conditions to evaluate.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
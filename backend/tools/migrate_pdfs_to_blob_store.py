@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+
+from app.core.blob_store import pdf_blob_store
+from app.core.config import settings
+from app.core.db import get_mongodb_engine
+from app.crud import crud_announcement
+from app.models.announcement import Announcement
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Move legacy MYHOME_DATA_DIR/<pblancId>.pdf files into the "
+        "content-addressed PDF store and record their hash on each announcement."
+    )
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Delete the legacy file once it is stored",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    engine = get_mongodb_engine()
+
+    migrated = 0
+    missing = 0
+    async for ann in engine.find(Announcement, Announcement.pdf_hash == None):  # noqa: E711
+        if not ann.filename:
+            continue
+        legacy_path = settings.MYHOME_DATA_DIR / ann.filename
+        if not legacy_path.exists():
+            print(f"Missing PDF for announcement {ann.id}: {legacy_path}")
+            missing += 1
+            continue
+
+        pdf_hash = pdf_blob_store.put_file(legacy_path, move=args.delete)
+        await crud_announcement.update(engine, ann, {"pdf_hash": pdf_hash})
+        migrated += 1
+
+    print(f"Migrated {migrated} PDFs ({missing} missing)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+import sys
+
+from app.core.db import get_mongodb_engine
+from app.crud import crud_llm_analysis_result
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - L%(lineno)d - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+async def main():
+    try:
+        engine = get_mongodb_engine()
+    except Exception as e:
+        logging.exception(f"Error connecting to MongoDB: {e}")
+        sys.exit(1)
+
+    rates = await crud_llm_analysis_result.get_repair_rates(engine)
+    if not rates:
+        print("No LLM analysis results.")
+        return
+
+    for rate in rates:
+        mode = "structured" if rate["structured_output"] else "prompt-only"
+        print(
+            f"{rate['model']} ({mode}): {rate['repaired_results']}/{rate['results']} "
+            f"results needed repair ({rate['repair_rate']:.1%}), "
+            f"{rate['repairs']} conditions repaired with {rate['repair_calls']} "
+            f"calls ({rate['repair_tokens']} tokens)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import fitz
 
-from app.core.config import settings
+from app.core.blob_store import get_announcement_pdf_path
 from app.core.db import get_mongodb_engine
 from app.crud import crud_announcement, crud_category, crud_condition
 from app.models.announcement import Announcement
@@ -86,7 +86,7 @@ async def main():
             output_path = output_dir / ann.filename
             logging.info(f"Processing announcement {ann_id} -> {output_path}")
 
-            pdf_path = settings.MYHOME_DATA_DIR / ann.filename
+            pdf_path = get_announcement_pdf_path(ann)
             # Check if file exists before trying to fetch conditions or open
             if not pdf_path.exists():
                 logging.error(f"File not found for announcement {ann_id} at {pdf_path}")
@@ -145,7 +145,7 @@ async def main():
 
         for ann in all_anns:
             output_path = output_dir / ann.filename
-            pdf_path = settings.MYHOME_DATA_DIR / ann.filename
+            pdf_path = get_announcement_pdf_path(ann)
             doc = None  # Initialize doc to None for each iteration
             category_map = {}
 